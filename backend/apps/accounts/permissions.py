@@ -22,7 +22,7 @@ class IsOwner(BasePermission):
         return request.user.is_authenticated
 
     def has_object_permission(self, request, view, obj):
-        return hasattr(obj, "author") and obj.author_id == request.user.id
+        return getattr(obj, "author_id", None) == request.user.id
 
 
 class IsOwnerOrAdmin(BasePermission):
@@ -34,4 +34,4 @@ class IsOwnerOrAdmin(BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.user.role == "admin":
             return True
-        return hasattr(obj, "author") and obj.author_id == request.user.id
+        return getattr(obj, "author_id", None) == request.user.id
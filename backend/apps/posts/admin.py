@@ -9,5 +9,5 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ("status", "category")
     search_fields = ("title", "content")
     prepopulated_fields = {"slug": ("title",)}
-    readonly_fields = ("id", "created_at", "updated_at")
+    readonly_fields = ("id", "thumbnail_blob", "created_at", "updated_at")
     ordering = ("-created_at",)
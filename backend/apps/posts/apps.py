@@ -1,7 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.models.signals import post_save
 
 
 class PostsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.posts"
     verbose_name = "Posts"
+
+    def ready(self):
+        from .signals import author_saved
+
+        post_save.connect(author_saved, sender=settings.AUTH_USER_MODEL, dispatch_uid="posts.author_saved")
@@ -0,0 +1,203 @@
+"""
+Content-addressed, reference-counted thumbnail storage.
+
+An upload is hashed (SHA-256) before anything is written. The first post to
+upload an image creates its ``ThumbnailBlob``, stores the file under
+``posts/thumbnails/<aa>/<digest>/``, records its header metadata and queues
+the render job; every later upload of the same bytes just takes another
+reference and inherits the blob's metadata, renditions and status, with no
+storage write and no rendering.
+
+References move in the same transaction as the post writes that take or drop
+them. When the last one goes the row is deleted and its files are purged
+after commit. Acquiring and purging one digest are serialized by a
+transaction-level advisory lock, so a purge can never remove files that a
+concurrent upload of the same image has just stored again.
+
+``collect_garbage`` (the ``gc_thumbnails`` command) repairs refcount drift
+left by writes that bypass ``PostService`` and removes files no blob or post
+refers to.
+"""
+import hashlib
+import logging
+import posixpath
+from collections import Counter
+from datetime import timedelta
+from functools import partial
+from pathlib import PurePath
+
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .constants import THUMBNAIL_GC_GRACE_SECONDS
+from .images import PostImages
+from .models import Post, ThumbnailBlob, ThumbnailJob
+
+logger = logging.getLogger(__name__)
+
+# Storage directory holding every thumbnail file, blob-owned or not
+THUMBNAIL_ROOT = "posts/thumbnails"
+
+
+class ThumbnailBlobs:
+    """Stateless helpers for acquiring, releasing and collecting ``ThumbnailBlob`` rows and their files."""
+
+    @staticmethod
+    def digest(upload):
+        """SHA-256 hex digest of ``upload``'s content; leaves it rewound."""
+        sha = hashlib.sha256()
+        upload.seek(0)
+        for chunk in upload.chunks():
+            sha.update(chunk)
+        upload.seek(0)
+        return sha.hexdigest()
+
+    @staticmethod
+    def directory(digest):
+        """Storage directory of a blob's files; fanned out by the first two hex digits."""
+        return f"{THUMBNAIL_ROOT}/{digest[:2]}/{digest}"
+
+    @staticmethod
+    def acquire(upload):
+        """
+        Take a reference to the blob holding ``upload``'s content, storing it
+        and queueing its renditions only if no post has uploaded it before.
+        Must run inside the transaction that saves the referencing post.
+        """
+        digest = ThumbnailBlobs.digest(upload)
+        ThumbnailBlobs._lock(digest)
+        existing = ThumbnailBlob.objects.select_for_update().filter(pk=digest).first()
+        if existing is not None:
+            ThumbnailBlob.objects.filter(pk=digest).update(refcount=F("refcount") + 1)
+            existing.refcount += 1
+            return existing
+
+        name = f"{ThumbnailBlobs.directory(digest)}/original{PurePath(upload.name or '').suffix.lower()}"
+        # A file left by a rolled-back upload would make save() pick another name
+        default_storage.delete(name)
+        blob = ThumbnailBlob.objects.create(
+            digest=digest, original=default_storage.save(name, upload), refcount=1, **PostImages.probe(upload)
+        )
+        ThumbnailJob.objects.create(digest=digest)
+        logger.info("Thumbnail blob stored: %s", digest)
+        return blob
+
+    @staticmethod
+    def release(*digests):
+        """
+        Drop one reference per entry of ``digests`` (``None`` entries are
+        ignored). Blobs left unreferenced are deleted, and their files purged
+        once the transaction commits. Rows are locked in key order, so
+        concurrent releases cannot deadlock.
+        """
+        counts = Counter(digest for digest in digests if digest)
+        if not counts:
+            return
+        blobs = list(ThumbnailBlob.objects.select_for_update().filter(pk__in=counts).order_by("pk"))
+        kept, gone = [], []
+        for blob in blobs:
+            blob.refcount = max(blob.refcount - counts[blob.pk], 0)
+            (kept if blob.refcount else gone).append(blob)
+        if kept:
+            ThumbnailBlob.objects.bulk_update(kept, ["refcount"])
+        if gone:
+            ThumbnailBlob.objects.filter(pk__in=[blob.pk for blob in gone]).delete()
+            for blob in gone:
+                transaction.on_commit(partial(ThumbnailBlobs.purge, blob.pk, blob.original))
+
+    @staticmethod
+    def purge(digest, original=""):
+        """
+        Remove a deleted blob's files: its directory plus ``original`` (which
+        lives elsewhere for uploads stored before deduplication). Does nothing
+        if the same image has been uploaded again in the meantime.
+        """
+        with transaction.atomic():
+            ThumbnailBlobs._lock(digest)
+            if ThumbnailBlob.objects.filter(pk=digest).exists():
+                return
+            names = ThumbnailBlobs._walk(ThumbnailBlobs.directory(digest))
+            for name in {*names, original} - {""}:
+                default_storage.delete(name)
+        logger.info("Thumbnail blob purged: %s", digest)
+
+    @staticmethod
+    def collect_garbage(*, dry_run=False, grace=timedelta(seconds=THUMBNAIL_GC_GRACE_SECONDS)):
+        """
+        Recount every blob's references from ``Post``, repair drifted counts,
+        delete unreferenced blobs (purging their files after commit) and
+        remove thumbnail files that no blob or post refers to.
+
+        Orphaned files younger than ``grace`` are kept: they may belong to an
+        upload whose transaction has not committed yet, or to renditions the
+        worker has not attached yet. Unless ``dry_run``, the blobs table is
+        locked against writers while counting, so no reference can move
+        between the recount and the repair. Returns ``{"drift", "released",
+        "orphans"}``: ``(digest, stored, actual)`` tuples, the digests of
+        deleted blobs and the names of deleted files.
+        """
+        with transaction.atomic():
+            if not dry_run:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"LOCK TABLE {connection.ops.quote_name(ThumbnailBlob._meta.db_table)} IN EXCLUSIVE MODE"
+                    )
+            actual = dict(
+                Post.objects.exclude(thumbnail_blob=None)
+                .order_by()
+                .values_list("thumbnail_blob")
+                .annotate(Count("id"))
+            )
+            blobs = list(ThumbnailBlob.objects.order_by("pk"))
+            drift = [
+                (blob.pk, blob.refcount, actual.get(blob.pk, 0))
+                for blob in blobs
+                if blob.refcount != actual.get(blob.pk, 0)
+            ]
+            gone = [blob for blob in blobs if not actual.get(blob.pk)]
+            gone_digests = {blob.pk for blob in gone}
+            if not dry_run:
+                changed = [ThumbnailBlob(pk=digest, refcount=count) for digest, _, count in drift if count]
+                ThumbnailBlob.objects.bulk_update(changed, ["refcount"])
+                ThumbnailBlob.objects.filter(pk__in=gone_digests).delete()
+                for blob in gone:
+                    transaction.on_commit(partial(ThumbnailBlobs.purge, blob.pk, blob.original))
+
+            # Files of deleted blobs are left to purge(), which rechecks under the lock
+            referenced = set()
+            for blob in blobs:
+                referenced.update((blob.original, *PostImages.names(blob.renditions)))
+            posts = Post.objects.exclude(thumbnail="").exclude(thumbnail__isnull=True)
+            for thumbnail, renditions in posts.values_list("thumbnail", "thumbnail_renditions"):
+                referenced.update((thumbnail, *PostImages.names(renditions)))
+
+        cutoff = timezone.now() - grace
+        orphans = [
+            name
+            for name in ThumbnailBlobs._walk(THUMBNAIL_ROOT)
+            if name not in referenced and default_storage.get_modified_time(name) < cutoff
+        ]
+        if not dry_run:
+            for name in orphans:
+                default_storage.delete(name)
+        return {"drift": drift, "released": sorted(gone_digests), "orphans": orphans}
+
+    @staticmethod
+    def _walk(directory):
+        """Storage names of every file below ``directory``; empty if it does not exist."""
+        try:
+            subdirectories, files = default_storage.listdir(directory)
+        except FileNotFoundError:
+            return []
+        names = [posixpath.join(directory, name) for name in files]
+        for subdirectory in subdirectories:
+            names.extend(ThumbnailBlobs._walk(posixpath.join(directory, subdirectory)))
+        return names
+
+    @staticmethod
+    def _lock(digest):
+        """Take the transaction-scoped advisory lock serializing uploads and purges of ``digest``."""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [int(digest[:15], 16)])
@@ -0,0 +1,210 @@
+"""
+Caches for post responses.
+
+``PostListCache`` stores whole published-list pages, keyed on the normalized
+query string plus a global posts "generation" number. Any write that can
+change a published list bumps the generation, which orphans every existing
+entry at once (they simply expire), so invalidation never has to find or
+delete keys.
+
+``PostRepresentationCache`` stores each post's serialized dict under
+``(id, updated_at)`` so list and detail responses only serialize rows that
+changed since they were last rendered. The author's details are rendered in
+too, so a change to the author's user row evicts their posts' entries (see
+``apps.posts.signals``).
+
+``PostSlugCache`` maps slugs to post ids, remembering misses briefly too, so
+slug lookups usually resolve without touching the database.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from common.db import row_value
+
+from .images import PostImages
+from .models import Post
+
+GENERATION_KEY = "posts:list:generation"
+HITS_KEY = "posts:list:hits"
+MISSES_KEY = "posts:list:misses"
+
+
+class PostListCache:
+    """Stateless helpers around the shared Django cache."""
+
+    @staticmethod
+    def is_cacheable(request):
+        return request.query_params.get("status") == Post.Status.PUBLISHED
+
+    @staticmethod
+    def generation():
+        generation = cache.get(GENERATION_KEY)
+        if generation is None:
+            # Seed from the clock so an evicted counter can never fall back onto
+            # a generation whose entries are still cached.
+            cache.add(GENERATION_KEY, int(time.time() * 1000), timeout=None)
+            generation = cache.get(GENERATION_KEY)
+        return generation
+
+    @staticmethod
+    def bump():
+        """Invalidate every cached list page in O(1)."""
+        try:
+            cache.incr(GENERATION_KEY)
+        except ValueError:
+            PostListCache.generation()
+
+    @staticmethod
+    def key_for(request):
+        params = sorted(
+            (name, sorted(values)) for name, values in request.query_params.lists()
+        )
+        # Host is part of the key because pagination links and thumbnail URLs are absolute
+        raw = f"{request.get_host()}|{params!r}"
+        digest = hashlib.sha256(raw.encode()).hexdigest()
+        return f"posts:list:{PostListCache.generation()}:{digest}"
+
+    @staticmethod
+    def get(key):
+        data = cache.get(key)
+        PostListCache._count(HITS_KEY if data is not None else MISSES_KEY)
+        return data
+
+    @staticmethod
+    def set(key, data):
+        # Callers take the key *before* querying, so a page built from pre-write
+        # rows can only land under a generation that the write already retired.
+        cache.set(key, data, timeout=settings.POSTS_LIST_CACHE_TIMEOUT)
+
+    @staticmethod
+    def stats():
+        counts = cache.get_many([HITS_KEY, MISSES_KEY])
+        return {"hits": counts.get(HITS_KEY, 0), "misses": counts.get(MISSES_KEY, 0)}
+
+    @staticmethod
+    def _count(key):
+        if cache.add(key, 1, timeout=None):
+            return
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, timeout=None)
+
+
+class PostRepresentationCache:
+    """
+    Per-post serializer output, shared by every list page and detail view.
+
+    Representations are rendered without a request (so ``thumbnail_url`` is
+    relative) and made absolute on the way out; per-query fields such as
+    search annotations are never cached and are re-attached per row.
+    """
+
+    # Fields whose value depends on the request rather than on the post
+    PER_REQUEST_FIELDS = ("search_rank", "search_headline")
+    # Media URLs the serializers make absolute when given a request
+    ABSOLUTE_URL_FIELDS = ("thumbnail", "thumbnail_url")
+    # Rendition maps whose file entries are media URLs
+    ABSOLUTE_URL_MAPS = ("thumbnail_renditions",)
+
+    @staticmethod
+    def key_for(kind, post_id, updated_at):
+        return f"posts:repr:{kind}:{post_id}:{updated_at.isoformat()}"
+
+    @staticmethod
+    def render_many(posts, serializer_class, request, *, kind):
+        """
+        Return ``serializer_class`` output for ``posts``, serializing only cache
+        misses. ``posts`` may be model instances or ``values()`` rows, as long
+        as ``serializer_class`` accepts them.
+        """
+        keys = [
+            PostRepresentationCache.key_for(kind, row_value(post, "id"), row_value(post, "updated_at"))
+            for post in posts
+        ]
+        cached = cache.get_many(keys)
+
+        misses = [(key, post) for key, post in zip(keys, posts) if key not in cached]
+        if misses:
+            fresh = serializer_class([post for _, post in misses], many=True).data
+            rendered = {}
+            for (key, _), data in zip(misses, fresh):
+                for field in PostRepresentationCache.PER_REQUEST_FIELDS:
+                    data.pop(field, None)
+                rendered[key] = dict(data)
+            cache.set_many(rendered, timeout=settings.POSTS_REPRESENTATION_CACHE_TIMEOUT)
+            cached.update(rendered)
+
+        return [PostRepresentationCache._finalize(cached[key], post, request) for key, post in zip(keys, posts)]
+
+    @staticmethod
+    def render(post, serializer_class, request, *, kind):
+        return PostRepresentationCache.render_many([post], serializer_class, request, kind=kind)[0]
+
+    @staticmethod
+    def evict(post_id, updated_at):
+        """Drop every cached representation of one version of a post."""
+        PostRepresentationCache.evict_many([(post_id, updated_at)])
+
+    @staticmethod
+    def evict_many(versions):
+        """Drop every cached representation of each ``(post_id, updated_at)`` version."""
+        cache.delete_many([
+            PostRepresentationCache.key_for(kind, post_id, updated_at)
+            for post_id, updated_at in versions
+            for kind in ("list", "detail")
+        ])
+
+    @staticmethod
+    def _finalize(data, post, request):
+        data = dict(data)
+        if request is not None:
+            for field in PostRepresentationCache.ABSOLUTE_URL_FIELDS:
+                if data.get(field):
+                    data[field] = request.build_absolute_uri(data[field])
+            for field in PostRepresentationCache.ABSOLUTE_URL_MAPS:
+                if data.get(field):
+                    data[field] = PostImages.map_files(data[field], request.build_absolute_uri)
+        for field in PostRepresentationCache.PER_REQUEST_FIELDS:
+            try:
+                data[field] = row_value(post, field)
+            except (KeyError, AttributeError):
+                pass
+        return data
+
+
+class PostSlugCache:
+    """
+    Cached ``slug -> id`` map. A miss is stored as an empty string (with a
+    short timeout) so repeated lookups of unknown slugs stay off the database.
+    ``PostService`` evicts a slug whenever a write creates, renames or deletes it.
+    """
+
+    MISSING = ""
+
+    @staticmethod
+    def key_for(slug):
+        return f"posts:slug:{slug}"
+
+    @staticmethod
+    def get(slug):
+        """Return ``(found, post_id)``; ``post_id`` is ``None`` for a cached miss."""
+        value = cache.get(PostSlugCache.key_for(slug))
+        if value is None:
+            return False, None
+        return True, (value or None)
+
+    @staticmethod
+    def set(slug, post_id):
+        if post_id is None:
+            cache.set(PostSlugCache.key_for(slug), PostSlugCache.MISSING,
+                      timeout=settings.POSTS_SLUG_NEGATIVE_CACHE_TIMEOUT)
+        else:
+            cache.set(PostSlugCache.key_for(slug), str(post_id), timeout=settings.POSTS_SLUG_CACHE_TIMEOUT)
+
+    @staticmethod
+    def evict(*slugs):
+        cache.delete_many([PostSlugCache.key_for(slug) for slug in slugs])
@@ -6,3 +6,33 @@ MIN_CONTENT_LENGTH = 10
 AUTO_EXCERPT_LENGTH = 200
 MAX_THUMBNAIL_SIZE_MB = 5
 ALLOWED_THUMBNAIL_TYPES = ["image/jpeg", "image/png", "image/webp"]
+SEARCH_CONFIG = "english"
+SEARCH_HEADLINE_MAX_WORDS = 35
+SEARCH_HEADLINE_MIN_WORDS = 15
+AUTOCOMPLETE_MIN_LENGTH = 2
+AUTOCOMPLETE_DEFAULT_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 25
+BATCH_MAX_OPERATIONS = 100
+FEED_TITLE = "Blog Post Manager"
+FEED_MAX_ITEMS = 20
+SITEMAP_SHARD_SIZE = 50000
+# Thumbnail rendition name -> maximum width in pixels (see apps.posts.images)
+THUMBNAIL_RENDITIONS = {"card": 480, "hero": 1280, "retina": 2560}
+THUMBNAIL_WEBP_QUALITY = 80
+THUMBNAIL_JPEG_QUALITY = 82
+# Low-quality image placeholder: a WebP this wide, inlined as a data: URI
+THUMBNAIL_PLACEHOLDER_WIDTH = 16
+THUMBNAIL_PLACEHOLDER_QUALITY = 40
+THUMBNAIL_JOB_MAX_ATTEMPTS = 3
+# Delay before the first retry of a failed thumbnail job; doubles per attempt
+THUMBNAIL_JOB_RETRY_SECONDS = 30
+# How long a claimed job stays hidden from other workers; a worker that dies mid-render
+# leaves the job to be claimed again once this runs out
+THUMBNAIL_JOB_LEASE_SECONDS = 600
+# Age below which gc_thumbnails leaves unreferenced files alone (uploads may still be committing)
+THUMBNAIL_GC_GRACE_SECONDS = 3600
+# Resumable chunked uploads (see apps.posts.uploads); the file itself is capped
+# at MAX_THUMBNAIL_SIZE_MB like a multipart upload
+MAX_UPLOAD_CHUNK_SIZE_MB = 1
+# Uploads untouched this long are removed by gc_thumbnails
+CHUNKED_UPLOAD_EXPIRY_HOURS = 24
@@ -7,3 +7,26 @@ class DuplicateSlugError(ServiceError):
 
 class InvalidStatusTransitionError(ServiceError):
     default_detail = "Invalid status transition."
+
+
+class InvalidThumbnailError(ServiceError):
+    default_detail = "The thumbnail image could not be decoded."
+
+
+class UploadOffsetMismatchError(ServiceError):
+    status_code = 409
+    default_detail = "The chunk does not start where the upload left off."
+
+
+class UploadIncompleteError(ServiceError):
+    status_code = 409
+    default_detail = "Not every byte of the upload has been received yet."
+
+
+class UploadTooLargeError(ServiceError):
+    status_code = 413
+    default_detail = "The chunk runs past the declared upload size or the chunk size limit."
+
+
+class UploadUnavailableError(ServiceError):
+    default_detail = "The upload has already been attached or has expired."
@@ -0,0 +1,163 @@
+"""
+Incrementally maintained post counts for the list page's facet sidebar.
+
+``PostFacetCount`` holds one row per (category, status, author) cell with the
+number of posts in it. ``PostService`` adds each write's deltas with a single
+``INSERT ... ON CONFLICT DO UPDATE`` in the same transaction as the write, so
+the counts commit or roll back together with the posts. Reading facets sums a
+table that grows with categories × authors instead of grouping every post.
+
+Cells that drop to zero are kept (the next post reuses them) and hidden from
+readers. Writes that bypass ``PostService`` (raw SQL, the admin, fixtures)
+leave drift behind; ``reconcile`` recounts from ``Post`` and repairs it.
+"""
+from collections import Counter
+
+from django.db import connection, transaction
+from django.db.models import Count, Sum, Value
+from django.db.models.functions import Lower
+
+from .models import Post, PostFacetCount
+
+# Post fields that decide which cell a post is counted in
+FACET_FIELDS = ("category", "status", "author")
+
+
+class PostFacets:
+    """Stateless helpers for maintaining and reading ``PostFacetCount``."""
+
+    @staticmethod
+    def cell(post):
+        """The ``(category, status, author_id)`` cell a post is counted in."""
+        return post.category, post.status, post.author_id
+
+    @staticmethod
+    def deltas(added=(), removed=()):
+        """``Counter`` of cell changes for posts entering (``added``) and leaving (``removed``) the counts."""
+        changes = Counter(PostFacets.cell(post) for post in added)
+        changes.subtract(PostFacets.cell(post) for post in removed)
+        return changes
+
+    @staticmethod
+    def locked_cells(posts):
+        """
+        Lock the rows of ``posts`` and return a ``Counter`` of the cells they are
+        stored in. Deltas start from these rather than from the in-memory
+        instances, which a concurrent write may have made stale; rows already
+        deleted by someone else are simply not counted.
+        """
+        return Counter(
+            Post.objects.select_for_update()
+            .filter(pk__in=[post.pk for post in posts])
+            .order_by("pk")
+            .values_list("category", "status", "author_id")
+        )
+
+    @staticmethod
+    def apply(deltas):
+        """
+        Add ``deltas`` (``{cell: change}``) to the stored counts with one upsert.
+        Cells are written in sorted order so concurrent writers lock them in the
+        same order and cannot deadlock.
+        """
+        rows = sorted((cell, change) for cell, change in deltas.items() if change)
+        if not rows:
+            return
+        quote = connection.ops.quote_name
+        table = quote(PostFacetCount._meta.db_table)
+        params = [value for (category, status, author_id), change in rows
+                  for value in (category, status, author_id, change)]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (category, status, author_id, count) "
+                f"VALUES {', '.join(['(%s, %s, %s, %s)'] * len(rows))} "
+                f"ON CONFLICT (category, status, author_id) "
+                f"DO UPDATE SET count = {table}.count + EXCLUDED.count",
+                params,
+            )
+
+    @staticmethod
+    def counts(*, status=None, category=None, author=None):
+        """
+        Return ``{"total", "statuses", "categories"}`` for posts matching the
+        filters. Each facet applies every filter except its own, so the status
+        counts don't collapse to the selected status (nor categories to the
+        selected category). ``category`` matches case-insensitively, like the
+        list endpoint's filter.
+        """
+        cells = PostFacetCount.objects.filter(count__gt=0).order_by()
+        if author is not None:
+            cells = cells.filter(author_id=author)
+
+        by_status = cells
+        if category is not None:
+            # Same LOWER() = LOWER() comparison as PostQuerySet.in_category
+            by_status = cells.alias(category_key=Lower("category")).filter(category_key=Lower(Value(category)))
+        statuses = dict.fromkeys(Post.Status.values, 0)
+        statuses.update(by_status.values_list("status").annotate(Sum("count")))
+
+        by_category = cells if status is None else cells.filter(status=status)
+        categories = [
+            {"category": category_name, "count": count}
+            for category_name, count in by_category.values_list("category")
+            .annotate(count=Sum("count"))
+            .order_by("-count", "category")
+        ]
+
+        total = statuses[status] if status is not None else sum(statuses.values())
+        return {"total": total, "statuses": statuses, "categories": categories}
+
+    @staticmethod
+    def reconcile(*, dry_run=False):
+        """
+        Recount every cell from ``Post`` and repair the stored counts; return the
+        drifted cells as ``(cell, stored, actual)`` tuples.
+
+        Unless ``dry_run``, the counts table is locked against writers (readers
+        carry on) for the duration, so no write can land between the recount
+        and the repair. Empty cells are pruned as part of the repair.
+        """
+        with transaction.atomic():
+            if not dry_run:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"LOCK TABLE {connection.ops.quote_name(PostFacetCount._meta.db_table)} IN EXCLUSIVE MODE"
+                    )
+            actual = {
+                (category, status, author_id): count
+                for category, status, author_id, count in Post.objects.order_by()
+                .values_list("category", "status", "author_id")
+                .annotate(Count("id"))
+            }
+            stored = {
+                (category, status, author_id): (pk, count)
+                for pk, category, status, author_id, count in PostFacetCount.objects.values_list(
+                    "pk", "category", "status", "author_id", "count"
+                )
+            }
+
+            drift = []
+            for cell in sorted(actual.keys() | stored.keys()):
+                count = stored.get(cell, (None, 0))[1]
+                if count != actual.get(cell, 0):
+                    drift.append((cell, count, actual.get(cell, 0)))
+            if dry_run:
+                return drift
+
+            PostFacetCount.objects.filter(
+                pk__in=[pk for cell, (pk, _) in stored.items() if cell not in actual]
+            ).delete()
+            changed = [
+                PostFacetCount(pk=stored[cell][0], count=count)
+                for cell, _, count in drift if cell in stored and count
+            ]
+            PostFacetCount.objects.bulk_update(changed, ["count"], batch_size=1000)
+            PostFacetCount.objects.bulk_create(
+                [
+                    PostFacetCount(category=category, status=status, author_id=author_id, count=count)
+                    for (category, status, author_id), _, count in drift
+                    if (category, status, author_id) not in stored
+                ],
+                batch_size=1000,
+            )
+        return drift
@@ -0,0 +1,145 @@
+"""
+Precomputed RSS / Atom feeds of published posts, overall and per category.
+
+Each feed is rendered once and kept in the shared cache as ready-to-send
+bytes together with a gzip-compressed copy, an ETag per encoding and the
+build time (sent as ``Last-Modified``). Requests never render XML unless the
+feed has changed since it was built.
+
+Freshness works like ``PostListCache``: every feed scope (all posts, or one
+category) has a generation number that ``PostService`` bumps on commit of a
+write touching a published post in that scope. A cached feed remembers the
+generation it was built for and is rebuilt on the next request once that no
+longer matches; a build that raced a write stores the stale generation, so it
+is replaced on the following request rather than served indefinitely.
+"""
+import gzip
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+
+from common.conditional import make_etag
+
+from .constants import FEED_MAX_ITEMS, FEED_TITLE
+from .models import Post
+
+FEED_FORMATS = {"rss": Rss201rev2Feed, "atom": Atom1Feed}
+# Scope of the feed covering every category
+ALL_POSTS = "*"
+
+
+class PostFeeds:
+    """Stateless helpers for building, caching and invalidating feeds."""
+
+    @staticmethod
+    def get(kind, category=None):
+        """
+        Return the cached feed entry for ``kind`` (``"rss"`` or ``"atom"``),
+        building it if missing or outdated, or ``None`` for a category without
+        published posts. Entries are dicts with ``body``, ``gzip``, ``etag``,
+        ``gzip_etag``, ``last_modified`` and ``items``.
+        """
+        scope = PostFeeds._scope(category)
+        key = f"posts:feed:{kind}:{PostFeeds._digest(scope)}"
+        if category is not None and cache.get(PostFeeds._generation_key(scope)) is None:
+            # A scope without a counter yet: check it is real before seeding one,
+            # so made-up categories cost one indexed query and leave no cache keys
+            if not Post.objects.published().in_category(category).exists():
+                return None
+        # Read before querying, so a write that lands mid-build retires this entry
+        generation = PostFeeds._generation(scope)
+        entry = cache.get(key)
+        if entry is None or entry["generation"] != generation:
+            entry = PostFeeds.build(kind, category)
+            entry["generation"] = generation
+            if not entry["items"] and category is not None:
+                # The category's last published post is gone: forget the scope entirely
+                # (a reseeded counter is clock-based, so it can't match an old entry)
+                cache.delete_many([key, PostFeeds._generation_key(scope)])
+                return None
+            cache.set(key, entry, timeout=None)
+        return entry
+
+    @staticmethod
+    def build(kind, category=None):
+        """Render a feed of the newest published posts and its gzip variant."""
+        posts = Post.objects.published().select_related("author").order_by("-published_at")
+        if category is not None:
+            posts = posts.in_category(category)
+        posts = list(
+            posts.only(
+                "id", "title", "excerpt", "category", "published_at", "updated_at",
+                "author__first_name", "author__last_name",
+            )[:FEED_MAX_ITEMS]
+        )
+
+        site = settings.PUBLIC_SITE_URL
+        title = FEED_TITLE if category is None else f"{FEED_TITLE}: {posts[0].category if posts else category}"
+        feed = FEED_FORMATS[kind](
+            title=title,
+            link=f"{site}/",
+            description=f"Latest published posts from {title}",
+            language=settings.LANGUAGE_CODE,
+        )
+        for post in posts:
+            feed.add_item(
+                title=post.title,
+                link=f"{site}/posts/{post.id}",
+                description=post.excerpt,
+                unique_id=f"urn:uuid:{post.id}",
+                unique_id_is_permalink=False,
+                pubdate=post.published_at,
+                updateddate=post.updated_at,
+                author_name=post.author.get_full_name() or None,
+                categories=[post.category] if post.category else None,
+            )
+
+        body = feed.writeString("utf-8").encode()
+        digest = hashlib.sha256(body).hexdigest()
+        return {
+            "body": body,
+            # mtime=0 keeps the compressed bytes (and so the ETag) stable across rebuilds
+            "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+            "etag": make_etag(digest),
+            "gzip_etag": make_etag(digest, "gzip"),
+            "content_type": f"{feed.content_type.split(';')[0]}; charset=utf-8",
+            "last_modified": timezone.now(),
+            "items": len(posts),
+        }
+
+    @staticmethod
+    def invalidate(*categories):
+        """Retire the all-posts feeds and those of ``categories``."""
+        for scope in {ALL_POSTS, *(PostFeeds._scope(category) for category in categories)}:
+            key = PostFeeds._generation_key(scope)
+            try:
+                cache.incr(key)
+            except ValueError:
+                PostFeeds._generation(scope)
+
+    @staticmethod
+    def _scope(category):
+        return ALL_POSTS if category is None else f"category:{category.lower()}"
+
+    @staticmethod
+    def _digest(scope):
+        return hashlib.sha256(scope.encode()).hexdigest()[:32]
+
+    @staticmethod
+    def _generation_key(scope):
+        return f"posts:feed:generation:{PostFeeds._digest(scope)}"
+
+    @staticmethod
+    def _generation(scope):
+        key = PostFeeds._generation_key(scope)
+        generation = cache.get(key)
+        if generation is None:
+            # Clock-seeded, as in PostListCache, so an evicted counter never
+            # falls back onto a generation a cached feed was built for
+            cache.add(key, int(time.time() * 1000), timeout=None)
+            generation = cache.get(key)
+        return generation
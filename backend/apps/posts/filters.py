@@ -8,8 +8,13 @@ class PostFilter(filters.FilterSet):
     created_after = filters.DateTimeFilter(field_name="created_at", lookup_expr="gte")
     created_before = filters.DateTimeFilter(field_name="created_at", lookup_expr="lte")
 
-    category = filters.CharFilter(lookup_expr="iexact")
+    # Case-insensitive, through the Lower("category") index
+    category = filters.CharFilter(method="filter_category")
+    author = filters.UUIDFilter(field_name="author")
 
     class Meta:
         model = Post
-        fields = ["status", "category", "created_after", "created_before"]
+        fields = ["status", "category", "author", "created_after", "created_before"]
+
+    def filter_category(self, queryset, name, value):
+        return queryset.in_category(value)
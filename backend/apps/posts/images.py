@@ -0,0 +1,147 @@
+"""
+Thumbnail renditions: one decode per upload, a fixed set of resized copies.
+
+An uploaded thumbnail is decoded once with Pillow, oriented from its EXIF
+tag and then shrunk step by step (largest rendition first, each smaller one
+resampled from the previous result rather than from the full-size original).
+Every rendition is written as WebP plus a JPEG fallback with no EXIF, XMP or
+ICC data. The stored map (``ThumbnailBlob.renditions``, copied to
+``Post.thumbnail_renditions``) records the width, height and storage name of
+each file, so serializers can build URLs without touching storage. The same
+pass shrinks the smallest rendition once more into the inline placeholder.
+
+``probe`` reads dimensions and format from the file header alone, cheap
+enough to run in the upload request.
+"""
+import base64
+import io
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import ExifTags, Image, ImageOps
+
+from .constants import (
+    THUMBNAIL_JPEG_QUALITY,
+    THUMBNAIL_PLACEHOLDER_QUALITY,
+    THUMBNAIL_PLACEHOLDER_WIDTH,
+    THUMBNAIL_RENDITIONS,
+    THUMBNAIL_WEBP_QUALITY,
+)
+from .exceptions import InvalidThumbnailError
+
+# Output formats per rendition: map key -> (Pillow format, extension)
+RENDITION_FORMATS = {"webp": ("WEBP", "webp"), "jpeg": ("JPEG", "jpg")}
+# JPEG has no alpha channel; transparent areas are flattened onto this
+JPEG_BACKGROUND = (255, 255, 255)
+# EXIF orientations that turn the image by 90 degrees, swapping width and height
+TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+class PostImages:
+    """Stateless helpers for rendering and storing thumbnail renditions."""
+
+    @staticmethod
+    def render(directory, upload):
+        """
+        Decode ``upload`` once and store every rendition in storage
+        ``directory``, replacing files of the same name. Returns the rendition
+        map for ``Post.thumbnail_renditions`` and the placeholder ``data:`` URI.
+        """
+        renditions = {}
+        for name, image in PostImages.resize(PostImages.decode(upload)):
+            entry = {"width": image.width, "height": image.height}
+            for key, (image_format, extension) in RENDITION_FORMATS.items():
+                path = f"{directory}/{name}.{extension}"
+                # Names are fixed per blob; a retried render overwrites rather than renames
+                default_storage.delete(path)
+                entry[key] = default_storage.save(path, ContentFile(PostImages.encode(image, image_format)))
+            renditions[name] = entry
+        # resize() ends with the smallest rendition
+        return renditions, PostImages.placeholder(image)
+
+    @staticmethod
+    def probe(upload):
+        """
+        Return ``{"width", "height", "bytes", "format"}`` for ``upload`` from
+        its header, without decoding any pixels. Only ``bytes`` is known for
+        files Pillow cannot identify; the worker reports those as failed.
+        """
+        metadata = {"bytes": upload.size}
+        try:
+            upload.seek(0)
+            with Image.open(upload) as source:
+                width, height = source.size
+                # Only EXIF met in the header; getexif() would decode a PNG to find trailing chunks
+                exif = Image.Exif()
+                if source.info.get("exif"):
+                    exif.load(source.info["exif"])
+                if exif.get(ExifTags.Base.Orientation) in TRANSPOSED_ORIENTATIONS:
+                    width, height = height, width
+                metadata.update(width=width, height=height, format=(source.format or "").lower())
+        except (OSError, SyntaxError, Image.DecompressionBombError):
+            pass
+        finally:
+            upload.seek(0)
+        return metadata
+
+    @staticmethod
+    def decode(upload):
+        """Open and fully decode ``upload``, upright and in RGB / RGBA."""
+        largest = max(THUMBNAIL_RENDITIONS.values())
+        try:
+            upload.seek(0)
+            with Image.open(upload) as source:
+                # Lets the JPEG decoder scale down by up to 8x while decoding
+                source.draft("RGB", (largest, largest))
+                image = ImageOps.exif_transpose(source)
+                image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+        except (OSError, SyntaxError, Image.DecompressionBombError) as exc:
+            raise InvalidThumbnailError() from exc
+        finally:
+            upload.seek(0)
+        # Drop what was read from the file (EXIF, XMP, ICC); nothing of it is written out
+        image.info = {}
+        return image
+
+    @staticmethod
+    def resize(image):
+        """Yield ``(name, image)`` per rendition, largest first, never upscaled."""
+        for name, width in sorted(THUMBNAIL_RENDITIONS.items(), key=lambda item: -item[1]):
+            if image.width > width:
+                image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+            yield name, image
+
+    @staticmethod
+    def placeholder(image):
+        """A ``data:`` URI of ``image`` shrunk to a few pixels, for browsers to stretch while the real file loads."""
+        width = min(THUMBNAIL_PLACEHOLDER_WIDTH, image.width)
+        tiny = image.resize((width, max(1, round(image.height * width / image.width))), Image.BILINEAR)
+        buffer = io.BytesIO()
+        tiny.save(buffer, "WEBP", quality=THUMBNAIL_PLACEHOLDER_QUALITY)
+        return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+    @staticmethod
+    def encode(image, image_format):
+        buffer = io.BytesIO()
+        if image_format == "JPEG":
+            if image.mode == "RGBA":
+                flat = Image.new("RGB", image.size, JPEG_BACKGROUND)
+                flat.paste(image, mask=image.getchannel("A"))
+                image = flat
+            image.save(buffer, "JPEG", quality=THUMBNAIL_JPEG_QUALITY, optimize=True, progressive=True)
+        else:
+            image.save(buffer, "WEBP", quality=THUMBNAIL_WEBP_QUALITY, method=4)
+        return buffer.getvalue()
+
+    @staticmethod
+    def map_files(renditions, convert):
+        """Return a copy of ``renditions`` with ``convert`` applied to every file entry (e.g. name -> URL)."""
+        return {
+            name: {key: convert(value) if key in RENDITION_FORMATS else value for key, value in entry.items()}
+            for name, entry in renditions.items()
+        }
+
+    @staticmethod
+    def names(renditions):
+        """Storage names of every file in a rendition map."""
+        return [entry[key] for entry in renditions.values() for key in RENDITION_FORMATS if entry.get(key)]
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.posts.models import Post
+from apps.posts.search import PostSearch
+
+
+class Command(BaseCommand):
+    help = "Populate Post.search_vector for rows that are missing it (or all rows with --all)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Rows updated per transaction."
+        )
+        parser.add_argument(
+            "--all", action="store_true", help="Recompute every row, not just those with no vector."
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = Post.objects.order_by("pk")
+        if not options["all"]:
+            queryset = queryset.filter(search_vector__isnull=True)
+
+        total = 0
+        last_pk = None
+        while True:
+            # Walk the table by primary key so each batch is a short, index-backed transaction
+            batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            pks = list(batch.values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                break
+            with transaction.atomic():
+                total += Post.objects.filter(pk__in=pks).update(
+                    search_vector=PostSearch.vector_expression()
+                )
+            last_pk = pks[-1]
+            self.stdout.write(f"  Indexed {total} posts...")
+
+        self.stdout.write(self.style.SUCCESS(f"Search vectors updated for {total} posts."))
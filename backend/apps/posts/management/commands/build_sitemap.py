@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.posts.sitemaps import PostSitemap
+
+
+class Command(BaseCommand):
+    help = (
+        "Bring the sitemap shards of published posts up to date, rewriting only the months whose posts changed; "
+        "with --watch, keep doing so whenever a write outdates them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force", action="store_true", help="Rewrite every shard, changed or not."
+        )
+        parser.add_argument(
+            "--watch", action="store_true", help="Run until interrupted, rebuilding whenever the shards are outdated."
+        )
+        parser.add_argument(
+            "--poll", type=float, default=5.0, help="Seconds between checks for outdated shards with --watch."
+        )
+
+    def handle(self, *args, **options):
+        if not options["watch"]:
+            manifest, rebuilt = PostSitemap.build(force=options["force"])
+            self._report(manifest, rebuilt)
+            return
+
+        self.stdout.write(f"Watching for sitemap changes (polling every {options['poll']:g}s).")
+        try:
+            while True:
+                # Long-lived process: drop connections the database closed or that hit CONN_MAX_AGE
+                close_old_connections()
+                rebuilt = PostSitemap.refresh()
+                if rebuilt is not None:
+                    self._report(PostSitemap.manifest(), rebuilt)
+                time.sleep(options["poll"])
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped.")
+
+    def _report(self, manifest, rebuilt):
+        urls = sum(shard["urls"] for shard in manifest["shards"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Sitemap has {urls} URLs in {len(manifest['shards'])} shards; rewrote {len(rebuilt)}."
+        ))
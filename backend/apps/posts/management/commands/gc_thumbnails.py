@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.posts.blobs import ThumbnailBlobs
+from apps.posts.constants import THUMBNAIL_GC_GRACE_SECONDS
+from apps.posts.uploads import ChunkedUploads
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount thumbnail blob references from the posts table, delete unreferenced blobs, "
+        "remove thumbnail files nothing refers to, and expire abandoned chunked uploads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Report what would be repaired or removed without changing it."
+        )
+        parser.add_argument(
+            "--grace",
+            type=int,
+            default=THUMBNAIL_GC_GRACE_SECONDS,
+            help="Keep unreferenced files younger than this many seconds (default: %(default)s).",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        result = ThumbnailBlobs.collect_garbage(dry_run=dry_run, grace=timedelta(seconds=options["grace"]))
+        expired = ChunkedUploads.expire(dry_run=dry_run)
+        for digest, stored, actual in result["drift"]:
+            self.stdout.write(f"  blob {digest[:12]}: stored {stored} references, actual {actual}")
+        for name in result["orphans"]:
+            self.stdout.write(f"  orphaned file {name}")
+
+        summary = (
+            f"refcounts drifted: {len(result['drift'])}, unreferenced blobs: {len(result['released'])}, "
+            f"orphaned files: {len(result['orphans'])}, expired uploads: {expired}"
+        )
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f"Found {summary} (dry run, nothing changed)."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Collected {summary}."))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from apps.posts.cache import PostListCache
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss counters for the published-posts list cache."
+
+    def handle(self, *args, **options):
+        stats = PostListCache.stats()
+        total = stats["hits"] + stats["misses"]
+        ratio = stats["hits"] / total if total else 0.0
+        self.stdout.write(f"Generation: {PostListCache.generation()}")
+        self.stdout.write(f"Hits:       {stats['hits']}")
+        self.stdout.write(f"Misses:     {stats['misses']}")
+        self.stdout.write(f"Hit ratio:  {ratio:.1%}")
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.posts.thumbnails import ThumbnailQueue
+
+
+class Command(BaseCommand):
+    help = "Render queued thumbnail renditions; runs until interrupted unless --once is given."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Run the jobs that are due, then exit.")
+        parser.add_argument(
+            "--poll", type=float, default=1.0, help="Seconds to wait before checking an empty queue again."
+        )
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            ran = ThumbnailQueue.run_pending()
+            self.stdout.write(self.style.SUCCESS(f"Processed {ran} thumbnail jobs."))
+            return
+
+        self.stdout.write(f"Waiting for thumbnail jobs (polling every {options['poll']:g}s).")
+        try:
+            while True:
+                # Long-lived process: drop connections the database closed or that hit CONN_MAX_AGE
+                close_old_connections()
+                if not ThumbnailQueue.run_pending():
+                    time.sleep(options["poll"])
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped.")
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from apps.posts.facets import PostFacets
+
+
+class Command(BaseCommand):
+    help = "Recount post facet cells (category x status x author) from the posts table and repair any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Report drifted cells without changing them."
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        drift = PostFacets.reconcile(dry_run=dry_run)
+        for (category, status, author_id), stored, actual in drift:
+            self.stdout.write(f"  {category or '(none)'} / {status} / {author_id}: stored {stored}, actual {actual}")
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Facet counts are consistent."))
+        elif dry_run:
+            self.stdout.write(self.style.WARNING(f"{len(drift)} facet cells have drifted (dry run, nothing changed)."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Repaired {len(drift)} facet cells."))
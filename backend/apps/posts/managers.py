@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Lower
 
 
 class PostQuerySet(models.QuerySet):
@@ -8,6 +10,14 @@ class PostQuerySet(models.QuerySet):
     def drafts(self):
         return self.filter(status="draft")
 
+    def in_category(self, category):
+        """
+        Case-insensitive category match written as ``LOWER(category) = LOWER(%s)``
+        so it can use the ``Lower("category")`` index (``iexact`` compiles to
+        ``UPPER(...)``, which no index covers).
+        """
+        return self.alias(category_key=Lower("category")).filter(category_key=Lower(Value(category)))
+
 
 class PostManager(models.Manager):
     def get_queryset(self):
@@ -18,3 +28,6 @@ class PostManager(models.Manager):
 
     def drafts(self):
         return self.get_queryset().drafts()
+
+    def in_category(self, category):
+        return self.get_queryset().in_category(category)
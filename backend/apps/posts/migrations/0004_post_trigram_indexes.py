@@ -0,0 +1,32 @@
+# Generated by Django 5.0.14 on 2026-10-17 01:44
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0003_post_search_vector"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="post",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["title"],
+                name="posts_post_title_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["category"],
+                name="posts_post_category_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
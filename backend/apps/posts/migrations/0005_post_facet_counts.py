@@ -0,0 +1,73 @@
+# Generated by Django 5.0.14 on 2026-10-17 02:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_facet_counts(apps, schema_editor):
+    """Seed the counts from existing posts; PostService keeps them current from here on."""
+    Post = apps.get_model("posts", "Post")
+    PostFacetCount = apps.get_model("posts", "PostFacetCount")
+    cells = Post.objects.order_by().values_list("category", "status", "author_id").annotate(Count("id"))
+    PostFacetCount.objects.bulk_create(
+        [
+            PostFacetCount(category=category, status=status, author_id=author_id, count=count)
+            for category, status, author_id, count in cells.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0004_post_trigram_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostFacetCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("category", models.CharField(blank=True, max_length=50)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("draft", "Draft"), ("published", "Published")],
+                        max_length=10,
+                    ),
+                ),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "author",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Post facet count",
+                "verbose_name_plural": "Post facet counts",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="postfacetcount",
+            constraint=models.UniqueConstraint(
+                fields=("category", "status", "author"), name="posts_facet_cell_unique"
+            ),
+        ),
+        migrations.RunPython(populate_facet_counts, migrations.RunPython.noop),
+    ]
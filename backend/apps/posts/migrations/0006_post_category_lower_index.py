@@ -0,0 +1,28 @@
+# Generated by Django 5.0.14 on 2026-10-17 02:34
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0005_post_facet_counts"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="post",
+            name="category",
+            field=models.CharField(blank=True, max_length=50),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                django.db.models.functions.text.Lower("category"),
+                name="posts_post_category_lower",
+            ),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.0.14 on 2026-10-17 02:37
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0006_post_category_lower_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="post",
+            name="posts_post_status_b32c6a_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="post",
+            name="posts_post_category_lower",
+        ),
+        migrations.AlterField(
+            model_name="post",
+            name="author",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="posts",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="post",
+            name="status",
+            field=models.CharField(
+                choices=[("draft", "Draft"), ("published", "Published")],
+                default="draft",
+                max_length=10,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["status", "-created_at"], name="posts_post_status_created"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["author", "-created_at"], name="posts_post_author_created"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                django.db.models.functions.text.Lower("category"),
+                models.OrderBy(models.F("created_at"), descending=True),
+                name="posts_post_category_lower",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(fields=["title"], name="posts_post_title"),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                models.OrderBy(models.F("published_at"), descending=True),
+                condition=models.Q(("status", "published")),
+                name="posts_post_published_recent",
+            ),
+        ),
+    ]
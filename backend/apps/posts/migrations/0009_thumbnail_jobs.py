@@ -0,0 +1,73 @@
+# Generated by Django 5.0.14 on 2026-10-17 03:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def queue_existing_thumbnails(apps, schema_editor):
+    """Mark rendered thumbnails ready and queue the rest, so older uploads get renditions too."""
+    Post = apps.get_model("posts", "Post")
+    ThumbnailJob = apps.get_model("posts", "ThumbnailJob")
+    uploads = Post.objects.exclude(thumbnail="").exclude(thumbnail__isnull=True)
+    uploads.exclude(thumbnail_renditions={}).update(thumbnail_status="ready")
+    pending = uploads.filter(thumbnail_renditions={})
+    ThumbnailJob.objects.bulk_create(
+        [ThumbnailJob(post_id=post_id, source=source) for post_id, source in pending.values_list("id", "thumbnail")],
+        batch_size=1000,
+    )
+    pending.update(thumbnail_status="pending")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0008_post_thumbnail_renditions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="thumbnail_status",
+            field=models.CharField(
+                choices=[
+                    ("none", "No thumbnail"),
+                    ("pending", "Processing"),
+                    ("ready", "Ready"),
+                    ("failed", "Failed"),
+                ],
+                db_default="none",
+                default="none",
+                max_length=10,
+            ),
+        ),
+        migrations.CreateModel(
+            name="ThumbnailJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("post_id", models.UUIDField()),
+                ("source", models.CharField(max_length=255)),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("run_after", models.DateTimeField(default=django.utils.timezone.now)),
+                ("last_error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Thumbnail job",
+                "verbose_name_plural": "Thumbnail jobs",
+                "indexes": [
+                    models.Index(
+                        fields=["run_after", "id"], name="posts_thumbnail_job_due"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(queue_existing_thumbnails, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,118 @@
+# Generated by Django 5.0.14 on 2026-10-17 09:00
+
+import hashlib
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+
+
+def deduplicate_thumbnails(apps, schema_editor):
+    """
+    Hash every stored thumbnail into a blob, pointing posts with identical
+    images at one file and one set of renditions, and re-key the queued
+    render jobs by digest. Files stay where they are; copies left unused are
+    removed by ``gc_thumbnails``. Posts whose file is missing keep no blob.
+    """
+    Post = apps.get_model("posts", "Post")
+    ThumbnailBlob = apps.get_model("posts", "ThumbnailBlob")
+    ThumbnailJob = apps.get_model("posts", "ThumbnailJob")
+
+    blobs, users = {}, defaultdict(list)
+    uploads = Post.objects.exclude(thumbnail="").exclude(thumbnail__isnull=True).order_by("created_at", "pk")
+    for post in uploads.only("id", "thumbnail", "thumbnail_renditions", "thumbnail_status").iterator():
+        sha = hashlib.sha256()
+        try:
+            with default_storage.open(post.thumbnail.name) as handle:
+                for chunk in handle.chunks():
+                    sha.update(chunk)
+        except FileNotFoundError:
+            continue
+        blob = blobs.setdefault(
+            sha.hexdigest(),
+            ThumbnailBlob(digest=sha.hexdigest(), original=post.thumbnail.name, status=post.thumbnail_status),
+        )
+        if post.thumbnail_renditions and not blob.renditions:
+            # Reuse the first rendered copy for every post with the same image
+            blob.renditions = post.thumbnail_renditions
+            blob.status = "ready"
+        blob.refcount += 1
+        users[blob.digest].append(post.pk)
+
+    ThumbnailBlob.objects.bulk_create(blobs.values(), batch_size=1000)
+    for blob in blobs.values():
+        Post.objects.filter(pk__in=users[blob.digest]).update(
+            thumbnail_blob=blob.digest,
+            thumbnail=blob.original,
+            thumbnail_renditions=blob.renditions,
+            thumbnail_status=blob.status,
+        )
+    ThumbnailJob.objects.all().delete()
+    ThumbnailJob.objects.bulk_create(
+        [ThumbnailJob(digest=blob.digest) for blob in blobs.values() if blob.status == "pending"],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0009_thumbnail_jobs"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ThumbnailBlob",
+            fields=[
+                ("digest", models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ("original", models.CharField(max_length=255)),
+                ("renditions", models.JSONField(default=dict)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("none", "No thumbnail"),
+                            ("pending", "Processing"),
+                            ("ready", "Ready"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("refcount", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Thumbnail blob",
+                "verbose_name_plural": "Thumbnail blobs",
+            },
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="thumbnail_blob",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="posts",
+                to="posts.thumbnailblob",
+            ),
+        ),
+        migrations.AddField(
+            model_name="thumbnailjob",
+            name="digest",
+            field=models.CharField(default="", max_length=64),
+            preserve_default=False,
+        ),
+        migrations.RunPython(deduplicate_thumbnails, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="thumbnailjob",
+            name="post_id",
+        ),
+        migrations.RemoveField(
+            model_name="thumbnailjob",
+            name="source",
+        ),
+    ]
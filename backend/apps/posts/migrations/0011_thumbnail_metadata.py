@@ -0,0 +1,120 @@
+# Generated by Django 5.0.14 on 2026-10-17 03:19
+
+import base64
+import io
+
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+from PIL import ExifTags, Image
+
+# Frozen copies of the constants in apps.posts.constants at the time of writing
+PLACEHOLDER_WIDTH = 16
+PLACEHOLDER_QUALITY = 40
+
+
+def record_thumbnail_metadata(apps, schema_editor):
+    """
+    Read dimensions, size and format of every stored blob from its file
+    header, and make placeholders from the smallest rendition already
+    rendered (a few KB to decode, not the original), then copy both to the
+    posts using each blob.
+    """
+    Post = apps.get_model("posts", "Post")
+    ThumbnailBlob = apps.get_model("posts", "ThumbnailBlob")
+    for blob in ThumbnailBlob.objects.iterator():
+        try:
+            with default_storage.open(blob.original) as handle, Image.open(handle) as source:
+                blob.width, blob.height = source.size
+                exif = Image.Exif()
+                if source.info.get("exif"):
+                    exif.load(source.info["exif"])
+                if exif.get(ExifTags.Base.Orientation) in (5, 6, 7, 8):
+                    blob.width, blob.height = blob.height, blob.width
+                blob.format = (source.format or "").lower()
+            blob.bytes = default_storage.size(blob.original)
+        except (OSError, SyntaxError, Image.DecompressionBombError):
+            continue
+        card = blob.renditions.get("card", {}).get("jpeg")
+        if card:
+            try:
+                with default_storage.open(card) as handle, Image.open(handle) as source:
+                    width = min(PLACEHOLDER_WIDTH, source.width)
+                    tiny = source.convert("RGB").resize(
+                        (width, max(1, round(source.height * width / source.width))), Image.BILINEAR
+                    )
+                buffer = io.BytesIO()
+                tiny.save(buffer, "WEBP", quality=PLACEHOLDER_QUALITY)
+                blob.placeholder = "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+            except (OSError, SyntaxError):
+                pass
+        blob.save(update_fields=["width", "height", "bytes", "format", "placeholder"])
+        Post.objects.filter(thumbnail_blob=blob).update(
+            thumbnail_width=blob.width,
+            thumbnail_height=blob.height,
+            thumbnail_bytes=blob.bytes,
+            thumbnail_format=blob.format,
+            thumbnail_placeholder=blob.placeholder,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0010_thumbnail_blobs"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="thumbnail_bytes",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="thumbnail_format",
+            field=models.CharField(
+                blank=True, db_default="", default="", max_length=10
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="thumbnail_height",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="thumbnail_placeholder",
+            field=models.TextField(blank=True, db_default="", default=""),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="thumbnail_width",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="thumbnailblob",
+            name="bytes",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="thumbnailblob",
+            name="format",
+            field=models.CharField(blank=True, max_length=10),
+        ),
+        migrations.AddField(
+            model_name="thumbnailblob",
+            name="height",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="thumbnailblob",
+            name="placeholder",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name="thumbnailblob",
+            name="width",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(record_thumbnail_metadata, migrations.RunPython.noop),
+    ]
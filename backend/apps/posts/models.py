@@ -1,12 +1,21 @@
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import F, Q, Value
+from django.db.models.functions import Lower
+from django.utils import timezone
 
 from common.models import TimeStampedModel
 from .managers import PostManager
 
 
 def post_thumbnail_path(instance, filename):
-    """Upload thumbnails to posts/thumbnails/<uuid>/<filename>."""
+    """
+    Upload thumbnails to posts/thumbnails/<uuid>/<filename>. Only for files
+    assigned to ``Post.thumbnail`` directly; ``PostService`` stores uploads by
+    content hash instead (see apps.posts.blobs).
+    """
     return f"posts/thumbnails/{instance.id}/{filename}"
 
 
@@ -17,19 +26,50 @@ class Post(TimeStampedModel):
         DRAFT = "draft", "Draft"
         PUBLISHED = "published", "Published"
 
+    class ThumbnailStatus(models.TextChoices):
+        NONE = "none", "No thumbnail"
+        PENDING = "pending", "Processing"
+        READY = "ready", "Ready"
+        FAILED = "failed", "Failed"
+
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="posts",
+        # Served by the (author, -created_at) index below
+        db_index=False,
     )
     title = models.CharField(max_length=255)
     slug = models.SlugField(max_length=255, unique=True, db_index=True)
     content = models.TextField()
     excerpt = models.CharField(max_length=500, blank=True)
-    category = models.CharField(max_length=50, blank=True, db_index=True)
+    category = models.CharField(max_length=50, blank=True)
     thumbnail = models.ImageField(
         upload_to=post_thumbnail_path, blank=True, null=True
     )
+    # Resized copies of the thumbnail, written by apps.posts.images:
+    # {name: {"width", "height", "webp": storage name, "jpeg": storage name}}.
+    # The database default covers raw inserts such as import_posts' COPY
+    thumbnail_renditions = models.JSONField(default=dict, db_default=Value({}, models.JSONField()), blank=True)
+    # Copied from the thumbnail's blob, so list rows need no join; the
+    # renditions are rendered by the thumbnail worker (apps.posts.thumbnails)
+    thumbnail_status = models.CharField(
+        max_length=10,
+        choices=ThumbnailStatus.choices,
+        default=ThumbnailStatus.NONE,
+        db_default=ThumbnailStatus.NONE,
+    )
+    # Also copied from the blob: read from the upload's header once when it is
+    # stored (width and height as displayed, i.e. after EXIF orientation), so
+    # layout never needs the file. Not ImageField width_field/height_field,
+    # which reopen the file whenever the field is assigned.
+    thumbnail_width = models.PositiveIntegerField(null=True, blank=True)
+    thumbnail_height = models.PositiveIntegerField(null=True, blank=True)
+    thumbnail_bytes = models.PositiveIntegerField(null=True, blank=True)
+    thumbnail_format = models.CharField(max_length=10, blank=True, default="", db_default="")
+    # Tiny blurred ``data:`` URI shown while the image loads; made by the worker
+    # from the decode it renders the renditions from
+    thumbnail_placeholder = models.TextField(blank=True, default="", db_default="")
     image_url = models.URLField(
         max_length=500, blank=True, default="/fintrellis.gif"
     )
@@ -37,18 +77,177 @@ class Post(TimeStampedModel):
         max_length=10,
         choices=Status.choices,
         default=Status.DRAFT,
-        db_index=True,
     )
-    published_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    # Deduplicated stored upload behind ``thumbnail`` (null for files stored another way).
+    # Blobs go when their refcount reaches zero; the constraint, checked at
+    # commit, still refuses a dangling reference.
+    thumbnail_blob = models.ForeignKey(
+        "ThumbnailBlob",
+        on_delete=models.DO_NOTHING,
+        null=True,
+        blank=True,
+        related_name="posts",
+    )
+    published_at = models.DateTimeField(null=True, blank=True)
+    # Weighted tsvector maintained by PostService (see apps.posts.search)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     objects = PostManager()
 
     class Meta(TimeStampedModel.Meta):
         verbose_name = "Post"
         verbose_name_plural = "Posts"
+        # List query shapes: each filter's equality column leads, followed by
+        # the default -created_at ordering, so a filtered first page is an
+        # index range read with no sort (see benchmarks/list_query_plans.py)
         indexes = [
-            models.Index(fields=["status", "-published_at"]),
+            models.Index(fields=["status", "-created_at"], name="posts_post_status_created"),
+            models.Index(fields=["author", "-created_at"], name="posts_post_author_created"),
+            # Case-insensitive category filter (PostQuerySet.in_category)
+            models.Index(Lower("category"), F("created_at").desc(), name="posts_post_category_lower"),
+            # Unfiltered orderings plus the pk tie-breaker, so keyset (cursor)
+            # pages are one index range read either way (common.pagination)
+            models.Index(fields=["created_at", "id"], name="posts_post_created_id"),
+            models.Index(fields=["published_at", "id"], name="posts_post_published_id"),
+            models.Index(fields=["title", "id"], name="posts_post_title_id"),
+            # Public listing by publication date; drafts have no published_at
+            models.Index(
+                F("published_at").desc(),
+                name="posts_post_published_recent",
+                condition=Q(status="published"),
+            ),
+            GinIndex(fields=["search_vector"], name="posts_post_search_gin"),
+            # pg_trgm indexes backing the autocomplete endpoint
+            GinIndex(fields=["title"], name="posts_post_title_trgm", opclasses=["gin_trgm_ops"]),
+            GinIndex(fields=["category"], name="posts_post_category_trgm", opclasses=["gin_trgm_ops"]),
         ]
 
     def __str__(self):
         return self.title
+
+
+class PostFacetCount(models.Model):
+    """
+    Number of posts in one (category, status, author) cell, kept current by
+    ``PostService`` in the same transaction as each write (see apps.posts.facets).
+    """
+
+    category = models.CharField(max_length=50, blank=True)
+    status = models.CharField(max_length=10, choices=Post.Status.choices)
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Post facet count"
+        verbose_name_plural = "Post facet counts"
+        constraints = [
+            # Conflict target of the counter upsert
+            models.UniqueConstraint(fields=["category", "status", "author"], name="posts_facet_cell_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.category or '-'}/{self.status}/{self.author_id}: {self.count}"
+
+
+class ThumbnailBlob(models.Model):
+    """
+    One distinct thumbnail image, stored once however many posts use it.
+
+    Keyed by the SHA-256 of the uploaded bytes; ``refcount`` is the number of
+    posts pointing at it and is kept by ``ThumbnailBlobs`` in the same
+    transaction as each post write. The last reference to go removes the row
+    and, after commit, its files.
+    """
+
+    digest = models.CharField(max_length=64, primary_key=True)
+    # Storage name of the uploaded file
+    original = models.CharField(max_length=255)
+    renditions = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=10,
+        choices=Post.ThumbnailStatus.choices,
+        default=Post.ThumbnailStatus.PENDING,
+    )
+    # See the thumbnail_* fields of Post, which copy these
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    bytes = models.PositiveIntegerField(null=True, blank=True)
+    format = models.CharField(max_length=10, blank=True)
+    placeholder = models.TextField(blank=True)
+    refcount = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Thumbnail blob"
+        verbose_name_plural = "Thumbnail blobs"
+
+    def __str__(self):
+        return f"{self.digest[:12]} ({self.refcount} refs)"
+
+
+class ThumbnailJob(models.Model):
+    """
+    A queued request to render the renditions of one thumbnail blob, claimed
+    by ``process_thumbnails`` workers with ``SELECT ... FOR UPDATE SKIP LOCKED``.
+
+    Not a foreign key: a job outliving its blob is dropped by the worker
+    instead of making the last post delete wait on a claimed job.
+    """
+
+    digest = models.CharField(max_length=64)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Thumbnail job"
+        verbose_name_plural = "Thumbnail jobs"
+        indexes = [
+            # Claim order of the worker
+            models.Index(fields=["run_after", "id"], name="posts_thumbnail_job_due"),
+        ]
+
+    def __str__(self):
+        return f"{self.digest[:12]} (attempt {self.attempts})"
+
+
+class ChunkedUpload(TimeStampedModel):
+    """
+    A file sent in chunks through the resumable upload API (apps.posts.uploads).
+
+    Each appended chunk is streamed to its own part file and listed in
+    ``parts``; completing the upload joins them into ``file``, which a post
+    write then attaches (and consumes) as its thumbnail.
+    """
+
+    class Status(models.TextChoices):
+        OPEN = "open", "Receiving chunks"
+        COMPLETE = "complete", "Complete"
+
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100)
+    # Declared total size; the upload completes once this many bytes arrived
+    size = models.PositiveBigIntegerField()
+    received = models.PositiveBigIntegerField(default=0)
+    # Storage names of the received chunks, in order
+    parts = models.JSONField(default=list, blank=True)
+    # Storage name of the joined file, once complete
+    file = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.OPEN)
+
+    class Meta(TimeStampedModel.Meta):
+        verbose_name = "Chunked upload"
+        verbose_name_plural = "Chunked uploads"
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size} bytes, {self.status})"
@@ -0,0 +1,98 @@
+"""
+Full-text search and autocomplete over posts.
+
+Each post stores a weighted ``tsvector`` in ``Post.search_vector`` (GIN
+indexed). ``PostService`` refreshes it on every write that touches an indexed
+field; ``import_posts`` computes it in SQL as rows are loaded, and
+``backfill_search_vectors`` fills it in for rows written any other way.
+
+Autocomplete uses ``pg_trgm`` word similarity against the trigram GIN indexes
+on ``title`` and ``category``, so partial and misspelled input still matches.
+"""
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db.models import F, Q, Value
+from django.db.models.functions import Greatest
+from django.db.models.sql import Query
+
+from .constants import SEARCH_CONFIG, SEARCH_HEADLINE_MAX_WORDS, SEARCH_HEADLINE_MIN_WORDS
+from .models import Post
+
+# Indexed fields and their tsvector weights (A ranks highest).
+SEARCH_WEIGHTS = {
+    "title": "A",
+    "category": "B",
+    "excerpt": "C",
+    "content": "D",
+}
+
+
+class PostSearch:
+    """Stateless helpers for building, storing and querying post search vectors."""
+
+    @staticmethod
+    def vector_expression():
+        """Vector computed from the row's own columns (used for bulk backfills)."""
+        return PostSearch._combine(F(field) for field in SEARCH_WEIGHTS)
+
+    @staticmethod
+    def vector_sql(connection):
+        """
+        ``(sql, params)`` for ``vector_expression()``, with columns qualified by
+        the posts table name, for raw ``INSERT ... SELECT`` statements.
+        """
+        query = Query(Post)
+        compiler = query.get_compiler(connection=connection)
+        return PostSearch.vector_expression().resolve_expression(query).as_sql(compiler, connection)
+
+    @staticmethod
+    def vector_for(post):
+        """Vector computed from in-memory values, so it can ride along in the same INSERT/UPDATE."""
+        return PostSearch._combine(Value(getattr(post, field) or "") for field in SEARCH_WEIGHTS)
+
+    @staticmethod
+    def apply(queryset, term):
+        """Filter ``queryset`` to posts matching ``term`` and annotate rank and headline."""
+        query = SearchQuery(term, config=SEARCH_CONFIG, search_type="websearch")
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F("search_vector"), query),
+            search_headline=SearchHeadline(
+                "content",
+                query,
+                config=SEARCH_CONFIG,
+                start_sel="<mark>",
+                stop_sel="</mark>",
+                max_words=SEARCH_HEADLINE_MAX_WORDS,
+                min_words=SEARCH_HEADLINE_MIN_WORDS,
+            ),
+        )
+
+    @staticmethod
+    def autocomplete(term, limit):
+        """Return the ``limit`` best title/category matches for ``term`` as small dicts."""
+        return list(
+            Post.objects.filter(
+                Q(title__trigram_word_similar=term) | Q(category__trigram_word_similar=term)
+            )
+            .annotate(
+                similarity=Greatest(
+                    TrigramWordSimilarity(term, "title"),
+                    TrigramWordSimilarity(term, "category"),
+                )
+            )
+            .order_by("-similarity", "title")
+            .values("id", "title", "slug")[:limit]
+        )
+
+    @staticmethod
+    def _combine(sources):
+        vector = None
+        for source, weight in zip(sources, SEARCH_WEIGHTS.values()):
+            part = SearchVector(source, weight=weight, config=SEARCH_CONFIG)
+            vector = part if vector is None else vector + part
+        return vector
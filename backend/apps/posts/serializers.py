@@ -1,14 +1,27 @@
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
 from rest_framework import serializers
 
-from .constants import ALLOWED_THUMBNAIL_TYPES, MAX_THUMBNAIL_SIZE_MB, MIN_CONTENT_LENGTH
-from .models import Post
+from .constants import (
+    ALLOWED_THUMBNAIL_TYPES,
+    BATCH_MAX_OPERATIONS,
+    MAX_THUMBNAIL_SIZE_MB,
+    MIN_CONTENT_LENGTH,
+)
+from .images import PostImages
+from .models import ChunkedUpload, Post
 
 
 class PostListSerializer(serializers.ModelSerializer):
     """Minimal representation for list endpoints (excludes full content)."""
 
     thumbnail_url = serializers.SerializerMethodField()
+    thumbnail_renditions = serializers.SerializerMethodField()
     author_email = serializers.SerializerMethodField()
+    # Only present on search results (annotated by PostSearch.apply)
+    search_rank = serializers.FloatField(read_only=True)
+    search_headline = serializers.CharField(read_only=True)
 
     class Meta:
         model = Post
@@ -21,11 +34,20 @@ class PostListSerializer(serializers.ModelSerializer):
             "excerpt",
             "category",
             "thumbnail_url",
+            "thumbnail_renditions",
+            "thumbnail_status",
+            "thumbnail_width",
+            "thumbnail_height",
+            "thumbnail_bytes",
+            "thumbnail_format",
+            "thumbnail_placeholder",
             "image_url",
             "status",
             "published_at",
             "created_at",
             "updated_at",
+            "search_rank",
+            "search_headline",
         ]
         read_only_fields = fields
 
@@ -40,12 +62,117 @@ class PostListSerializer(serializers.ModelSerializer):
             return obj.thumbnail.url
         return None
 
+    def get_thumbnail_renditions(self, obj):
+        return rendition_urls(obj.thumbnail_renditions, self.context.get("request"))
+
+
+class PostListRowSerializer:
+    """
+    Fast stand-in for ``PostListSerializer`` over ``PostService.list_rows()``.
+
+    Builds each dict directly from a ``values()`` row instead of dispatching
+    through one serializer field per column. Keys, key order and value types
+    match ``PostListSerializer`` exactly, so both render to the same JSON
+    bytes; ``test_serializers.py`` holds the two in parity.
+    """
+
+    def __init__(self, instance, many=False, context=None):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+
+    @property
+    def data(self):
+        # Resolve the active timezone once per call rather than once per value
+        tz = timezone.get_current_timezone() if settings.USE_TZ else None
+        if self.many:
+            return [self.to_representation(row, tz) for row in self.instance]
+        return self.to_representation(self.instance, tz)
+
+    def to_representation(self, row, tz):
+        published_at = row["published_at"]
+        data = {
+            "id": str(row["id"]),
+            "author": row["author"],
+            "author_email": row["author__email"],
+            "title": row["title"],
+            "slug": row["slug"],
+            "excerpt": row["excerpt"],
+            "category": row["category"],
+            "thumbnail_url": self._thumbnail_url(row["thumbnail"]),
+            "thumbnail_renditions": rendition_urls(row["thumbnail_renditions"], self.context.get("request")),
+            "thumbnail_status": row["thumbnail_status"],
+            "thumbnail_width": row["thumbnail_width"],
+            "thumbnail_height": row["thumbnail_height"],
+            "thumbnail_bytes": row["thumbnail_bytes"],
+            "thumbnail_format": row["thumbnail_format"],
+            "thumbnail_placeholder": row["thumbnail_placeholder"],
+            "image_url": row["image_url"],
+            "status": row["status"],
+            "published_at": _format_datetime(published_at, tz) if published_at else None,
+            "created_at": _format_datetime(row["created_at"], tz),
+            "updated_at": _format_datetime(row["updated_at"], tz),
+        }
+        if "search_rank" in row:
+            data["search_rank"] = float(row["search_rank"])
+        if "search_headline" in row:
+            data["search_headline"] = str(row["search_headline"])
+        return data
+
+    def _thumbnail_url(self, name):
+        if not name:
+            return None
+        url = default_storage.url(name)
+        request = self.context.get("request")
+        if request:
+            return request.build_absolute_uri(url)
+        return url
+
+
+def rendition_urls(renditions, request=None):
+    """A stored rendition map with each file's storage name replaced by its (absolute, given a request) URL."""
+    if request is None:
+        return PostImages.map_files(renditions, default_storage.url)
+    return PostImages.map_files(renditions, lambda name: request.build_absolute_uri(default_storage.url(name)))
+
+
+def _format_datetime(value, tz):
+    """Same output as DRF's ``DateTimeField().to_representation`` in ISO-8601 mode."""
+    if tz is not None and timezone.is_aware(value):
+        value = value.astimezone(tz)
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+class PostBulkSerializer(serializers.ListSerializer):
+    """
+    ``many=True`` serializer for ``PostDetailSerializer`` that validates each
+    item against the matching instance when given a list of posts (bulk updates).
+    """
+
+    def run_child_validation(self, data):
+        if isinstance(self.instance, list):
+            self.child.instance = self.instance[self._child_index]
+            self._child_index += 1
+        return super().run_child_validation(data)
+
+    def to_internal_value(self, data):
+        self._child_index = 0
+        return super().to_internal_value(data)
+
 
 class PostDetailSerializer(serializers.ModelSerializer):
     """Full representation for detail, create, and update endpoints."""
 
     thumbnail = serializers.ImageField(required=False, allow_null=True)
+    # A complete chunked upload to attach instead of sending the file itself
+    thumbnail_upload = serializers.PrimaryKeyRelatedField(
+        queryset=ChunkedUpload.objects.all(), required=False, write_only=True
+    )
     thumbnail_url = serializers.SerializerMethodField(read_only=True)
+    thumbnail_renditions = serializers.SerializerMethodField(read_only=True)
     author_email = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
@@ -60,7 +187,15 @@ class PostDetailSerializer(serializers.ModelSerializer):
             "excerpt",
             "category",
             "thumbnail",
+            "thumbnail_upload",
             "thumbnail_url",
+            "thumbnail_renditions",
+            "thumbnail_status",
+            "thumbnail_width",
+            "thumbnail_height",
+            "thumbnail_bytes",
+            "thumbnail_format",
+            "thumbnail_placeholder",
             "image_url",
             "status",
             "published_at",
@@ -68,9 +203,11 @@ class PostDetailSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = [
-            "id", "author", "author_email", "slug", "thumbnail_url",
+            "id", "author", "author_email", "slug", "thumbnail_url", "thumbnail_renditions", "thumbnail_status",
+            "thumbnail_width", "thumbnail_height", "thumbnail_bytes", "thumbnail_format", "thumbnail_placeholder",
             "published_at", "created_at", "updated_at",
         ]
+        list_serializer_class = PostBulkSerializer
 
     def get_author_email(self, obj):
         return obj.author.email if obj.author else None
@@ -83,6 +220,9 @@ class PostDetailSerializer(serializers.ModelSerializer):
             return obj.thumbnail.url
         return None
 
+    def get_thumbnail_renditions(self, obj):
+        return rendition_urls(obj.thumbnail_renditions, self.context.get("request"))
+
     def validate_content(self, value):
         if len(value.strip()) < MIN_CONTENT_LENGTH:
             raise serializers.ValidationError(
@@ -109,3 +249,84 @@ class PostDetailSerializer(serializers.ModelSerializer):
                 f"File too large. Maximum size is {MAX_THUMBNAIL_SIZE_MB} MB."
             )
         return value
+
+    def validate_thumbnail_upload(self, value):
+        request = self.context.get("request")
+        if request is None or value.author_id != request.user.id:
+            raise serializers.ValidationError("Upload not found.")
+        if value.status != ChunkedUpload.Status.COMPLETE:
+            raise serializers.ValidationError("The upload is not complete.")
+        return value
+
+    def validate(self, attrs):
+        # An attached upload reaches the service as the thumbnail itself
+        if "thumbnail_upload" in attrs:
+            if "thumbnail" in attrs:
+                raise serializers.ValidationError(
+                    {"thumbnail_upload": ["Send either a thumbnail or a thumbnail_upload, not both."]}
+                )
+            attrs["thumbnail"] = attrs.pop("thumbnail_upload")
+        return attrs
+
+
+class ChunkedUploadSerializer(serializers.ModelSerializer):
+    """A resumable upload; ``offset`` is where the next chunk must start."""
+
+    offset = serializers.IntegerField(source="received", read_only=True)
+
+    class Meta:
+        model = ChunkedUpload
+        fields = ["id", "filename", "content_type", "size", "offset", "status", "created_at", "updated_at"]
+        read_only_fields = ["id", "offset", "status", "created_at", "updated_at"]
+
+    def validate_content_type(self, value):
+        if value not in ALLOWED_THUMBNAIL_TYPES:
+            raise serializers.ValidationError("Unsupported file type. Allowed: JPEG, PNG, WebP.")
+        return value
+
+    def validate_size(self, value):
+        if value < 1:
+            raise serializers.ValidationError("The upload cannot be empty.")
+        # The same limit as a multipart upload: both feed the same decode and rendition pipeline
+        if value > MAX_THUMBNAIL_SIZE_MB * 1024 * 1024:
+            raise serializers.ValidationError(f"File too large. Maximum size is {MAX_THUMBNAIL_SIZE_MB} MB.")
+        return value
+
+
+class PostBatchOperationSerializer(serializers.Serializer):
+    """One entry of a batch request; ``data`` is validated later by ``PostDetailSerializer``."""
+
+    OPERATIONS = ("create", "update", "delete")
+
+    op = serializers.ChoiceField(choices=OPERATIONS)
+    id = serializers.UUIDField(required=False)
+    data = serializers.DictField(required=False)
+
+    def validate(self, attrs):
+        if attrs["op"] != "create" and "id" not in attrs:
+            raise serializers.ValidationError({"id": f"Required for {attrs['op']}."})
+        if attrs["op"] != "delete" and "data" not in attrs:
+            raise serializers.ValidationError({"data": f"Required for {attrs['op']}."})
+        return attrs
+
+
+class PostBatchSerializer(serializers.Serializer):
+    operations = PostBatchOperationSerializer(many=True, allow_empty=False, max_length=BATCH_MAX_OPERATIONS)
+
+    def validate_operations(self, operations):
+        ids = [op["id"] for op in operations if op["op"] != "create"]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Each post may appear in at most one operation.")
+        return operations
+
+
+class PostFacetQuerySerializer(serializers.Serializer):
+    """Query parameters of the facets endpoint; each narrows the counts like the list filter of the same name."""
+
+    status = serializers.ChoiceField(choices=Post.Status.choices, required=False)
+    category = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    author = serializers.UUIDField(required=False)
+
+    def validate_category(self, value):
+        # Blank means "any category", as with the list filter
+        return value or None
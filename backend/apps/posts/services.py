@@ -6,35 +6,240 @@ they should never contain ORM queries or business rules directly.
 """
 import logging
 import uuid
+from collections import Counter
+from functools import partial
 
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
 from django.utils.text import slugify
 
+from common.exceptions import PreconditionFailed
+
+from .blobs import ThumbnailBlobs
+from .cache import PostListCache, PostRepresentationCache, PostSlugCache
 from .constants import AUTO_EXCERPT_LENGTH
-from .models import Post
+from .facets import FACET_FIELDS, PostFacets
+from .feeds import PostFeeds
+from .images import PostImages
+from .models import ChunkedUpload, Post, ThumbnailBlob
+from .search import SEARCH_WEIGHTS, PostSearch
+from .sitemaps import PostSitemap
+from .uploads import ChunkedUploads
 
 logger = logging.getLogger(__name__)
 
+# Post columns copied from the thumbnail's blob: post field -> blob field
+THUMBNAIL_BLOB_FIELDS = {
+    "thumbnail_renditions": "renditions",
+    "thumbnail_status": "status",
+    "thumbnail_placeholder": "placeholder",
+    "thumbnail_width": "width",
+    "thumbnail_height": "height",
+    "thumbnail_bytes": "bytes",
+    "thumbnail_format": "format",
+}
+# Written by the thumbnail worker (see finish_thumbnail)
+THUMBNAIL_RESULT_FIELDS = ("thumbnail_renditions", "thumbnail_status", "thumbnail_placeholder")
+
 
 class PostService:
     """Stateless service encapsulating post business logic."""
 
+    # Columns rendered by PostListSerializer; content and search_vector stay in the database
+    LIST_FIELDS = (
+        "id",
+        "author",
+        "author__email",
+        "title",
+        "slug",
+        "excerpt",
+        "category",
+        "thumbnail",
+        "thumbnail_renditions",
+        "thumbnail_status",
+        "thumbnail_width",
+        "thumbnail_height",
+        "thumbnail_bytes",
+        "thumbnail_format",
+        "thumbnail_placeholder",
+        "image_url",
+        "status",
+        "published_at",
+        "created_at",
+        "updated_at",
+    )
+
     @staticmethod
     def list_posts(queryset=None):
-        """Return the base queryset used by list views."""
+        """Return the base queryset used by list views (author joined, list columns only)."""
         if queryset is None:
             queryset = Post.objects.all()
-        return queryset
+        return queryset.select_related("author").only(*PostService.LIST_FIELDS)
+
+    @staticmethod
+    def list_rows(queryset):
+        """Project a ``list_posts()`` queryset to ``values()`` rows for ``PostListRowSerializer``."""
+        annotations = [name for name in ("search_rank", "search_headline") if name in queryset.query.annotations]
+        return queryset.values(*PostService.LIST_FIELDS, *annotations)
+
+    @staticmethod
+    def detail_queryset():
+        """Return the queryset used to load a single post for detail views."""
+        return Post.objects.select_related("author")
+
+    @staticmethod
+    def version_queryset():
+        """Return a queryset loading just enough of a post to validate its version and owner."""
+        return Post.objects.only("id", "author", "updated_at")
 
     @staticmethod
     def get_post(post_id):
         """Retrieve a single post by primary key. Raises Post.DoesNotExist."""
-        return Post.objects.get(pk=post_id)
+        return PostService.detail_queryset().get(pk=post_id)
+
+    @staticmethod
+    def resolve_slug(slug):
+        """Return the id of the post with ``slug``, or ``None``, via the cached slug map."""
+        found, post_id = PostSlugCache.get(slug)
+        if found:
+            return post_id
+        post_id = Post.objects.filter(slug=slug).values_list("id", flat=True).first()
+        PostSlugCache.set(slug, post_id)
+        return post_id
 
     @staticmethod
     def create_post(*, title, content, author, excerpt="", category="", status="draft", thumbnail=None, image_url=""):
         """Create a new post with auto-generated slug and excerpt."""
         slug = PostService._generate_unique_slug(title)
+        with transaction.atomic():
+            # Inside the transaction: attaching a thumbnail takes a blob reference
+            post = PostService._build_post(
+                title=title,
+                slug=slug,
+                content=content,
+                author=author,
+                excerpt=excerpt,
+                category=category,
+                status=status,
+                thumbnail=thumbnail,
+                image_url=image_url,
+            )
+            post.search_vector = PostSearch.vector_for(post)
+            post.save()
+            PostFacets.apply(PostFacets.deltas(added=[post]))
+        PostService._clear_search_vector(post)
+        # The slug may be cached as a miss
+        PostService._evict_slugs(post.slug)
+        if post.status == Post.Status.PUBLISHED:
+            PostService._invalidate_published(post.category)
+
+        logger.info("Post created: %s (id=%s)", post.title, post.id)
+        return post
+
+    @staticmethod
+    def update_post(post, *, data, expected_updated_at=None):
+        """
+        Full or partial update of a post. With ``expected_updated_at`` (the
+        version an ``If-Match`` header was validated against) the stored
+        version is checked again under a row lock, so a write that landed
+        since then fails with ``PreconditionFailed`` instead of being lost.
+        """
+        old_status = post.status
+        old_category = post.category
+        old_updated_at = post.updated_at
+        old_slug = post.slug
+
+        # Facet counts only move when the post can change cell
+        moves_cell = any(field in data for field in FACET_FIELDS)
+        with transaction.atomic():
+            PostService._lock_version(post, expected_updated_at)
+            facets = Counter()
+            if moves_cell:
+                facets.subtract(PostFacets.locked_cells([post]))
+            reindex = PostService._apply_changes(post, data)
+            if "thumbnail" in data:
+                post.save()
+            else:
+                # Don't overwrite a thumbnail (or the renditions the worker attached to it)
+                # that changed after this instance was read
+                exclude = ("thumbnail", "thumbnail_blob", *THUMBNAIL_BLOB_FIELDS)
+                post.save(update_fields=PostService._loaded_fields(post, exclude=exclude))
+            if moves_cell:
+                facets.update(PostFacets.deltas(added=[post]))
+                PostFacets.apply(facets)
+        if reindex:
+            PostService._clear_search_vector(post)
+        PostRepresentationCache.evict(post.id, old_updated_at)
+        if post.slug != old_slug:
+            PostService._evict_slugs(old_slug, post.slug)
+        if Post.Status.PUBLISHED in (old_status, post.status):
+            PostService._invalidate_published(old_category, post.category)
+        logger.info("Post updated: %s (id=%s)", post.title, post.id)
+        return post
+
+    @staticmethod
+    def delete_post(post, *, expected_updated_at=None):
+        """Permanently delete a post; ``expected_updated_at`` as for ``update_post``."""
+        post_id = post.id
+        post_title = post.title
+        was_published = post.status == Post.Status.PUBLISHED
+        PostRepresentationCache.evict(post_id, post.updated_at)
+        PostService._evict_slugs(post.slug)
+        with transaction.atomic():
+            PostService._lock_version(post, expected_updated_at)
+            facets = Counter()
+            facets.subtract(PostFacets.locked_cells([post]))
+            # Thumbnail files go only with the last post using them, once the delete commits
+            PostService._release_thumbnails(post)
+            post.delete()
+            PostFacets.apply(facets)
+        if was_published:
+            PostService._invalidate_published(post.category)
+        logger.info("Post deleted: %s (id=%s)", post_title, post_id)
+
+    @staticmethod
+    def apply_batch(*, author, creates=(), updates=(), deletes=()):
+        """
+        Apply many validated, permission-checked writes in one transaction.
+
+        ``creates`` are field dicts (as for ``create_post``) inserted with one
+        ``bulk_create`` after resolving every slug in one query; ``updates``
+        are ``(post, data)`` pairs written with one ``bulk_update``; ``deletes``
+        are posts removed with one ``DELETE``. Facet counts for all three move
+        with one upsert. Returns ``(created, updated)``.
+        """
+        with transaction.atomic():
+            facets = Counter()
+            facets.subtract(PostFacets.locked_cells([*(post for post, _ in updates), *deletes]))
+            created = PostService._bulk_create(author, creates)
+            updated = PostService._bulk_update(updates)
+            PostService._bulk_delete(deletes)
+            facets.update(PostFacets.deltas(added=[*created, *updated]))
+            PostFacets.apply(facets)
+        logger.info(
+            "Post batch applied: %d created, %d updated, %d deleted",
+            len(created), len(updated), len(deletes),
+        )
+        return created, updated
+
+    @staticmethod
+    def build_posts(items):
+        """
+        Build unsaved posts from ``create_post``-style keyword dicts (each with
+        its own ``author``), resolving every slug in one query. For bulk paths
+        that write the rows themselves; no search vector is attached. Items
+        with a ``thumbnail`` must be built in the transaction that saves them.
+        """
+        slugs = PostService._generate_unique_slugs([item["title"] for item in items])
+        return [PostService._build_post(slug=slug, **item) for item, slug in zip(items, slugs)]
+
+    @staticmethod
+    def _build_post(
+        *, title, slug, content, author, excerpt="", category="", status="draft", thumbnail=None, image_url=""
+    ):
+        """Build an unsaved post with derived fields (excerpt, published_at, image_url) filled in."""
         if not excerpt:
             excerpt = content[:AUTO_EXCERPT_LENGTH].strip()
 
@@ -53,21 +258,19 @@ class PostService:
             author=author,
             image_url=image_url or "/fintrellis.gif",
         )
-        # Assign thumbnail before first save so upload_to can use post.id
         if thumbnail:
-            post.thumbnail = thumbnail
-        post.save()
-
-        logger.info("Post created: %s (id=%s)", post.title, post.id)
+            PostService._set_thumbnail(post, thumbnail)
         return post
 
     @staticmethod
-    def update_post(post, *, data):
-        """Full or partial update of a post."""
+    def _apply_changes(post, data):
+        """Apply ``data`` and derived changes to ``post`` in memory; return whether it was reindexed."""
         old_status = post.status
-
         for field, value in data.items():
-            setattr(post, field, value)
+            if field == "thumbnail":
+                PostService._set_thumbnail(post, value)
+            else:
+                setattr(post, field, value)
 
         # Auto-set published_at on draft -> published transition
         if old_status == Post.Status.DRAFT and post.status == Post.Status.PUBLISHED:
@@ -77,30 +280,232 @@ class PostService:
         if "content" in data and "excerpt" not in data:
             post.excerpt = post.content[:AUTO_EXCERPT_LENGTH].strip()
 
-        post.save()
-        logger.info("Post updated: %s (id=%s)", post.title, post.id)
-        return post
+        # Only recompute the search vector when an indexed field may have changed
+        reindex = any(field in data for field in SEARCH_WEIGHTS)
+        if reindex:
+            post.search_vector = PostSearch.vector_for(post)
+        return reindex
 
     @staticmethod
-    def delete_post(post):
-        """Permanently delete a post."""
-        post_id = post.id
-        post_title = post.title
-        # Delete thumbnail file if it exists
-        if post.thumbnail:
-            post.thumbnail.delete(save=False)
-        post.delete()
-        logger.info("Post deleted: %s (id=%s)", post_title, post_id)
+    def finish_thumbnail(digest, renditions, placeholder=""):
+        """
+        Attach the ``renditions`` and ``placeholder`` the worker rendered for
+        blob ``digest`` (``None`` renditions mark the thumbnail failed) to the
+        blob and every post using it. Returns ``False``, and purges the files
+        again, if the last post let go of the blob meanwhile.
+        """
+        with transaction.atomic():
+            blob = ThumbnailBlob.objects.select_for_update().filter(pk=digest).first()
+            if blob is None:
+                transaction.on_commit(partial(ThumbnailBlobs.purge, digest))
+                return False
+            blob.renditions = renditions or {}
+            blob.status = Post.ThumbnailStatus.READY if renditions else Post.ThumbnailStatus.FAILED
+            blob.placeholder = placeholder if renditions else ""
+            blob.save(update_fields=[THUMBNAIL_BLOB_FIELDS[field] for field in THUMBNAIL_RESULT_FIELDS])
+            users = Post.objects.filter(thumbnail_blob=blob)
+            posts = list(users.select_for_update().order_by("pk").only("id", "status", "category", "updated_at"))
+            users.update(
+                **{field: getattr(blob, THUMBNAIL_BLOB_FIELDS[field]) for field in THUMBNAIL_RESULT_FIELDS},
+                updated_at=timezone.now(),
+            )
+        for post in posts:
+            PostRepresentationCache.evict(post.id, post.updated_at)
+        PostService._invalidate_published(*PostService._published_categories(posts))
+        return True
+
+    @staticmethod
+    def _set_thumbnail(post, upload):
+        """
+        Point ``post`` at the blob holding ``upload`` (``None`` clears the
+        thumbnail) and take over its metadata, renditions and status; an image
+        any post has uploaded before is neither stored, probed nor rendered
+        again. ``upload`` may be a complete ``ChunkedUpload``, which is
+        consumed. The previous thumbnail is released. Runs in the transaction
+        that saves the post.
+        """
+        if isinstance(upload, ChunkedUpload):
+            with ChunkedUploads.claim(upload) as file:
+                blob = ThumbnailBlobs.acquire(file)
+        else:
+            blob = ThumbnailBlobs.acquire(upload) if upload else None
+        if not post._state.adding:
+            PostService._release_thumbnails(post)
+        post.thumbnail_blob = blob
+        post.thumbnail = blob.original if blob else None
+        for field, blob_field in THUMBNAIL_BLOB_FIELDS.items():
+            value = getattr(blob, blob_field) if blob else Post._meta.get_field(field).get_default()
+            setattr(post, field, value)
+
+    @staticmethod
+    def _release_thumbnails(*posts):
+        """
+        Let go of the thumbnails stored for ``posts``: drop their blob
+        references, or for files stored before deduplication (no blob),
+        delete the files themselves once the write commits.
+
+        The rows are locked and what they hold is released rather than what
+        the instances say, which a concurrent write may have made stale; rows
+        already deleted release nothing. Call it before deleting the rows.
+        """
+        stored = list(
+            Post.objects.select_for_update()
+            .filter(pk__in=[post.pk for post in posts])
+            .order_by("pk")
+            .values_list("thumbnail_blob_id", "thumbnail", "thumbnail_renditions")
+        )
+        ThumbnailBlobs.release(*(digest for digest, _, _ in stored))
+        for digest, thumbnail, renditions in stored:
+            if thumbnail and digest is None:
+                for name in {thumbnail, *PostImages.names(renditions)}:
+                    transaction.on_commit(partial(default_storage.delete, name))
+
+    @staticmethod
+    def _lock_version(post, expected_updated_at):
+        """Lock ``post``'s row and raise ``PreconditionFailed`` unless it is still at ``expected_updated_at``."""
+        if expected_updated_at is None:
+            return
+        if not Post.objects.select_for_update().filter(pk=post.pk, updated_at=expected_updated_at).exists():
+            raise PreconditionFailed()
+
+    @staticmethod
+    def _loaded_fields(post, *, exclude=()):
+        """Names of the non-key fields ``post.save()`` would write, minus ``exclude``."""
+        deferred = post.get_deferred_fields()
+        return [
+            field.name
+            for field in Post._meta.concrete_fields
+            if not field.primary_key and field.attname not in deferred and field.name not in exclude
+        ]
+
+    @staticmethod
+    def _bulk_create(author, creates):
+        if not creates:
+            return []
+        posts = PostService.build_posts([{**data, "author": author} for data in creates])
+        for post in posts:
+            post.search_vector = PostSearch.vector_for(post)
+        Post.objects.bulk_create(posts)
+        for post in posts:
+            PostService._clear_search_vector(post)
+        PostService._evict_slugs(*(post.slug for post in posts))
+        PostService._invalidate_published(*PostService._published_categories(posts))
+        return posts
+
+    @staticmethod
+    def _bulk_update(updates):
+        if not updates:
+            return []
+        # bulk_update() bypasses auto_now, so stamp every row with one timestamp
+        now = timezone.now()
+        fields = {"updated_at", "published_at", "excerpt"}
+        posts, reindexed, published_categories = [], set(), set()
+        for post, data in updates:
+            old_status, old_category, old_slug = post.status, post.category, post.slug
+            PostRepresentationCache.evict(post.id, post.updated_at)
+            if PostService._apply_changes(post, data):
+                reindexed.add(post.pk)
+            if post.slug != old_slug:
+                PostService._evict_slugs(old_slug, post.slug)
+            post.updated_at = now
+            fields.update(data)
+            if "thumbnail" in data:
+                fields.update(("thumbnail_blob", *THUMBNAIL_BLOB_FIELDS))
+            if Post.Status.PUBLISHED in (old_status, post.status):
+                published_categories.update((old_category, post.category))
+            posts.append(post)
+
+        if reindexed:
+            fields.add("search_vector")
+            for post in posts:
+                if post.pk not in reindexed:
+                    post.search_vector = F("search_vector")
+        Post.objects.bulk_update(posts, sorted(fields))
+        for post in posts:
+            PostService._clear_search_vector(post)
+        PostService._invalidate_published(*published_categories)
+        return posts
+
+    @staticmethod
+    def _bulk_delete(posts):
+        if not posts:
+            return
+        PostService._evict_slugs(*(post.slug for post in posts))
+        for post in posts:
+            PostRepresentationCache.evict(post.id, post.updated_at)
+        PostService._release_thumbnails(*posts)
+        Post.objects.filter(pk__in=[post.pk for post in posts]).delete()
+        PostService._invalidate_published(*PostService._published_categories(posts))
+
+    @staticmethod
+    def _published_categories(posts):
+        return {post.category for post in posts if post.status == Post.Status.PUBLISHED}
+
+    @staticmethod
+    def author_changed(author_id):
+        """
+        Drop cached output that renders an author's details (their email in
+        post representations and published lists, their name in feeds) after
+        their user row changed; the post rows themselves are untouched.
+        """
+        rows = list(Post.objects.filter(author_id=author_id).values_list("id", "updated_at", "status", "category"))
+        PostRepresentationCache.evict_many((post_id, updated_at) for post_id, updated_at, _, _ in rows)
+        categories = {category for _, _, status, category in rows if status == Post.Status.PUBLISHED}
+        if categories:
+            PostListCache.bump()
+            PostFeeds.invalidate(*categories)
+
+    @staticmethod
+    def _invalidate_published(*categories):
+        """
+        Retire cached published-list pages, the all-posts feeds plus those of
+        ``categories`` and the built sitemap, once the write is visible to readers. A no-op when called
+        with no categories, i.e. when no published post was touched.
+        """
+        if not categories:
+            return
+
+        def retire():
+            PostListCache.bump()
+            PostFeeds.invalidate(*categories)
+            PostSitemap.invalidate()
+
+        transaction.on_commit(retire)
+
+    @staticmethod
+    def _evict_slugs(*slugs):
+        """
+        Forget cached lookups for ``slugs`` now and again on commit, so a lookup
+        racing the transaction cannot leave the pre-write answer cached.
+        """
+        PostSlugCache.evict(*slugs)
+        transaction.on_commit(partial(PostSlugCache.evict, *slugs))
+
+    @staticmethod
+    def _clear_search_vector(post):
+        """Drop the saved SQL expression so the instance doesn't re-send it on a later save()."""
+        post.__dict__.pop("search_vector", None)
 
     @staticmethod
     def _generate_unique_slug(title):
         """Generate a URL-safe slug, appending a short UUID suffix on collision."""
-        base_slug = slugify(title)
-        if not base_slug:
-            base_slug = "post"
-
-        slug = base_slug
-        if Post.objects.filter(slug=slug).exists():
-            suffix = uuid.uuid4().hex[:8]
-            slug = f"{base_slug}-{suffix}"
-        return slug
+        return PostService._generate_unique_slugs([title])[0]
+
+    @staticmethod
+    def _generate_unique_slugs(titles):
+        """
+        Slugs for many titles with a single existence query; collisions with
+        existing posts or earlier titles in the same call get a short UUID suffix.
+        """
+        bases = [slugify(title) or "post" for title in titles]
+        taken = set(Post.objects.filter(slug__in=set(bases)).values_list("slug", flat=True))
+
+        slugs = []
+        for base_slug in bases:
+            slug = base_slug
+            if slug in taken:
+                suffix = uuid.uuid4().hex[:8]
+                slug = f"{base_slug}-{suffix}"
+            taken.add(slug)
+            slugs.append(slug)
+        return slugs
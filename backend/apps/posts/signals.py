@@ -0,0 +1,21 @@
+"""
+Keeps post caches in step with the users who author posts.
+
+Post responses and feeds render the author's email and name, but editing a
+user does not touch ``Post.updated_at``, which the caches are keyed on.
+"""
+from functools import partial
+
+from django.db import transaction
+
+from .services import PostService
+
+# User fields rendered into cached post output
+AUTHOR_FIELDS = frozenset({"email", "first_name", "last_name"})
+
+
+def author_saved(sender, instance, created, update_fields=None, **kwargs):
+    """``post_save`` receiver for the user model; saves of other fields (e.g. ``last_login``) are ignored."""
+    if created or (update_fields is not None and not AUTHOR_FIELDS & set(update_fields)):
+        return
+    transaction.on_commit(partial(PostService.author_changed, instance.pk))
@@ -0,0 +1,248 @@
+"""
+Sharded ``sitemap.xml`` of every published post, built to disk incrementally.
+
+Posts are assigned to shards by publication month (UTC), a key that never
+changes for a published post; a month holding more than ``SITEMAP_SHARD_SIZE``
+URLs (the protocol's limit) is split into numbered parts. One aggregate query
+fingerprints every month (URL count, newest ``updated_at`` and a hash over
+slugs and ``updated_at``), and only months whose fingerprint differs from the
+manifest are streamed and rewritten. A new post rewrites its own month, an
+edit, delete or unpublish rewrites the month of that post, and importing an
+old post rewrites only the month it was published in; no other shard moves.
+``manifest.json`` (written last) lists the shards with their checksum, URL
+count and build time, and the index is rendered from it.
+
+Building happens out of band, never in a request: ``build_sitemap --watch``
+(the ``sitemap-builder`` service) rebuilds once ``PostService`` has bumped
+the generation number on commit of a write touching a published post, and
+the views serve whatever manifest is on disk.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import BigIntegerField, CharField, Count, Func, IntegerField, Max, Sum
+from django.db.models.functions import Cast, Concat, TruncMonth
+from django.urls import reverse
+from django.utils import timezone
+
+from .constants import SITEMAP_SHARD_SIZE
+from .models import Post
+
+MANIFEST_NAME = "manifest.json"
+SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+GENERATION_KEY = "posts:sitemap:generation"
+BUILD_LOCK_KEY = "posts:sitemap:building"
+# Upper bound on a build; a crashed builder's lock expires after this
+BUILD_LOCK_TIMEOUT = 600
+CURSOR_CHUNK_SIZE = 5000
+
+
+class PostSitemap:
+    """Stateless helpers for building, reading and invalidating the sitemap shards."""
+
+    @staticmethod
+    def manifest():
+        """Return the manifest on disk; before the first build, one without shards."""
+        manifest = PostSitemap._read_manifest()
+        if manifest is None:
+            return {"generation": None, "site": settings.PUBLIC_SITE_URL, "months": {}, "shards": []}
+        return manifest
+
+    @staticmethod
+    def is_stale():
+        """Whether a write (or a changed site URL) has outdated the built shards."""
+        manifest = PostSitemap._read_manifest()
+        return (
+            manifest is None
+            or manifest["generation"] != PostSitemap._generation()
+            or manifest["site"] != settings.PUBLIC_SITE_URL
+        )
+
+    @staticmethod
+    def refresh():
+        """
+        Rebuild if the shards are outdated and no other builder is running.
+        Returns the numbers of rewritten shards, or ``None`` if nothing ran.
+        """
+        if not PostSitemap.is_stale() or not cache.add(BUILD_LOCK_KEY, 1, timeout=BUILD_LOCK_TIMEOUT):
+            return None
+        try:
+            return PostSitemap.build()[1]
+        finally:
+            cache.delete(BUILD_LOCK_KEY)
+
+    @staticmethod
+    def build(*, force=False):
+        """
+        Bring the shard files up to date with the published posts. Returns the
+        new manifest and the names of the shards that were (re)written.
+        """
+        # Read before querying, so a write that lands mid-build retires this build
+        generation = PostSitemap._generation()
+        root = PostSitemap._root()
+        root.mkdir(parents=True, exist_ok=True)
+        previous = PostSitemap._read_manifest()
+        site = settings.PUBLIC_SITE_URL
+        reuse = not force and previous is not None and previous["site"] == site
+        old_months = previous["months"] if reuse else {}
+        old_shards = {shard["name"]: shard for shard in previous["shards"]} if reuse else {}
+
+        months, shards, rebuilt = {}, [], []
+        for month, fingerprint in PostSitemap._fingerprints():
+            months[month] = fingerprint
+            kept = [shard for name, shard in old_shards.items() if shard["month"] == month]
+            if old_months.get(month) == fingerprint and all(PostSitemap.shard_path(s["name"]).exists() for s in kept):
+                shards.extend(sorted(kept, key=lambda shard: shard["part"]))
+                continue
+            for part, entries in enumerate(PostSitemap._month_parts(month), start=1):
+                name = month if part == 1 else f"{month}-{part}"
+                checksum = hashlib.sha256(
+                    "".join(f"{slug}\t{updated_at.isoformat()}\n" for slug, updated_at in entries).encode()
+                ).hexdigest()
+                old = old_shards.get(name)
+                if old is not None and old["checksum"] == checksum and PostSitemap.shard_path(name).exists():
+                    shards.append(old)
+                    continue
+                PostSitemap._write_shard(name, entries, site)
+                rebuilt.append(name)
+                shards.append({
+                    "name": name,
+                    "month": month,
+                    "part": part,
+                    "checksum": checksum,
+                    "urls": len(entries),
+                    "lastmod": max(updated_at for _, updated_at in entries).isoformat(),
+                    "built_at": timezone.now().isoformat(),
+                })
+
+        manifest = {"generation": generation, "site": site, "months": months, "shards": shards}
+        PostSitemap._write_atomic(root / MANIFEST_NAME, json.dumps(manifest, indent=2).encode())
+        # Shards the new manifest no longer lists go only after it is in place
+        names = {shard["name"] for shard in shards}
+        for shard in previous["shards"] if previous else ():
+            if shard["name"] not in names:
+                PostSitemap.shard_path(shard["name"]).unlink(missing_ok=True)
+        return manifest, rebuilt
+
+    @staticmethod
+    def _fingerprints():
+        """``(month, fingerprint)`` of every publication month with published posts, oldest first."""
+        row_hash = Func(
+            Concat("slug", Cast("updated_at", CharField())), function="hashtext", output_field=IntegerField()
+        )
+        rows = (
+            Post.objects.published()
+            .annotate(month=TruncMonth("published_at", tzinfo=dt_timezone.utc))
+            .values("month")
+            .annotate(urls=Count("id"), lastmod=Max("updated_at"), hashed=Sum(row_hash, output_field=BigIntegerField()))
+            .order_by("month")
+        )
+        for row in rows:
+            yield row["month"].strftime("%Y-%m"), f"{row['urls']}:{row['lastmod'].isoformat()}:{row['hashed']}"
+
+    @staticmethod
+    def _month_parts(month):
+        """The ``(slug, updated_at)`` rows published in ``month``, in parts of at most ``SITEMAP_SHARD_SIZE``."""
+        start = datetime.strptime(month, "%Y-%m").replace(tzinfo=dt_timezone.utc)
+        end = start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+        rows = (
+            Post.objects.published()
+            .filter(published_at__gte=start, published_at__lt=end)
+            .order_by("published_at", "id")
+            .values_list("slug", "updated_at")
+        )
+        entries = []
+        for row in rows.iterator(chunk_size=CURSOR_CHUNK_SIZE):
+            entries.append(row)
+            if len(entries) == SITEMAP_SHARD_SIZE:
+                yield entries
+                entries = []
+        if entries:
+            yield entries
+
+    @staticmethod
+    def render_index(shard_urls, shards):
+        """Render the sitemap index pointing at ``shard_urls``."""
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<sitemapindex xmlns="{SITEMAP_NAMESPACE}">']
+        for url, shard in zip(shard_urls, shards):
+            lines.append(f"<sitemap><loc>{escape(url)}</loc><lastmod>{_w3c(shard['lastmod'])}</lastmod></sitemap>")
+        lines.append("</sitemapindex>\n")
+        return "\n".join(lines).encode()
+
+    @staticmethod
+    def shard_url(name):
+        """Public URL of a shard, on the same origin as the post URLs it lists."""
+        return f"{settings.PUBLIC_SITE_URL}{reverse('sitemap-shard', args=[name])}"
+
+    @staticmethod
+    def shard_path(name):
+        return PostSitemap._root() / f"sitemap-{name}.xml"
+
+    @staticmethod
+    def invalidate():
+        """Mark the built shards as outdated; the builder then rewrites the changed ones."""
+        try:
+            cache.incr(GENERATION_KEY)
+        except ValueError:
+            PostSitemap._generation()
+
+    @staticmethod
+    def _write_shard(name, entries, site):
+        def lines():
+            yield f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NAMESPACE}">\n'
+            for slug, updated_at in entries:
+                yield (
+                    f"<url><loc>{escape(f'{site}/posts/{slug}')}</loc>"
+                    f"<lastmod>{_w3c(updated_at.isoformat())}</lastmod></url>\n"
+                )
+            yield "</urlset>\n"
+
+        PostSitemap._write_atomic(PostSitemap.shard_path(name), "".join(lines()).encode())
+
+    @staticmethod
+    def _write_atomic(path, data):
+        # Readers see either the old file or the new one, never a partial write
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @staticmethod
+    def _read_manifest():
+        try:
+            with open(PostSitemap._root() / MANIFEST_NAME, encoding="utf-8") as handle:
+                return json.load(handle)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    @staticmethod
+    def _root():
+        return Path(settings.SITEMAP_ROOT)
+
+    @staticmethod
+    def _generation():
+        generation = cache.get(GENERATION_KEY)
+        if generation is None:
+            # Clock-seeded, as in PostListCache, so an evicted counter never
+            # falls back onto the generation an existing manifest was built for
+            cache.add(GENERATION_KEY, int(time.time() * 1000), timeout=None)
+            generation = cache.get(GENERATION_KEY)
+        return generation
+
+
+def _w3c(isoformat):
+    """W3C datetime in UTC, e.g. ``2024-05-01T12:00:00Z``."""
+    moment = datetime.fromisoformat(isoformat).astimezone(dt_timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -1,7 +1,19 @@
 import pytest
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
 from apps.accounts.tests.factories import UserFactory
+from apps.posts.services import PostService
+
+from .factories import POST_CONTENT
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Keep cached list pages and counters from leaking between tests."""
+    cache.clear()
+    yield
+    cache.clear()
 
 
 @pytest.fixture
@@ -19,6 +31,21 @@ def admin_user():
     return UserFactory(admin=True)
 
 
+@pytest.fixture
+def create_post(author_user):
+    """
+    Create posts through ``PostService`` rather than ``PostFactory``, so
+    facet counters, feeds, thumbnails and the rest are maintained as in
+    production. Posts are by ``author_user`` unless another author is given.
+    """
+    def create(author=None, **fields):
+        fields.setdefault("title", "Test post")
+        fields.setdefault("content", POST_CONTENT)
+        return PostService.create_post(author=author or author_user, **fields)
+
+    return create
+
+
 @pytest.fixture
 def auth_client(author_user):
     """APIClient authenticated as an author."""
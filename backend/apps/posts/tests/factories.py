@@ -1,13 +1,22 @@
+import io
+
 import factory
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.utils import timezone
+from PIL import Image
 
 from apps.accounts.tests.factories import UserFactory
 from apps.posts.models import Post
+from apps.posts.search import PostSearch
+
+# Long enough for the serializer's content validation
+POST_CONTENT = "Enough content for a test post."
 
 
 class PostFactory(factory.django.DjangoModelFactory):
     class Meta:
         model = Post
+        skip_postgeneration_save = True
 
     title = factory.Sequence(lambda n: f"Test Post {n}")
     slug = factory.Sequence(lambda n: f"test-post-{n}")
@@ -22,3 +31,18 @@ class PostFactory(factory.django.DjangoModelFactory):
             status=Post.Status.PUBLISHED,
             published_at=factory.LazyFunction(timezone.now),
         )
+
+    @factory.post_generation
+    def search_vector(obj, create, extracted, **kwargs):
+        """Index the post the same way PostService does."""
+        if create:
+            Post.objects.filter(pk=obj.pk).update(search_vector=PostSearch.vector_expression())
+
+
+def image_upload(size=(3000, 1500), mode="RGB", image_format="JPEG", exif=None, name="photo.jpg"):
+    """A real, decodable image upload of a single colour."""
+    buffer = io.BytesIO()
+    image = Image.new(mode, size, (200, 30, 30, 128) if mode == "RGBA" else (200, 30, 30))
+    options = {"exif": exif} if exif is not None else {}
+    image.save(buffer, image_format, **options)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type=f"image/{image_format.lower()}")
@@ -0,0 +1,234 @@
+import os
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.urls import reverse
+
+from apps.posts.blobs import ThumbnailBlobs
+from apps.posts.images import PostImages
+from apps.posts.models import Post, ThumbnailBlob, ThumbnailJob
+from apps.posts.services import PostService
+from apps.posts.thumbnails import ThumbnailQueue
+
+from .factories import PostFactory, image_upload
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def _stored(root):
+    return sorted(str(path.relative_to(root)) for path in root.rglob("*") if path.is_file())
+
+
+def _age(root, name, seconds):
+    """Backdate a stored file's modification time."""
+    path = root / name
+    stamp = path.stat().st_mtime - seconds
+    os.utime(path, (stamp, stamp))
+
+
+@pytest.mark.django_db
+class TestThumbnailDeduplication:
+    def test_upload_is_stored_by_content_hash(self, create_post):
+        upload = image_upload()
+        post = create_post(thumbnail=upload)
+        digest = ThumbnailBlobs.digest(upload)
+        assert post.thumbnail_blob_id == digest
+        assert post.thumbnail.name == f"posts/thumbnails/{digest[:2]}/{digest}/original.jpg"
+        assert ThumbnailBlob.objects.get().refcount == 1
+
+    def test_duplicate_upload_skips_storage_and_rendering(self, create_post, media_root):
+        first = create_post(thumbnail=image_upload())
+        stored = _stored(media_root)
+        with mock.patch.object(default_storage, "save") as save:
+            second = create_post(thumbnail=image_upload(name="copy.jpg"))
+        save.assert_not_called()
+        assert _stored(media_root) == stored
+        assert second.thumbnail.name == first.thumbnail.name
+        assert ThumbnailJob.objects.count() == 1
+        assert ThumbnailBlob.objects.get().refcount == 2
+
+    def test_duplicate_of_a_rendered_image_is_ready_at_once(self, create_post):
+        first = create_post(thumbnail=image_upload())
+        ThumbnailQueue.run_pending()
+        first.refresh_from_db()
+        with mock.patch.object(PostImages, "probe") as probe:
+            second = create_post(thumbnail=image_upload())
+        probe.assert_not_called()
+        assert second.thumbnail_status == Post.ThumbnailStatus.READY
+        assert second.thumbnail_renditions == first.thumbnail_renditions
+        assert second.thumbnail_placeholder == first.thumbnail_placeholder
+        assert (second.thumbnail_width, second.thumbnail_height) == (3000, 1500)
+        assert not ThumbnailJob.objects.exists()
+
+    def test_rendering_reaches_every_post_sharing_the_image(self, auth_client, create_post):
+        posts = [create_post(thumbnail=image_upload()), create_post(thumbnail=image_upload())]
+        pending = [auth_client.get(reverse("post-detail", args=[post.id])).data for post in posts]
+        assert {data["thumbnail_status"] for data in pending} == {"pending"}
+        assert ThumbnailQueue.run_pending() == 1
+        for post in posts:
+            data = auth_client.get(reverse("post-detail", args=[post.id])).data
+            assert data["thumbnail_status"] == "ready"
+            assert set(data["thumbnail_renditions"]) == {"card", "hero", "retina"}
+
+    def test_reuploading_the_same_image_keeps_one_reference(self, create_post, django_capture_on_commit_callbacks):
+        post = create_post(thumbnail=image_upload())
+        with django_capture_on_commit_callbacks(execute=True):
+            PostService.update_post(post, data={"thumbnail": image_upload()})
+        assert ThumbnailBlob.objects.get().refcount == 1
+        assert default_storage.exists(post.thumbnail.name)
+
+
+@pytest.mark.django_db
+class TestThumbnailReferences:
+    def _rendered(self, create_post, count=1):
+        posts = [create_post(thumbnail=image_upload()) for _ in range(count)]
+        ThumbnailQueue.run_pending()
+        for post in posts:
+            post.refresh_from_db()
+        return posts
+
+    def _files(self, post):
+        return [post.thumbnail.name, *PostImages.names(post.thumbnail_renditions)]
+
+    def test_delete_keeps_files_other_posts_use(self, create_post, django_capture_on_commit_callbacks):
+        first, second = self._rendered(create_post, count=2)
+        with django_capture_on_commit_callbacks(execute=True):
+            PostService.delete_post(first)
+        assert ThumbnailBlob.objects.get().refcount == 1
+        assert all(default_storage.exists(name) for name in self._files(second))
+
+    def test_last_reference_removes_blob_and_files(self, create_post, django_capture_on_commit_callbacks):
+        first, second = self._rendered(create_post, count=2)
+        files = self._files(first)
+        with django_capture_on_commit_callbacks(execute=True):
+            PostService.delete_post(first)
+            PostService.update_post(second, data={"thumbnail": None})
+        assert not ThumbnailBlob.objects.exists()
+        assert not any(default_storage.exists(name) for name in files)
+
+    def test_deleting_a_post_twice_releases_one_reference(self, create_post, django_capture_on_commit_callbacks):
+        first, second, third = self._rendered(create_post, count=3)
+        copy = Post.objects.get(pk=first.pk)
+        PostService.delete_post(first)
+        # A second request that loaded the same post before the first delete
+        PostService.delete_post(copy)
+        assert ThumbnailBlob.objects.get().refcount == 2
+        with django_capture_on_commit_callbacks(execute=True):
+            PostService.delete_post(second)
+            PostService.delete_post(third)
+        assert not ThumbnailBlob.objects.exists()
+
+    def test_stale_replacement_releases_the_stored_thumbnail(self, create_post):
+        (post,) = self._rendered(create_post)
+        original = post.thumbnail_blob_id
+        copy = Post.objects.get(pk=post.pk)
+        PostService.update_post(post, data={"thumbnail": image_upload(size=(900, 900))})
+        # The copy still points at the original blob, which the first update released
+        PostService.update_post(copy, data={"thumbnail": image_upload(size=(800, 800))})
+        assert not ThumbnailBlob.objects.filter(pk=original).exists()
+        assert list(ThumbnailBlob.objects.values_list("refcount", flat=True)) == [1]
+        assert ThumbnailBlobs.collect_garbage(dry_run=True)["drift"] == []
+
+    def test_stale_save_keeps_the_stored_thumbnail(self, create_post):
+        (post,) = self._rendered(create_post)
+        copy = Post.objects.get(pk=post.pk)
+        PostService.update_post(post, data={"thumbnail": image_upload(size=(900, 900))})
+        PostService.update_post(copy, data={"title": "Renamed"})
+        copy.refresh_from_db()
+        assert copy.title == "Renamed"
+        assert copy.thumbnail_blob_id == post.thumbnail_blob_id
+        assert copy.thumbnail_width == 900
+
+    def test_files_stay_until_the_delete_commits(self, create_post):
+        (post,) = self._rendered(create_post)
+        PostService.delete_post(post)
+        assert default_storage.exists(post.thumbnail.name)
+
+    def test_batch_delete_releases_references(self, auth_client, create_post, django_capture_on_commit_callbacks):
+        posts = self._rendered(create_post, count=2)
+        operations = [{"op": "delete", "id": str(post.id)} for post in posts]
+        with django_capture_on_commit_callbacks(execute=True):
+            response = auth_client.post(reverse("post-batch"), {"operations": operations}, format="json")
+        assert response.status_code == 200
+        assert not ThumbnailBlob.objects.exists()
+        assert not default_storage.exists(posts[0].thumbnail.name)
+
+    def test_purge_spares_an_image_uploaded_again(self, create_post):
+        (post,) = self._rendered(create_post)
+        blob = ThumbnailBlob.objects.get()
+        ThumbnailBlobs.purge(blob.digest, blob.original)
+        assert default_storage.exists(post.thumbnail.name)
+
+    def test_files_of_posts_stored_before_deduplication_are_deleted(
+        self, author_user, django_capture_on_commit_callbacks
+    ):
+        post = PostFactory(author=author_user)
+        name = default_storage.save(f"posts/thumbnails/{post.id}/legacy.jpg", ContentFile(b"legacy"))
+        Post.objects.filter(pk=post.pk).update(thumbnail=name)
+        post.refresh_from_db()
+        with django_capture_on_commit_callbacks(execute=True):
+            PostService.delete_post(post)
+        assert not default_storage.exists(name)
+
+
+@pytest.mark.django_db
+class TestThumbnailGarbageCollection:
+    def test_repairs_drifted_refcounts(self, create_post):
+        create_post(thumbnail=image_upload())
+        ThumbnailBlob.objects.update(refcount=5)
+        result = ThumbnailBlobs.collect_garbage()
+        assert [(stored, actual) for _, stored, actual in result["drift"]] == [(5, 1)]
+        assert ThumbnailBlob.objects.get().refcount == 1
+
+    def test_deletes_unreferenced_blobs(self, create_post, django_capture_on_commit_callbacks):
+        post = create_post(thumbnail=image_upload())
+        # A delete that bypassed PostService left the blob behind
+        Post.objects.filter(pk=post.pk).delete()
+        with django_capture_on_commit_callbacks(execute=True):
+            result = ThumbnailBlobs.collect_garbage()
+        assert result["released"] == [post.thumbnail_blob_id]
+        assert not ThumbnailBlob.objects.exists()
+        assert not default_storage.exists(post.thumbnail.name)
+
+    def test_removes_old_orphaned_files_only(self, create_post, media_root):
+        post = create_post(thumbnail=image_upload())
+        orphan = default_storage.save("posts/thumbnails/ff/stray/original.jpg", ContentFile(b"stray"))
+        fresh = default_storage.save("posts/thumbnails/ee/fresh/original.jpg", ContentFile(b"fresh"))
+        _age(media_root, orphan, 7200)
+        _age(media_root, post.thumbnail.name, 7200)
+
+        result = ThumbnailBlobs.collect_garbage(grace=timedelta(hours=1))
+        assert result["orphans"] == [orphan]
+        assert not default_storage.exists(orphan)
+        assert default_storage.exists(fresh)
+        assert default_storage.exists(post.thumbnail.name)
+
+    def test_dry_run_changes_nothing(self, create_post):
+        post = create_post(thumbnail=image_upload())
+        ThumbnailBlob.objects.update(refcount=3)
+        orphan = default_storage.save("posts/thumbnails/ff/stray/original.jpg", ContentFile(b"stray"))
+        result = ThumbnailBlobs.collect_garbage(dry_run=True, grace=timedelta(0))
+        assert result["orphans"] == [orphan]
+        assert ThumbnailBlob.objects.get().refcount == 3
+        assert default_storage.exists(orphan)
+        assert default_storage.exists(post.thumbnail.name)
+
+    def test_command(self, create_post):
+        create_post(thumbnail=image_upload())
+        ThumbnailBlob.objects.update(refcount=2)
+        default_storage.save("posts/thumbnails/ff/stray/original.jpg", ContentFile(b"stray"))
+        out = StringIO()
+        call_command("gc_thumbnails", "--grace", "0", stdout=out)
+        assert (
+            "Collected refcounts drifted: 1, unreferenced blobs: 0, orphaned files: 1, expired uploads: 0."
+            in out.getvalue()
+        )
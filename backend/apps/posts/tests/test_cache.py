@@ -0,0 +1,173 @@
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory
+
+from apps.posts.cache import PostListCache, PostRepresentationCache
+from apps.posts.serializers import PostDetailSerializer, PostListSerializer
+from apps.posts.services import PostService
+
+from .factories import PostFactory
+
+PUBLISHED = {"status": "published"}
+
+
+@pytest.mark.django_db
+class TestPostListCache:
+    def test_published_list_is_served_from_cache(self, auth_client, django_assert_num_queries):
+        PostFactory.create_batch(2, published=True)
+        first = auth_client.get(reverse("post-list"), PUBLISHED)
+        assert first["X-Cache"] == "MISS"
+
+        with django_assert_num_queries(0):
+            second = auth_client.get(reverse("post-list"), PUBLISHED)
+        assert second["X-Cache"] == "HIT"
+        assert second.data == first.data
+        assert PostListCache.stats() == {"hits": 1, "misses": 1}
+
+    def test_query_param_order_does_not_split_the_cache(self, auth_client):
+        PostFactory(published=True)
+        auth_client.get(reverse("post-list") + "?status=published&page_size=5")
+        response = auth_client.get(reverse("post-list") + "?page_size=5&status=published")
+        assert response["X-Cache"] == "HIT"
+
+    def test_other_lists_are_not_cached(self, auth_client):
+        PostFactory()
+        response = auth_client.get(reverse("post-list"))
+        assert "X-Cache" not in response
+        assert PostListCache.stats() == {"hits": 0, "misses": 0}
+
+    def test_publishing_via_api_invalidates(self, auth_client, django_capture_on_commit_callbacks):
+        auth_client.get(reverse("post-list"), PUBLISHED)
+        payload = {
+            "title": "Fresh Post",
+            "content": "This is enough content for the minimum validation.",
+            "status": "published",
+        }
+        with django_capture_on_commit_callbacks(execute=True):
+            auth_client.post(reverse("post-list"), payload, format="json")
+
+        response = auth_client.get(reverse("post-list"), PUBLISHED)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["count"] == 1
+
+    @pytest.mark.parametrize(
+        "write",
+        [
+            lambda post: PostService.update_post(post, data={"title": "Renamed"}),
+            lambda post: PostService.update_post(post, data={"status": "draft"}),
+            PostService.delete_post,
+        ],
+        ids=["update", "unpublish", "delete"],
+    )
+    def test_writes_to_published_posts_bump_generation(self, write, django_capture_on_commit_callbacks):
+        post = PostFactory(published=True)
+        before = PostListCache.generation()
+        with django_capture_on_commit_callbacks(execute=True):
+            write(post)
+        assert PostListCache.generation() == before + 1
+
+    def test_draft_only_writes_keep_generation(self, django_capture_on_commit_callbacks):
+        post = PostFactory()
+        before = PostListCache.generation()
+        with django_capture_on_commit_callbacks(execute=True):
+            PostService.update_post(post, data={"title": "Still a draft"})
+        assert PostListCache.generation() == before
+
+    def test_bump_is_deferred_until_commit(self, django_capture_on_commit_callbacks):
+        post = PostFactory(published=True)
+        before = PostListCache.generation()
+        with django_capture_on_commit_callbacks(execute=False) as callbacks:
+            PostService.update_post(post, data={"title": "Pending"})
+        assert PostListCache.generation() == before
+        assert len(callbacks) == 1
+
+
+@pytest.mark.django_db
+class TestPostRepresentationCache:
+    def _request(self):
+        return APIRequestFactory().get("/api/v1/posts/")
+
+    def test_cached_output_matches_serializer(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        post = PostFactory(
+            thumbnail=SimpleUploadedFile("t.png", b"png", content_type="image/png"),
+            thumbnail_renditions={"card": {"width": 480, "height": 240, "webp": "c.webp", "jpeg": "c.jpg"}},
+        )
+        request = self._request()
+        expected = PostDetailSerializer(post, context={"request": request}).data
+
+        first = PostRepresentationCache.render(post, PostDetailSerializer, request, kind="detail")
+        second = PostRepresentationCache.render(post, PostDetailSerializer, request, kind="detail")
+        assert first == second == expected
+        assert second["thumbnail_url"].startswith("http://testserver/")
+        assert second["thumbnail_renditions"]["card"]["webp"] == "http://testserver/media/c.webp"
+
+    def test_only_misses_are_serialized(self):
+        posts = PostFactory.create_batch(3)
+        PostRepresentationCache.render_many(posts[:2], PostListSerializer, None, kind="list")
+        with mock.patch.object(PostListSerializer, "to_representation", autospec=True,
+                               side_effect=PostListSerializer.to_representation) as rendered:
+            PostRepresentationCache.render_many(posts, PostListSerializer, None, kind="list")
+        assert [call.args[1] for call in rendered.call_args_list] == [posts[2]]
+
+    def test_search_fields_are_not_cached(self):
+        post = PostFactory()
+        post.search_rank, post.search_headline = 0.5, "<mark>x</mark>"
+        data = PostRepresentationCache.render(post, PostListSerializer, None, kind="list")
+        assert data["search_rank"] == 0.5
+        cached = cache.get(PostRepresentationCache.key_for("list", post.pk, post.updated_at))
+        assert "search_rank" not in cached
+
+    def test_update_evicts_previous_version(self, auth_client, author_user):
+        post = PostFactory(author=author_user, title="Before")
+        auth_client.get(reverse("post-detail", args=[post.id]))
+        old_key = PostRepresentationCache.key_for("detail", post.pk, post.updated_at)
+        assert cache.get(old_key) is not None
+
+        auth_client.patch(reverse("post-detail", args=[post.id]), {"title": "After"}, format="json")
+        assert cache.get(old_key) is None
+        assert auth_client.get(reverse("post-detail", args=[post.id])).data["title"] == "After"
+
+    def test_delete_evicts_entries(self, author_user):
+        post = PostFactory(author=author_user)
+        PostRepresentationCache.render(post, PostListSerializer, None, kind="list")
+        key = PostRepresentationCache.key_for("list", post.pk, post.updated_at)
+        PostService.delete_post(post)
+        assert cache.get(key) is None
+
+
+@pytest.mark.django_db
+class TestAuthorChanges:
+    @pytest.fixture
+    def post(self, author_user):
+        return PostFactory(author=author_user, published=True)
+
+    def test_detail_shows_the_new_email(self, auth_client, author_user, post, django_capture_on_commit_callbacks):
+        assert auth_client.get(reverse("post-detail", args=[post.id])).data["author_email"] == author_user.email
+        with django_capture_on_commit_callbacks(execute=True):
+            author_user.email = "renamed@example.com"
+            author_user.save()
+        assert auth_client.get(reverse("post-detail", args=[post.id])).data["author_email"] == "renamed@example.com"
+
+    def test_published_list_shows_the_new_email(
+        self, auth_client, author_user, post, django_capture_on_commit_callbacks
+    ):
+        auth_client.get(reverse("post-list"), PUBLISHED)
+        with django_capture_on_commit_callbacks(execute=True):
+            author_user.email = "renamed@example.com"
+            author_user.save(update_fields=["email"])
+        response = auth_client.get(reverse("post-list"), PUBLISHED)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["results"][0]["author_email"] == "renamed@example.com"
+
+    def test_other_user_saves_keep_the_cache(self, author_user, post, django_capture_on_commit_callbacks):
+        PostRepresentationCache.render(post, PostListSerializer, None, kind="list")
+        generation = PostListCache.generation()
+        with django_capture_on_commit_callbacks(execute=True):
+            author_user.save(update_fields=["last_login"])
+        assert cache.get(PostRepresentationCache.key_for("list", post.pk, post.updated_at)) is not None
+        assert PostListCache.generation() == generation
@@ -0,0 +1,100 @@
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from apps.posts.export import EXPORT_FIELDS, PostExport
+from apps.posts.models import Post
+
+from .factories import PostFactory
+
+
+def _body(response):
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestPostExportAPI:
+    def test_streams_ndjson_for_every_post(self, auth_client):
+        posts = PostFactory.create_batch(3)
+        response = auth_client.get(reverse("post-export"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response["Content-Type"] == "application/x-ndjson; charset=utf-8"
+        assert response["Content-Disposition"].startswith('attachment; filename="posts-')
+        records = [json.loads(line) for line in _body(response).splitlines()]
+        assert [record["id"] for record in records] == [str(post.id) for post in posts]
+        assert list(records[0]) == list(EXPORT_FIELDS)
+        assert records[0]["content"] == posts[0].content
+        assert records[0]["author_email"] == posts[0].author.email
+
+    def test_applies_post_filter(self, auth_client):
+        PostFactory(category="Backend", published=True)
+        PostFactory(category="Backend")
+        PostFactory(category="Design", published=True)
+        response = auth_client.get(reverse("post-export"), {"status": "published", "category": "backend"})
+        records = [json.loads(line) for line in _body(response).splitlines()]
+        assert [(r["category"], r["status"]) for r in records] == [("Backend", "published")]
+
+    def test_csv_by_format_or_accept_header(self, auth_client):
+        PostFactory(title='Comma, "quote"\nnewline')
+        for response in (
+            auth_client.get(reverse("post-export"), {"format": "csv"}),
+            auth_client.get(reverse("post-export"), HTTP_ACCEPT="text/csv"),
+        ):
+            assert response["Content-Type"] == "text/csv; charset=utf-8"
+            rows = list(csv.DictReader(io.StringIO(_body(response))))
+            assert len(rows) == 1
+            assert rows[0]["title"] == 'Comma, "quote"\nnewline'
+            assert rows[0]["published_at"] == ""
+            assert rows[0]["created_at"].endswith("Z")
+
+    def test_invalid_filter_is_rejected(self, auth_client):
+        response = auth_client.get(reverse("post-export"), {"status": "archived"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert json.loads(response.content)["error"]["code"] == "VALIDATION_ERROR"
+
+    def test_requires_authentication(self, api_client):
+        response = api_client.get(reverse("post-export"))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestPostExport:
+    def test_snapshot_ignores_writes_during_export(self):
+        PostFactory.create_batch(3)
+        records = PostExport.records(chunk_size=1)
+        first = next(records)
+        PostFactory()
+        Post.objects.exclude(pk=first["id"]).update(title="Changed")
+
+        rest = list(records)
+        assert len(rest) == 2
+        assert all(record["title"] != "Changed" for record in rest)
+
+    def test_command_round_trips_through_import(self, tmp_path, author_user):
+        PostFactory.create_batch(2, author=author_user, published=True)
+        PostFactory(author=author_user)
+        path = tmp_path / "posts.ndjson"
+        out = io.StringIO()
+        call_command("export_posts", str(path), status="published", stdout=out)
+        assert "Exported 2 posts" in out.getvalue() and "rows/s" in out.getvalue()
+
+        exported = [json.loads(line) for line in path.read_text().splitlines()]
+        Post.objects.all().delete()
+        call_command("import_posts", str(path), stdout=io.StringIO(), stderr=io.StringIO())
+        restored = Post.objects.order_by("created_at")
+        assert [str(post.id) for post in restored] == [record["id"] for record in exported]
+        assert [post.slug for post in restored] == [record["slug"] for record in exported]
+
+    def test_command_writes_csv(self, tmp_path):
+        PostFactory()
+        path = tmp_path / "posts.csv"
+        call_command("export_posts", str(path), stdout=io.StringIO())
+        rows = list(csv.DictReader(path.open(newline="")))
+        assert len(rows) == 1 and list(rows[0]) == list(EXPORT_FIELDS)
@@ -0,0 +1,178 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from apps.accounts.tests.factories import UserFactory
+from apps.posts.facets import PostFacets
+from apps.posts.models import PostFacetCount
+from apps.posts.services import PostService
+
+from .factories import POST_CONTENT, PostFactory
+
+
+def _stored(author):
+    return {
+        (category, post_status): count
+        for category, post_status, count in PostFacetCount.objects.filter(author=author, count__gt=0)
+        .values_list("category", "status", "count")
+    }
+
+
+@pytest.mark.django_db
+class TestPostFacetMaintenance:
+    def test_create_counts_the_post(self, create_post, author_user):
+        create_post(category="Backend")
+        create_post(category="Backend", status="published")
+        create_post(category="Backend", status="published")
+        assert _stored(author_user) == {("Backend", "draft"): 1, ("Backend", "published"): 2}
+
+    def test_update_moves_the_post_between_cells(self, create_post, author_user):
+        post = create_post(category="Backend")
+        PostService.update_post(post, data={"category": "Frontend", "status": "published"})
+        assert _stored(author_user) == {("Frontend", "published"): 1}
+
+    def test_update_of_other_fields_leaves_counts_alone(self, create_post, author_user):
+        post = create_post(category="Backend")
+        with CaptureQueriesContext(connection) as queries:
+            PostService.update_post(post, data={"title": "Renamed"})
+        assert not any(PostFacetCount._meta.db_table in query["sql"] for query in queries)
+        assert _stored(author_user) == {("Backend", "draft"): 1}
+
+    def test_update_starts_from_the_stored_row_not_a_stale_instance(self, create_post, author_user):
+        post = create_post(category="Backend")
+        stale = PostService.get_post(post.id)
+        PostService.update_post(post, data={"category": "Frontend"})
+        PostService.update_post(stale, data={"status": "published"})
+        assert _stored(author_user) == {("Backend", "published"): 1}
+        assert PostFacets.reconcile(dry_run=True) == []
+
+    def test_delete_uncounts_the_post(self, create_post, author_user):
+        post = create_post(category="Backend")
+        create_post(category="Backend")
+        PostService.delete_post(post)
+        assert _stored(author_user) == {("Backend", "draft"): 1}
+
+    def test_batch_moves_every_cell_in_one_upsert(self, create_post, author_user):
+        kept, moved, removed = (create_post(category="Backend") for _ in range(3))
+        PostService.apply_batch(
+            author=author_user,
+            creates=[{"title": "New", "content": POST_CONTENT, "category": "Ops", "status": "published"}],
+            updates=[(moved, {"category": "Ops"})],
+            deletes=[removed],
+        )
+        assert _stored(author_user) == {("Backend", "draft"): 1, ("Ops", "draft"): 1, ("Ops", "published"): 1}
+
+    def test_failed_batch_leaves_counts_unchanged(self, create_post, author_user):
+        first = create_post(title="First", category="Backend")
+        second = create_post(title="Second", category="Backend")
+        with pytest.raises(IntegrityError):
+            PostService.apply_batch(
+                author=author_user,
+                updates=[(first, {"category": "Ops", "slug": "taken"}), (second, {"slug": "taken"})],
+            )
+        assert _stored(author_user) == {("Backend", "draft"): 2}
+
+
+@pytest.mark.django_db
+class TestPostFacetCounts:
+    @pytest.fixture
+    def posts(self, create_post, author_user):
+        other = UserFactory()
+        create_post(category="Backend", status="published")
+        create_post(category="Backend")
+        create_post(category="Frontend", status="published")
+        create_post(other, category="backend", status="published")
+        return author_user, other
+
+    def test_unfiltered_counts(self, posts):
+        counts = PostFacets.counts()
+        assert counts["total"] == 4
+        assert counts["statuses"] == {"draft": 1, "published": 3}
+        # Largest first; ties follow the database collation
+        assert counts["categories"][0] == {"category": "Backend", "count": 2}
+        assert sorted(row["category"] for row in counts["categories"][1:]) == ["Frontend", "backend"]
+
+    def test_each_facet_ignores_its_own_filter(self, posts):
+        counts = PostFacets.counts(status="published", category="BACKEND")
+        assert counts["total"] == 2
+        assert counts["statuses"] == {"draft": 1, "published": 2}
+        assert [row["count"] for row in counts["categories"]] == [1, 1, 1]
+
+    def test_author_filter(self, posts):
+        author, _ = posts
+        counts = PostFacets.counts(author=author.id)
+        assert counts["total"] == 3
+        assert counts["categories"][0] == {"category": "Backend", "count": 2}
+
+    def test_empty_cells_are_hidden(self, create_post):
+        PostService.delete_post(create_post(category="Gone"))
+        assert PostFacetCount.objects.filter(category="Gone").exists()
+        assert PostFacets.counts()["categories"] == []
+
+
+@pytest.mark.django_db
+class TestPostFacetsAPI:
+    def test_serves_counts(self, auth_client, create_post):
+        create_post(category="Backend", status="published")
+        response = auth_client.get(reverse("post-facets"), {"status": "published"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            "total": 1,
+            "statuses": {"draft": 0, "published": 1},
+            "categories": [{"category": "Backend", "count": 1}],
+        }
+
+    def test_blank_category_means_any(self, auth_client, create_post):
+        create_post(category="Backend")
+        response = auth_client.get(reverse("post-facets"), {"category": ""})
+        assert response.data["total"] == 1
+
+    def test_rejects_invalid_filters(self, auth_client):
+        response = auth_client.get(reverse("post-facets"), {"status": "archived", "author": "nope"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert set(response.data["error"]["details"]) == {"status", "author"}
+
+    def test_does_not_group_posts(self, auth_client, create_post, django_assert_max_num_queries):
+        create_post(category="Backend")
+        # session/user lookup + statuses + categories
+        with django_assert_max_num_queries(3):
+            auth_client.get(reverse("post-facets"))
+
+    def test_requires_authentication(self, api_client):
+        response = api_client.get(reverse("post-facets"))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestReconcilePostFacets:
+    def test_repairs_drift(self, create_post, author_user):
+        create_post(category="Backend")
+        PostFactory(author=author_user, category="Backend")  # bypasses PostService
+        PostFactory(author=author_user, category="Ops", status="published")
+        PostFacetCount.objects.create(author=author_user, category="Stale", status="draft", count=3)
+
+        out = StringIO()
+        call_command("reconcile_post_facets", stdout=out)
+        assert "Repaired 3 facet cells." in out.getvalue()
+        assert _stored(author_user) == {("Backend", "draft"): 2, ("Ops", "published"): 1}
+        assert not PostFacetCount.objects.filter(category="Stale").exists()
+        assert PostFacets.reconcile() == []
+
+    def test_dry_run_reports_without_changing(self, author_user):
+        PostFactory(author=author_user, category="Backend")
+        out = StringIO()
+        call_command("reconcile_post_facets", "--dry-run", stdout=out)
+        assert "stored 0, actual 1" in out.getvalue()
+        assert "1 facet cells have drifted" in out.getvalue()
+        assert _stored(author_user) == {}
+
+    def test_consistent_counts(self, create_post):
+        create_post()
+        out = StringIO()
+        call_command("reconcile_post_facets", stdout=out)
+        assert "Facet counts are consistent." in out.getvalue()
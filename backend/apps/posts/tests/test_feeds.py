@@ -0,0 +1,120 @@
+import gzip
+import xml.etree.ElementTree as ET
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from apps.posts.feeds import PostFeeds
+from apps.posts.services import PostService
+
+from .factories import PostFactory
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def _titles_rss(body):
+    return [item.findtext("title") for item in ET.fromstring(body).iter("item")]
+
+
+@pytest.mark.django_db
+class TestPostFeedViews:
+    def test_rss_lists_published_posts_newest_first(self, api_client):
+        PostFactory(title="Older", published=True)
+        PostFactory(title="Newer", published=True)
+        PostFactory(title="Draft")
+        response = api_client.get(reverse("post-feed-rss"))
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/rss+xml; charset=utf-8"
+        assert _titles_rss(response.content) == ["Newer", "Older"]
+
+    def test_atom_feed(self, api_client):
+        post = PostFactory(title="Atom post", published=True)
+        response = api_client.get(reverse("post-feed-atom"))
+        assert response["Content-Type"] == "application/atom+xml; charset=utf-8"
+        entry = ET.fromstring(response.content).find(f"{ATOM}entry")
+        assert entry.findtext(f"{ATOM}title") == "Atom post"
+        assert entry.findtext(f"{ATOM}id") == f"urn:uuid:{post.id}"
+        assert "@" not in response.content.decode()  # author emails stay private
+
+    def test_category_feed_is_case_insensitive(self, api_client):
+        PostFactory(title="Backend post", category="Backend", published=True)
+        PostFactory(title="Design post", category="Design", published=True)
+        response = api_client.get(reverse("post-category-feed-rss", args=["backend"]))
+        assert _titles_rss(response.content) == ["Backend post"]
+
+    def test_unknown_category_is_404_and_not_cached(self, api_client, django_assert_num_queries):
+        assert api_client.get(reverse("post-category-feed-rss", args=["nothing"])).status_code == 404
+        with django_assert_num_queries(1):
+            assert api_client.get(reverse("post-category-feed-rss", args=["nothing"])).status_code == 404
+        # Made-up categories don't seed a generation counter that never expires
+        assert cache.get(PostFeeds._generation_key(PostFeeds._scope("nothing"))) is None
+
+    def test_served_from_cache_without_queries(self, api_client, django_assert_num_queries):
+        PostFactory(published=True)
+        first = api_client.get(reverse("post-feed-rss"))
+        with django_assert_num_queries(0):
+            second = api_client.get(reverse("post-feed-rss"))
+        assert second.content == first.content
+        assert second["ETag"] == first["ETag"]
+
+    def test_gzip_variant(self, api_client):
+        PostFactory(title="Compressed", published=True)
+        plain = api_client.get(reverse("post-feed-rss"))
+        compressed = api_client.get(reverse("post-feed-rss"), HTTP_ACCEPT_ENCODING="br, gzip")
+        assert compressed["Content-Encoding"] == "gzip"
+        assert gzip.decompress(compressed.content) == plain.content
+        assert compressed["ETag"] != plain["ETag"]
+        assert "Accept-Encoding" in compressed["Vary"]
+
+    def test_conditional_get_returns_304(self, api_client):
+        PostFactory(published=True)
+        first = api_client.get(reverse("post-feed-atom"))
+        assert "no-cache" in first["Cache-Control"]
+        by_etag = api_client.get(reverse("post-feed-atom"), HTTP_IF_NONE_MATCH=first["ETag"])
+        assert by_etag.status_code == 304
+        by_date = api_client.get(reverse("post-feed-atom"), HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        assert by_date.status_code == 304
+
+
+@pytest.mark.django_db
+class TestPostFeedInvalidation:
+    def _titles(self):
+        return _titles_rss(PostFeeds.get("rss")["body"])
+
+    def test_publishing_rebuilds_the_feed(self, create_post, django_capture_on_commit_callbacks):
+        assert self._titles() == []
+        with django_capture_on_commit_callbacks(execute=True):
+            create_post(title="Fresh", status="published")
+        assert self._titles() == ["Fresh"]
+
+    def test_draft_writes_keep_the_cached_feed(self, create_post, django_capture_on_commit_callbacks):
+        before = PostFeeds.get("rss")
+        with django_capture_on_commit_callbacks(execute=True):
+            post = create_post(title="Draft")
+            PostService.update_post(post, data={"title": "Still a draft"})
+        assert PostFeeds.get("rss") == before
+
+    def test_only_affected_category_feeds_are_retired(self, create_post, django_capture_on_commit_callbacks):
+        backend = create_post(title="Backend", category="Backend", status="published")
+        create_post(title="Design", category="Design", status="published")
+        design_feed = PostFeeds.get("rss", "Design")
+        PostFeeds.get("rss", "Backend")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            PostService.update_post(backend, data={"title": "Backend renamed"})
+        assert _titles_rss(PostFeeds.get("rss", "Backend")["body"]) == ["Backend renamed"]
+        assert PostFeeds.get("rss", "Design") == design_feed
+
+    def test_moving_category_retires_both_feeds(self, create_post, django_capture_on_commit_callbacks):
+        post = create_post(title="Mover", category="Old", status="published")
+        assert PostFeeds.get("rss", "Old")["items"] == 1
+        with django_capture_on_commit_callbacks(execute=True):
+            PostService.update_post(post, data={"category": "New"})
+        assert PostFeeds.get("rss", "Old") is None
+        assert PostFeeds.get("rss", "New")["items"] == 1
+
+    def test_invalidate_always_retires_the_all_posts_feed(self):
+        stale = PostFeeds.get("rss")
+        PostFeeds.invalidate()
+        assert PostFeeds.get("rss")["generation"] != stale["generation"]
@@ -0,0 +1,175 @@
+import base64
+import io
+from unittest import mock
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from PIL import Image
+
+from apps.posts.exceptions import InvalidThumbnailError
+from apps.posts.images import PostImages
+from apps.posts.services import PostService
+from apps.posts.thumbnails import ThumbnailQueue
+
+from .factories import POST_CONTENT, image_upload
+
+EXIF_ORIENTATION = 0x0112
+EXIF_MAKE = 0x010F
+DIRECTORY = "posts/thumbnails/ab/abc"
+
+
+def _open(name):
+    with default_storage.open(name) as handle:
+        image = Image.open(handle)
+        image.load()
+        return image
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.mark.django_db
+class TestPostImages:
+    def test_renders_every_rendition_in_both_formats(self):
+        renditions, _ = PostImages.render(DIRECTORY, image_upload())
+        assert {name: (entry["width"], entry["height"]) for name, entry in renditions.items()} == {
+            "retina": (2560, 1280),
+            "hero": (1280, 640),
+            "card": (480, 240),
+        }
+        card = renditions["card"]
+        assert _open(card["webp"]).format == "WEBP"
+        assert _open(card["jpeg"]).format == "JPEG"
+        assert _open(card["jpeg"]).size == (480, 240)
+        assert card["webp"] == "posts/thumbnails/ab/abc/card.webp"
+
+    def test_never_upscales(self):
+        renditions, _ = PostImages.render(DIRECTORY, image_upload(size=(600, 300)))
+        assert renditions["retina"]["width"] == renditions["hero"]["width"] == 600
+        assert renditions["card"]["width"] == 480
+
+    def test_applies_orientation_and_strips_metadata(self):
+        exif = Image.Exif()
+        exif[EXIF_ORIENTATION] = 6  # rotated 90 degrees clockwise
+        exif[EXIF_MAKE] = "Camera Co"
+        renditions, _ = PostImages.render(DIRECTORY, image_upload(size=(800, 400), exif=exif))
+        for key in ("webp", "jpeg"):
+            image = _open(renditions["card"][key])
+            assert image.size == (400, 800)
+            assert not image.getexif()
+            assert "icc_profile" not in image.info
+
+    def test_transparency_kept_in_webp_and_flattened_in_jpeg(self):
+        renditions, _ = PostImages.render(DIRECTORY, image_upload(mode="RGBA", image_format="PNG", name="logo.png"))
+        assert _open(renditions["card"]["webp"]).mode == "RGBA"
+        assert _open(renditions["card"]["jpeg"]).mode == "RGB"
+
+    def test_placeholder_is_a_tiny_inline_webp(self):
+        _, placeholder = PostImages.render(DIRECTORY, image_upload())
+        prefix = "data:image/webp;base64,"
+        assert placeholder.startswith(prefix)
+        image = Image.open(io.BytesIO(base64.b64decode(placeholder[len(prefix):])))
+        assert image.format == "WEBP"
+        assert image.size == (16, 8)
+        assert len(placeholder) < 300
+
+    def test_probe_reads_the_header(self):
+        upload = image_upload(size=(800, 400), image_format="PNG", name="wide.png")
+        with mock.patch.object(Image.Image, "load", side_effect=AssertionError("decoded")):
+            assert PostImages.probe(upload) == {"width": 800, "height": 400, "bytes": upload.size, "format": "png"}
+        assert upload.tell() == 0
+
+    def test_probe_reports_displayed_dimensions(self):
+        exif = Image.Exif()
+        exif[EXIF_ORIENTATION] = 6
+        metadata = PostImages.probe(image_upload(size=(800, 400), exif=exif))
+        assert (metadata["width"], metadata["height"], metadata["format"]) == (400, 800, "jpeg")
+
+    def test_probe_of_an_unreadable_upload_has_only_its_size(self):
+        broken = SimpleUploadedFile("broken.jpg", b"\xff\xd8\xff\xe0not a jpeg", content_type="image/jpeg")
+        assert PostImages.probe(broken) == {"bytes": broken.size}
+
+    def test_undecodable_upload_is_rejected(self):
+        broken = SimpleUploadedFile("broken.jpg", b"\xff\xd8\xff\xe0not a jpeg", content_type="image/jpeg")
+        with pytest.raises(InvalidThumbnailError):
+            PostImages.render(DIRECTORY, broken)
+
+    def test_rerender_replaces_files_in_place(self):
+        first = PostImages.render(DIRECTORY, image_upload())
+        assert PostImages.render(DIRECTORY, image_upload()) == first
+
+    def test_map_files(self):
+        renditions = {"card": {"width": 480, "height": 240, "webp": "a.webp", "jpeg": "a.jpg"}}
+        assert PostImages.map_files(renditions, str.upper) == {
+            "card": {"width": 480, "height": 240, "webp": "A.WEBP", "jpeg": "A.JPG"}
+        }
+        assert PostImages.names(renditions) == ["a.webp", "a.jpg"]
+
+
+@pytest.mark.django_db
+class TestThumbnailRenditionsInService:
+    def _files(self, post):
+        return [entry[key] for entry in post.thumbnail_renditions.values() for key in ("webp", "jpeg")]
+
+    def _rendered(self, post):
+        ThumbnailQueue.run_pending()
+        post.refresh_from_db()
+        return post
+
+    def test_create_renders_renditions(self, create_post):
+        post = self._rendered(create_post(thumbnail=image_upload()))
+        assert set(post.thumbnail_renditions) == {"card", "hero", "retina"}
+        assert all(default_storage.exists(name) for name in self._files(post))
+
+    def test_replacing_the_thumbnail_removes_old_renditions(self, create_post, django_capture_on_commit_callbacks):
+        post = self._rendered(create_post(thumbnail=image_upload()))
+        old = self._files(post)
+        with django_capture_on_commit_callbacks(execute=True):
+            PostService.update_post(post, data={"thumbnail": image_upload(size=(900, 900))})
+        assert not any(default_storage.exists(name) for name in old)
+        ThumbnailQueue.run_pending()
+        post.refresh_from_db()
+        assert post.thumbnail_renditions["card"]["height"] == 480
+        assert all(default_storage.exists(name) for name in self._files(post))
+
+    def test_clearing_the_thumbnail_clears_renditions(self, create_post, django_capture_on_commit_callbacks):
+        post = self._rendered(create_post(thumbnail=image_upload()))
+        old = self._files(post)
+        with django_capture_on_commit_callbacks(execute=True):
+            PostService.update_post(post, data={"thumbnail": None})
+        post.refresh_from_db()
+        assert post.thumbnail_renditions == {}
+        assert not any(default_storage.exists(name) for name in old)
+
+    def test_delete_removes_renditions(self, create_post, django_capture_on_commit_callbacks):
+        post = self._rendered(create_post(thumbnail=image_upload()))
+        files = self._files(post)
+        with django_capture_on_commit_callbacks(execute=True):
+            PostService.delete_post(post)
+        assert not any(default_storage.exists(name) for name in files)
+
+
+@pytest.mark.django_db
+class TestThumbnailRenditionsAPI:
+    def test_upload_exposes_rendition_urls(self, auth_client):
+        payload = {"title": "Pictured", "content": POST_CONTENT, "thumbnail": image_upload()}
+        created = auth_client.post(reverse("post-list"), payload, format="multipart")
+        assert created.status_code == 201
+        ThumbnailQueue.run_pending()
+
+        response = auth_client.get(reverse("post-detail", args=[created.data["id"]]))
+        card = response.data["thumbnail_renditions"]["card"]
+        assert card["width"] == 480
+        assert card["webp"].startswith("http://testserver/media/posts/thumbnails/")
+
+        listed = auth_client.get(reverse("post-list")).data["results"][0]
+        assert listed["thumbnail_renditions"] == response.data["thumbnail_renditions"]
+
+    def test_posts_without_thumbnail_have_no_renditions(self, auth_client):
+        response = auth_client.post(reverse("post-list"), {"title": "Plain", "content": POST_CONTENT}, format="json")
+        assert response.data["thumbnail_renditions"] == {}
@@ -0,0 +1,152 @@
+import csv
+import io
+import json
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from apps.accounts.tests.factories import UserFactory
+from apps.posts.facets import PostFacets
+from apps.posts.models import Post
+from apps.posts.search import PostSearch
+from apps.posts.services import PostService
+
+from .factories import PostFactory
+
+CONTENT = "Legacy body text that is long enough to need an automatic excerpt. " * 5
+
+
+@pytest.fixture
+def author():
+    return UserFactory(role="author", email="legacy@example.com")
+
+
+def _ndjson(tmp_path, records, name="posts.ndjson"):
+    path = tmp_path / name
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def _run(*args, **kwargs):
+    out, err = io.StringIO(), io.StringIO()
+    call_command("import_posts", *args, stdout=out, stderr=err, **kwargs)
+    return out.getvalue(), err.getvalue()
+
+
+@pytest.mark.django_db
+class TestImportPosts:
+    def test_imports_ndjson_like_post_service(self, tmp_path, author):
+        PostFactory(slug="hello-world")
+        path = _ndjson(tmp_path, [
+            {"title": "Hello World", "content": CONTENT, "status": "published"},
+            {"title": "Hello World", "content": CONTENT, "excerpt": "Kept", "category": "Legacy"},
+            {
+                "title": "Tabs\tand\nnewlines \\ here", "content": "Line one\nline\ttwo \\N",
+                "author_email": author.email,
+            },
+        ])
+        out, _ = _run(path, author=author.email, batch_size=2)
+
+        assert "Imported 3 posts" in out and "rows/s" in out
+        first, second = Post.objects.filter(title="Hello World").exclude(slug="hello-world").order_by("excerpt")
+        slugs = {first.slug, second.slug}
+        assert len(slugs) == 2 and all(slug.startswith("hello-world-") for slug in slugs)
+        auto = next(post for post in (first, second) if post.excerpt != "Kept")
+        assert auto.excerpt == CONTENT[:200].strip()
+        assert auto.status == "published" and auto.published_at is not None
+        assert auto.image_url == "/fintrellis.gif" and not auto.thumbnail
+
+        odd = Post.objects.get(slug="tabs-and-newlines-here")
+        assert odd.title == "Tabs\tand\nnewlines \\ here"
+        assert odd.content == "Line one\nline\ttwo \\N"
+        assert odd.published_at is None
+
+        found = PostSearch.apply(Post.objects.all(), "legacy").values_list("pk", flat=True)
+        assert set(found) >= {first.pk, second.pk}
+
+    def test_imports_csv_with_legacy_ids_and_timestamps(self, tmp_path, author):
+        path = tmp_path / "posts.csv"
+        with path.open("w", newline="", encoding="utf-8") as handle:
+            writer = csv.DictWriter(handle, fieldnames=["id", "title", "content", "status", "created_at"])
+            writer.writeheader()
+            writer.writerow({
+                "id": "4b0b9a4e-8f3c-4a57-9f0b-0d2f3f0b8a11", "title": "Old Post", "content": CONTENT,
+                "status": "published", "created_at": "2015-03-01T12:00:00Z",
+            })
+        _run(str(path), author=author.email)
+
+        post = Post.objects.get(pk="4b0b9a4e-8f3c-4a57-9f0b-0d2f3f0b8a11")
+        assert post.created_at.year == 2015
+        assert post.published_at == post.created_at == post.updated_at
+
+        # Re-running is a no-op thanks to the legacy ids
+        out, _ = _run(str(path), author=author.email)
+        assert "Imported 0 posts" in out and "1 already present" in out
+        assert Post.objects.count() == 1
+        # Facet counts only include rows that were actually inserted
+        assert PostFacets.counts()["statuses"] == {"draft": 0, "published": 1}
+        assert PostFacets.reconcile(dry_run=True) == []
+
+    def test_invalid_records_are_skipped(self, tmp_path, author):
+        path = _ndjson(tmp_path, [
+            {"title": "", "content": CONTENT},
+            {"title": "Bad status", "content": CONTENT, "status": "archived"},
+            {"title": "Unknown author", "content": CONTENT, "author_email": "nobody@example.com"},
+            {"title": "Fine", "content": CONTENT},
+        ])
+        out, err = _run(path, author=author.email)
+        assert "Imported 1 posts" in out and "3 invalid" in out
+        assert "Record 2 skipped: unknown status" in err
+        assert list(Post.objects.values_list("title", flat=True)) == ["Fine"]
+
+    def test_malformed_lines_are_skipped(self, tmp_path, author):
+        path = tmp_path / "posts.ndjson"
+        before, after = ({"title": title, "content": CONTENT} for title in ("Before", "After"))
+        path.write_text(f"{json.dumps(before)}\n{{not json\n{json.dumps(after)}\n", encoding="utf-8")
+        out, err = _run(str(path), author=author.email)
+        assert "Imported 2 posts" in out and "1 invalid" in out
+        assert "Record 2 skipped: invalid JSON" in err
+        assert sorted(Post.objects.values_list("title", flat=True)) == ["After", "Before"]
+
+    def test_slug_collisions_are_reported_separately(self, tmp_path, author):
+        path = _ndjson(tmp_path, [{"title": "Taken", "content": CONTENT}, {"title": "Free", "content": CONTENT}])
+        real_build_posts = PostService.build_posts
+
+        def build_then_race(items):
+            posts = real_build_posts(items)
+            # Another writer takes a generated slug before the batch is inserted
+            PostFactory(slug=posts[0].slug)
+            return posts
+
+        with mock.patch.object(PostService, "build_posts", side_effect=build_then_race):
+            out, err = _run(path, author=author.email)
+        assert "Imported 1 posts" in out
+        assert "0 already present, 1 slug collisions" in out
+        assert "slug 'taken' skipped" in err
+        assert Post.objects.filter(title="Free").exists()
+        assert not Post.objects.filter(title="Taken").exists()
+
+    def test_resumes_from_checkpoint(self, tmp_path, author):
+        records = [{"title": f"Post {i}", "content": CONTENT} for i in range(5)]
+        path = _ndjson(tmp_path, records)
+        checkpoint = tmp_path / "import.state"
+        checkpoint.write_text(json.dumps({"source": path, "records": 3}))
+
+        out, _ = _run(path, author=author.email, checkpoint=str(checkpoint))
+        assert "Resuming after record 3" in out
+        assert sorted(Post.objects.values_list("title", flat=True)) == ["Post 3", "Post 4"]
+        assert json.loads(checkpoint.read_text())["records"] == 5
+
+        _run(path, author=author.email, checkpoint=str(checkpoint))
+        assert Post.objects.count() == 2
+
+    def test_reads_stdin(self, monkeypatch, author):
+        monkeypatch.setattr("sys.stdin", io.StringIO(json.dumps({"title": "Piped", "content": CONTENT}) + "\n"))
+        _run(author=author.email)
+        assert Post.objects.get().slug == "piped"
+
+    def test_requires_known_default_author(self, tmp_path):
+        with pytest.raises(CommandError):
+            _run(_ndjson(tmp_path, []), author="missing@example.com")
@@ -0,0 +1,116 @@
+"""
+Plan tests: the list filters must be answerable from an index.
+
+Test tables are tiny, so the planner would pick a sequential scan anyway;
+``enable_seqscan = off`` makes it use an index whenever one *can* serve the
+query, which is exactly the property under test.
+"""
+import re
+from datetime import timedelta
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.tests.factories import UserFactory
+from apps.posts.filters import PostFilter
+from apps.posts.models import Post
+from apps.posts.services import PostService
+
+from .factories import PostFactory
+
+
+def _plan(queryset):
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+
+@pytest.mark.django_db
+class TestCategoryIndex:
+    def test_category_filter_uses_lower_index(self):
+        PostFactory.create_batch(3, category="Backend")
+        queryset = PostFilter({"category": "BACKEND"}, queryset=Post.objects.all()).qs
+        assert "posts_post_category_lower" in _plan(queryset)
+        assert queryset.count() == 3
+
+    def test_iexact_cannot_use_it(self):
+        # Why the filter doesn't use iexact: UPPER(category) matches no index
+        assert "posts_post_category_lower" not in _plan(Post.objects.filter(category__iexact="backend"))
+
+    def test_matches_case_insensitively(self):
+        PostFactory(category="Backend")
+        PostFactory(category="backend")
+        PostFactory(category="Backend Ops")
+        assert Post.objects.in_category("BackEnd").count() == 2
+
+
+def _list_query(params, ordering="-created_at"):
+    """The list endpoint's first-page query for ``params``."""
+    queryset = PostFilter(params, queryset=PostService.list_posts()).qs.order_by(ordering)
+    return PostService.list_rows(queryset)[:10]
+
+
+@pytest.mark.django_db
+class TestListQueryIndexes:
+    @pytest.mark.parametrize(
+        "params, ordering, index",
+        [
+            ({"status": "published"}, "-created_at", "posts_post_status_created"),
+            ({"status": "draft"}, "-created_at", "posts_post_status_created"),
+            ({"category": "backend"}, "-created_at", "posts_post_category_lower"),
+            ({"status": "published"}, "-published_at", "posts_post_published_recent"),
+        ],
+    )
+    def test_filtered_first_page_reads_an_index_without_sorting(self, params, ordering, index):
+        PostFactory.create_batch(3, published=True, category="Backend")
+        plan = _plan(_list_query(params, ordering))
+        assert index in plan
+        assert "Sort" not in plan
+
+    def test_author_filter_uses_author_index(self):
+        author = UserFactory()
+        PostFactory.create_batch(3, author=author)
+        plan = _plan(_list_query({"author": str(author.id)}))
+        assert "posts_post_author_created" in plan
+        assert "Sort" not in plan
+
+
+@pytest.mark.django_db
+class TestKeysetIndexes:
+    def _deep_page_sql(self, client, ordering):
+        """SQL of the list query for a cursor page several pages in."""
+        response = client.get(reverse("post-list"), {"pagination": "cursor", "page_size": 2, "ordering": ordering})
+        for _ in range(3):
+            response = client.get(response.data["next"])
+        with CaptureQueriesContext(connection) as queries:
+            assert client.get(response.data["next"]).status_code == 200
+        (sql,) = [query["sql"] for query in queries if '"posts_post"' in query["sql"]]
+        return sql
+
+    @pytest.mark.parametrize(
+        "ordering, index",
+        [
+            ("-created_at", "posts_post_created_id"),
+            ("created_at", "posts_post_created_id"),
+            ("-published_at", "posts_post_published_id"),
+            ("title", "posts_post_title_id"),
+            ("-title", "posts_post_title_id"),
+        ],
+    )
+    def test_deep_cursor_page_is_an_ordered_index_range(self, auth_client, ordering, index):
+        now = timezone.now()
+        for i in range(20):
+            PostFactory(published=True, published_at=now - timedelta(hours=i), title=f"Title {i:02d}")
+        sql = self._deep_page_sql(auth_client, ordering)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN {sql}")
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        scan = "Index Scan Backward" if ordering.startswith("-") else "Index Scan"
+        assert f"{scan} using {index} on posts_post" in plan
+        # The cursor bound starts the range, rather than filtering every row read before it
+        assert re.search(rf"Index Cond: \(\(?{ordering.lstrip('-')}\b", plan)
+        assert "Sort" not in plan
@@ -0,0 +1,93 @@
+"""
+Query-budget tests: each posts endpoint must run a fixed number of queries
+regardless of how many rows it renders.
+"""
+import json
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from apps.posts.models import Post
+from common.pagination import estimate_table_rows
+
+from .factories import PostFactory
+
+# COUNT(*) + page SELECT; small tables skip the planner estimate (table size is cached)
+LIST_QUERY_BUDGET = 2
+CURSOR_LIST_QUERY_BUDGET = 1  # page SELECT only
+DETAIL_QUERY_BUDGET = 1
+# SELECT + UPDATE, plus facet row lock + counts upsert and SAVEPOINT/RELEASE when the category moves
+UPDATE_QUERY_BUDGET = 6
+# SELECT + DELETE, plus facet and thumbnail row locks + counts upsert and SAVEPOINT/RELEASE
+DELETE_QUERY_BUDGET = 7
+# targets SELECT + facet row locks + slug SELECT + INSERT + UPDATE + thumbnail row locks + DELETE + counts upsert,
+# plus SAVEPOINT/RELEASE
+BATCH_QUERY_BUDGET = 10
+
+PAGE_SIZES = [1, 10, 100]
+
+
+def _results(response):
+    # Full pages are streamed (STREAMING_RESPONSE_MIN_ITEMS) and carry no .data
+    if response.streaming:
+        return json.loads(b"".join(response.streaming_content))["results"]
+    return response.data["results"]
+
+
+@pytest.mark.django_db
+class TestPostQueryBudget:
+    @pytest.mark.parametrize("page_size", PAGE_SIZES)
+    def test_list_query_count_is_constant(self, auth_client, author_user, django_assert_max_num_queries, page_size):
+        # The ORM has no identity map, so even a shared author is re-fetched per row without a join
+        PostFactory.create_batch(page_size, author=author_user)
+        estimate_table_rows(Post)
+        with django_assert_max_num_queries(LIST_QUERY_BUDGET):
+            response = auth_client.get(reverse("post-list"), {"page_size": page_size})
+        assert response.status_code == status.HTTP_200_OK
+        results = _results(response)
+        assert len(results) == page_size
+        assert all(item["author_email"] for item in results)
+
+    @pytest.mark.parametrize("page_size", PAGE_SIZES)
+    def test_cursor_list_query_count_is_constant(
+        self, auth_client, author_user, django_assert_max_num_queries, page_size
+    ):
+        PostFactory.create_batch(page_size, author=author_user)
+        with django_assert_max_num_queries(CURSOR_LIST_QUERY_BUDGET):
+            response = auth_client.get(reverse("post-list"), {"page_size": page_size, "pagination": "cursor"})
+        assert len(_results(response)) == page_size
+
+    def test_detail_query_budget(self, auth_client, django_assert_max_num_queries):
+        post = PostFactory()
+        with django_assert_max_num_queries(DETAIL_QUERY_BUDGET):
+            response = auth_client.get(reverse("post-detail", args=[post.id]))
+        assert response.data["author_email"] == post.author.email
+
+    def test_patch_query_budget(self, auth_client, author_user, django_assert_max_num_queries):
+        post = PostFactory(author=author_user)
+        with django_assert_max_num_queries(UPDATE_QUERY_BUDGET):
+            response = auth_client.patch(
+                reverse("post-detail", args=[post.id]), {"category": "New"}, format="json"
+            )
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_delete_query_budget(self, auth_client, author_user, django_assert_max_num_queries):
+        post = PostFactory(author=author_user)
+        with django_assert_max_num_queries(DELETE_QUERY_BUDGET):
+            response = auth_client.delete(reverse("post-detail", args=[post.id]))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    @pytest.mark.parametrize("size", [1, 10, 30])
+    def test_batch_query_count_is_constant(self, auth_client, author_user, django_assert_max_num_queries, size):
+        posts = PostFactory.create_batch(2 * size, author=author_user)
+        content = "Enough content for a batch-created post."
+        operations = (
+            [{"op": "create", "data": {"title": f"Batch {i % 3}", "content": content}} for i in range(size)]
+            + [{"op": "update", "id": str(post.id), "data": {"category": "Ops"}} for post in posts[:size]]
+            + [{"op": "delete", "id": str(post.id)} for post in posts[size:]]
+        )
+        with django_assert_max_num_queries(BATCH_QUERY_BUDGET):
+            response = auth_client.post(reverse("post-batch"), {"operations": operations}, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 3 * size
@@ -1,7 +1,20 @@
 import pytest
 from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
 
-from apps.posts.serializers import PostDetailSerializer
+from apps.posts.search import PostSearch
+from apps.posts.serializers import PostDetailSerializer, PostListRowSerializer, PostListSerializer
+from apps.posts.services import PostService
+
+from .factories import PostFactory
+
+RENDITIONS = {
+    "card": {
+        "width": 480, "height": 240, "webp": "posts/thumbnails/x/card.webp", "jpeg": "posts/thumbnails/x/card.jpg",
+    },
+}
 
 
 class TestPostDetailSerializer:
@@ -105,3 +118,61 @@ class TestPostDetailSerializer:
         if not is_valid:
             # Our custom validator should NOT be the reason; it should be Pillow's
             assert "Unsupported file type" not in str(serializer.errors.get("thumbnail", ""))
+
+
+@pytest.mark.django_db
+class TestPostListRowSerializer:
+    """The fast list path must render byte-identical JSON to PostListSerializer."""
+
+    def _render_both(self, queryset, request=None):
+        context = {"request": request} if request else {}
+        ordered = queryset.order_by("-created_at", "pk")
+        instances = list(ordered)
+        rows = list(PostService.list_rows(ordered))
+        renderer = JSONRenderer()
+        slow = renderer.render(PostListSerializer(instances, many=True, context=context).data)
+        fast = renderer.render(PostListRowSerializer(rows, many=True, context=context).data)
+        return slow, fast
+
+    def test_matches_model_serializer(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        PostFactory(published=True)
+        PostFactory(title="Ünïcödé — “quotes” & <tags>", excerpt="", category="")
+        PostFactory(image_url="https://example.com/a.png")
+        PostFactory(thumbnail=SimpleUploadedFile("t.png", b"png", content_type="image/png"))
+        PostFactory(thumbnail_renditions=RENDITIONS)
+        PostFactory(
+            thumbnail_width=1200,
+            thumbnail_height=800,
+            thumbnail_bytes=48213,
+            thumbnail_format="webp",
+            thumbnail_placeholder="data:image/webp;base64,UklGRg==",
+        )
+
+        slow, fast = self._render_both(PostService.list_posts())
+        assert slow == fast
+
+    def test_matches_with_request_context(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        PostFactory(thumbnail=SimpleUploadedFile("t.png", b"png", content_type="image/png"))
+        PostFactory(thumbnail_renditions=RENDITIONS)
+        request = Request(APIRequestFactory().get("/api/v1/posts/"))
+
+        slow, fast = self._render_both(PostService.list_posts(), request)
+        assert slow == fast
+        assert b"http://testserver/media/" in fast
+        assert b"http://testserver/media/posts/thumbnails/x/card.webp" in fast
+
+    def test_matches_search_results(self):
+        PostFactory(title="Connection pooling", content="All about pgbouncer and connection pooling.")
+        PostFactory(title="Pooling again", content="More connection pooling notes.")
+
+        slow, fast = self._render_both(PostSearch.apply(PostService.list_posts(), "pooling"))
+        assert slow == fast
+        assert b"search_headline" in fast
+
+    def test_rows_carry_no_unlisted_columns(self):
+        PostFactory()
+        row = PostService.list_rows(PostService.list_posts()).get()
+        assert "content" not in row and "search_vector" not in row
+        assert set(row) == set(PostService.LIST_FIELDS)
@@ -1,8 +1,14 @@
+from io import StringIO
+
 import pytest
+from django.core.management import call_command
+from django.db import IntegrityError
 
 from apps.accounts.tests.factories import UserFactory
 from apps.posts.models import Post
+from apps.posts.search import PostSearch
 from apps.posts.services import PostService
+from common.db import UnexpectedQueryError, guard_queries
 
 from .factories import PostFactory
 
@@ -12,6 +18,35 @@ def author():
     return UserFactory(role="author")
 
 
+@pytest.mark.django_db
+class TestPostServiceList:
+    def test_list_posts_defers_unrendered_columns(self):
+        PostFactory()
+        post = PostService.list_posts().get()
+        assert {"content", "search_vector"} <= post.get_deferred_fields()
+
+    def test_list_posts_loads_author_email_without_query(self, django_assert_num_queries):
+        PostFactory()
+        post = PostService.list_posts().get()
+        with django_assert_num_queries(0):
+            assert post.author.email
+
+    def test_guard_rejects_deferred_field_load(self):
+        PostFactory()
+        post = PostService.list_posts().get()
+        with pytest.raises(UnexpectedQueryError):
+            with guard_queries("test"):
+                post.content
+
+    def test_guard_only_logs_when_not_strict(self, settings, caplog):
+        settings.QUERY_GUARD_STRICT = False
+        PostFactory(content="Deferred body text for this post.")
+        post = PostService.list_posts().get()
+        with guard_queries("test"):
+            assert post.content == "Deferred body text for this post."
+        assert "unexpected query" in caplog.text
+
+
 @pytest.mark.django_db
 class TestPostServiceCreate:
     def test_create_post_generates_slug(self, author):
@@ -108,3 +143,109 @@ class TestPostServiceDelete:
         post_id = post.id
         PostService.delete_post(post)
         assert not Post.objects.filter(pk=post_id).exists()
+
+
+@pytest.mark.django_db
+class TestPostServiceBatch:
+    CONTENT = "Enough content for a batch-created post."
+
+    def test_slugs_resolved_in_one_query(self, author, django_assert_num_queries):
+        PostFactory(slug="taken")
+        with django_assert_num_queries(1):
+            slugs = PostService._generate_unique_slugs(["Taken", "Fresh", "Fresh", ""])
+        assert slugs[0].startswith("taken-")
+        assert slugs[1] == "fresh"
+        assert slugs[2].startswith("fresh-") and slugs[2] != "fresh"
+        assert slugs[3] == "post"
+
+    def test_batch_create_matches_create_post(self, author):
+        created, _ = PostService.apply_batch(
+            author=author,
+            creates=[
+                {"title": "Batch One", "content": "A" * 300, "status": "published"},
+                {"title": "Batch Two", "content": self.CONTENT, "excerpt": "Custom"},
+            ],
+        )
+        one, two = (Post.objects.get(pk=post.pk) for post in created)
+        assert one.slug == "batch-one" and len(one.excerpt) == 200
+        assert one.published_at is not None and one.image_url == "/fintrellis.gif"
+        assert two.excerpt == "Custom" and two.published_at is None
+        found = PostSearch.apply(Post.objects.all(), "batch").values_list("pk", flat=True)
+        assert set(found) == {one.pk, two.pk}
+
+    def test_batch_update_applies_service_rules(self, author):
+        draft = PostFactory(author=author, title="Old")
+        other = PostFactory(author=author)
+        before = other.updated_at
+        _, updated = PostService.apply_batch(
+            author=author,
+            updates=[
+                (draft, {"status": "published", "content": "B" * 250}),
+                (other, {"category": "Ops"}),
+            ],
+        )
+        draft.refresh_from_db()
+        other.refresh_from_db()
+        assert draft.published_at is not None
+        assert draft.excerpt == "B" * 200
+        assert other.category == "Ops" and other.updated_at > before
+        assert Post.objects.filter(pk=draft.pk, search_vector__isnull=False).exists()
+
+    def test_batch_delete_and_rollback(self, author):
+        keep, gone = PostFactory(author=author), PostFactory(author=author)
+        PostService.apply_batch(author=author, deletes=[gone])
+        assert list(Post.objects.values_list("pk", flat=True)) == [keep.pk]
+
+        other = PostFactory(author=author)
+        with pytest.raises(IntegrityError):
+            PostService.apply_batch(
+                author=author,
+                creates=[{"title": "Never", "content": self.CONTENT}],
+                updates=[(keep, {"slug": other.slug})],
+            )
+        assert not Post.objects.filter(title="Never").exists()
+
+
+@pytest.mark.django_db
+class TestPostServiceSearchVector:
+    def _matches(self, post, term):
+        return PostSearch.apply(Post.objects.filter(pk=post.pk), term).exists()
+
+    def test_create_post_indexes_all_weighted_fields(self, author):
+        post = PostService.create_post(
+            title="Kubernetes Operators",
+            content="Reconciliation loops keep cluster state converged.",
+            excerpt="Writing controllers",
+            category="Infrastructure",
+            author=author,
+        )
+        for term in ("kubernetes", "reconciliation", "controllers", "infrastructure"):
+            assert self._matches(post, term), term
+
+    def test_update_post_reindexes_changed_fields(self, author):
+        post = PostService.create_post(
+            title="Old Title", content="This is test content for the blog post.", author=author
+        )
+        PostService.update_post(post, data={"title": "Brand New Heading"})
+        assert self._matches(post, "heading")
+        assert not self._matches(post, "old")
+
+    def test_update_post_without_indexed_fields_keeps_vector(self, author):
+        post = PostService.create_post(
+            title="Stable Title", content="This is test content for the blog post.", author=author
+        )
+        PostService.update_post(post, data={"status": "published"})
+        assert self._matches(post, "stable")
+
+    def test_later_plain_save_does_not_clear_vector(self, author):
+        post = PostService.create_post(
+            title="Persistent", content="This is test content for the blog post.", author=author
+        )
+        post.save()
+        assert self._matches(post, "persistent")
+
+    def test_backfill_command_indexes_missing_rows(self):
+        post = PostFactory(title="Backfilled Article")
+        Post.objects.filter(pk=post.pk).update(search_vector=None)
+        call_command("backfill_search_vectors", batch_size=1, stdout=StringIO())
+        assert self._matches(post, "backfilled")
@@ -0,0 +1,172 @@
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from apps.posts import sitemaps
+from apps.posts.services import PostService
+from apps.posts.sitemaps import PostSitemap
+
+from .factories import PostFactory
+
+NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+
+
+@pytest.fixture(autouse=True)
+def sitemap_root(settings, tmp_path, monkeypatch):
+    settings.SITEMAP_ROOT = tmp_path
+    settings.PUBLIC_SITE_URL = "https://blog.example"
+    monkeypatch.setattr(sitemaps, "SITEMAP_SHARD_SIZE", 2)
+    return tmp_path
+
+
+def _locs(body):
+    return [loc.text for loc in ET.fromstring(body).iter(f"{NS}loc")]
+
+
+def _shard(name):
+    return PostSitemap.shard_path(name).read_bytes()
+
+
+def _published(slug, month, day=1):
+    return PostFactory(slug=slug, published=True, published_at=datetime(2024, month, day, 12, tzinfo=dt_timezone.utc))
+
+
+@pytest.mark.django_db
+class TestPostSitemapBuild:
+    def test_shards_by_publication_month(self):
+        for n, month in enumerate([1, 1, 2, 3]):
+            _published(f"post-{n}", month, day=n + 1)
+        PostFactory(slug="draft")
+        manifest, rebuilt = PostSitemap.build()
+        assert rebuilt == ["2024-01", "2024-02", "2024-03"]
+        assert [shard["urls"] for shard in manifest["shards"]] == [2, 1, 1]
+        assert _locs(_shard("2024-01")) == ["https://blog.example/posts/post-0", "https://blog.example/posts/post-1"]
+        assert _locs(_shard("2024-03")) == ["https://blog.example/posts/post-3"]
+
+    def test_full_months_are_split_into_parts(self):
+        for n in range(5):
+            _published(f"post-{n}", 1, day=n + 1)
+        manifest, _ = PostSitemap.build()
+        assert [(shard["name"], shard["urls"]) for shard in manifest["shards"]] == [
+            ("2024-01", 2), ("2024-01-2", 2), ("2024-01-3", 1)
+        ]
+
+    def test_rebuild_rewrites_only_changed_months(self):
+        posts = [_published(f"post-{n}", month) for n, month in enumerate([1, 2, 3])]
+        PostSitemap.build()
+        untouched = _shard("2024-01")
+
+        PostService.update_post(posts[1], data={"title": "Edited"})
+        assert PostSitemap.build()[1] == ["2024-02"]
+        assert _shard("2024-01") == untouched
+
+        _published("post-new", 3, day=20)
+        assert PostSitemap.build()[1] == ["2024-03"]
+
+    def test_removing_or_backdating_posts_leaves_later_months_alone(self):
+        posts = [_published(f"post-{n}", month) for n, month in enumerate([1, 2, 3])]
+        PostSitemap.build()
+        PostService.delete_post(posts[0])
+        assert PostSitemap.build()[1] == []
+        assert not PostSitemap.shard_path("2024-01").exists()
+
+        # An import with an old publication date lands in its own month only
+        _published("imported", 2, day=15)
+        assert PostSitemap.build()[1] == ["2024-02"]
+
+    def test_unchanged_posts_rewrite_nothing_unless_forced(self):
+        for n, month in enumerate([1, 2]):
+            _published(f"post-{n}", month)
+        PostSitemap.build()
+        assert PostSitemap.build()[1] == []
+        assert PostSitemap.build(force=True)[1] == ["2024-01", "2024-02"]
+
+    def test_shrinking_removes_surplus_parts(self):
+        posts = [_published(f"post-{n}", 1, day=n + 1) for n in range(3)]
+        PostSitemap.build()
+        PostService.delete_post(posts[-1])
+        manifest, _ = PostSitemap.build()
+        assert [shard["name"] for shard in manifest["shards"]] == ["2024-01"]
+        assert not PostSitemap.shard_path("2024-01-2").exists()
+
+    def test_publishing_outdates_the_built_sitemap(self, create_post, django_capture_on_commit_callbacks):
+        assert PostSitemap.refresh() == []
+        assert not PostSitemap.is_stale()
+        with django_capture_on_commit_callbacks(execute=True):
+            create_post(title="Fresh", status="published")
+        assert PostSitemap.is_stale()
+        # Reads never build: the manifest on disk is served until the builder runs
+        assert PostSitemap.manifest()["shards"] == []
+        assert len(PostSitemap.refresh()) == 1
+        assert PostSitemap.manifest()["shards"][0]["urls"] == 1
+        assert PostSitemap.refresh() is None
+
+    def test_draft_writes_keep_the_built_sitemap(self, create_post, django_capture_on_commit_callbacks):
+        PostSitemap.build()
+        with django_capture_on_commit_callbacks(execute=True):
+            create_post(title="Draft")
+        assert not PostSitemap.is_stale()
+
+    def test_command(self):
+        for n, month in enumerate([1, 1, 1, 2]):
+            _published(f"post-{n}", month, day=n + 1)
+        out = StringIO()
+        call_command("build_sitemap", stdout=out)
+        assert "Sitemap has 4 URLs in 3 shards; rewrote 3." in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestSitemapViews:
+    def test_index_lists_every_shard(self, api_client):
+        for n, month in enumerate([1, 1, 1, 2]):
+            _published(f"post-{n}", month, day=n + 1)
+        PostSitemap.build()
+        response = api_client.get(reverse("sitemap-index"))
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/xml"
+        assert _locs(response.content) == [
+            "https://blog.example/sitemap-2024-01.xml",
+            "https://blog.example/sitemap-2024-01-2.xml",
+            "https://blog.example/sitemap-2024-02.xml",
+        ]
+
+    def test_requests_never_build(self, api_client):
+        _published("hello", 1)
+        with mock.patch.object(PostSitemap, "build") as build:
+            response = api_client.get(reverse("sitemap-index"))
+        build.assert_not_called()
+        assert _locs(response.content) == []
+
+    def test_shard_is_served_from_disk(self, api_client):
+        _published("hello", 1)
+        PostSitemap.build()
+        response = api_client.get(reverse("sitemap-shard", args=["2024-01"]))
+        assert response.status_code == 200
+        assert _locs(b"".join(response.streaming_content)) == ["https://blog.example/posts/hello"]
+
+    def test_shards_are_served_without_queries(self, api_client, django_assert_num_queries):
+        _published("hello", 1)
+        PostSitemap.build()
+        with django_assert_num_queries(0):
+            assert api_client.get(reverse("sitemap-index")).status_code == 200
+            assert api_client.get(reverse("sitemap-shard", args=["2024-01"])).status_code == 200
+
+    def test_conditional_get_returns_304(self, api_client):
+        _published("hello", 1)
+        PostSitemap.build()
+        first = api_client.get(reverse("sitemap-shard", args=["2024-01"]))
+        by_etag = api_client.get(reverse("sitemap-shard", args=["2024-01"]), HTTP_IF_NONE_MATCH=first["ETag"])
+        assert by_etag.status_code == 304
+        index = api_client.get(reverse("sitemap-index"))
+        assert api_client.get(reverse("sitemap-index"), HTTP_IF_NONE_MATCH=index["ETag"]).status_code == 304
+
+    def test_unknown_shard_is_404(self, api_client):
+        _published("hello", 1)
+        PostSitemap.build()
+        assert api_client.get(reverse("sitemap-shard", args=["2024-02"])).status_code == 404
+        assert api_client.get(reverse("sitemap-shard", args=["2024-01-2"])).status_code == 404
@@ -0,0 +1,199 @@
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.posts.blobs import ThumbnailBlobs
+from apps.posts.cache import PostListCache
+from apps.posts.constants import THUMBNAIL_JOB_MAX_ATTEMPTS
+from apps.posts.images import PostImages
+from apps.posts.models import Post, ThumbnailJob
+from apps.posts.services import PostService
+from apps.posts.thumbnails import ThumbnailQueue
+
+from .factories import POST_CONTENT, image_upload
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.mark.django_db
+class TestThumbnailQueueing:
+    def test_upload_is_queued_not_rendered(self, create_post):
+        with mock.patch.object(PostImages, "render") as render:
+            post = create_post(thumbnail=image_upload())
+        render.assert_not_called()
+        assert post.thumbnail_status == Post.ThumbnailStatus.PENDING
+        assert post.thumbnail_renditions == {}
+        assert list(ThumbnailJob.objects.values_list("digest", flat=True)) == [post.thumbnail_blob_id]
+
+    def test_create_responds_pending(self, auth_client):
+        payload = {"title": "Pictured", "content": POST_CONTENT, "thumbnail": image_upload()}
+        response = auth_client.post(reverse("post-list"), payload, format="multipart")
+        assert response.status_code == 201
+        assert response.data["thumbnail_status"] == "pending"
+        assert response.data["thumbnail_renditions"] == {}
+
+    def test_posts_without_upload_queue_nothing(self, create_post):
+        post = create_post()
+        assert post.thumbnail_status == Post.ThumbnailStatus.NONE
+        assert not ThumbnailJob.objects.exists()
+
+
+@pytest.mark.django_db
+class TestThumbnailWorker:
+    def test_renders_and_attaches_renditions(self, create_post):
+        post = create_post(thumbnail=image_upload())
+        assert ThumbnailQueue.run_pending() == 1
+        post.refresh_from_db()
+        assert post.thumbnail_status == Post.ThumbnailStatus.READY
+        assert set(post.thumbnail_renditions) == {"card", "hero", "retina"}
+        assert not ThumbnailJob.objects.exists()
+
+    def test_header_metadata_is_recorded_at_upload(self, auth_client):
+        upload = image_upload(size=(1200, 900))
+        payload = {"title": "Pictured", "content": POST_CONTENT, "thumbnail": upload}
+        with mock.patch.object(PostImages, "decode") as decode:
+            created = auth_client.post(reverse("post-list"), payload, format="multipart").data
+        decode.assert_not_called()
+        listed = auth_client.get(reverse("post-list")).data["results"][0]
+        for data in (created, listed):
+            assert (data["thumbnail_width"], data["thumbnail_height"]) == (1200, 900)
+            assert data["thumbnail_bytes"] == upload.size
+            assert data["thumbnail_format"] == "jpeg"
+            assert data["thumbnail_placeholder"] == ""
+
+    def test_placeholder_is_attached_with_the_renditions(self, auth_client, create_post):
+        post = create_post(thumbnail=image_upload())
+        ThumbnailQueue.run_pending()
+        listed = auth_client.get(reverse("post-list")).data["results"][0]
+        assert listed["thumbnail_placeholder"].startswith("data:image/webp;base64,")
+        post.refresh_from_db()
+        assert post.thumbnail_placeholder == listed["thumbnail_placeholder"]
+
+    def test_cached_representation_is_refreshed(self, auth_client, create_post):
+        post = create_post(thumbnail=image_upload())
+        url = reverse("post-detail", args=[post.id])
+        assert auth_client.get(url).data["thumbnail_status"] == "pending"
+        ThumbnailQueue.run_pending()
+        assert auth_client.get(url).data["thumbnail_status"] == "ready"
+
+    def test_published_lists_are_retired(self, create_post, django_capture_on_commit_callbacks):
+        create_post(thumbnail=image_upload(), status="published")
+        before = PostListCache.generation()
+        with django_capture_on_commit_callbacks(execute=True):
+            ThumbnailQueue.run_pending()
+        assert PostListCache.generation() != before
+
+    def test_replaced_upload_is_skipped(self, create_post):
+        post = create_post(thumbnail=image_upload())
+        PostService.update_post(post, data={"thumbnail": image_upload(size=(900, 900))})
+        with mock.patch.object(PostImages, "render", wraps=PostImages.render) as render:
+            assert ThumbnailQueue.run_pending() == 2
+        render.assert_called_once()
+        post.refresh_from_db()
+        assert post.thumbnail_renditions["card"]["height"] == 480
+
+    def test_deleted_post_is_skipped(self, create_post):
+        PostService.delete_post(create_post(thumbnail=image_upload()))
+        with mock.patch.object(PostImages, "render") as render:
+            ThumbnailQueue.run_pending()
+        render.assert_not_called()
+        assert not ThumbnailJob.objects.exists()
+
+    def test_result_for_a_released_blob_is_discarded(self, create_post, django_capture_on_commit_callbacks):
+        post = create_post(thumbnail=image_upload())
+        digest = post.thumbnail_blob_id
+        renditions, _ = PostImages.render(ThumbnailBlobs.directory(digest), post.thumbnail)
+        with django_capture_on_commit_callbacks(execute=True):
+            PostService.update_post(post, data={"thumbnail": None})
+        with django_capture_on_commit_callbacks(execute=True):
+            assert PostService.finish_thumbnail(digest, renditions) is False
+        assert not default_storage.exists(renditions["card"]["webp"])
+        post.refresh_from_db()
+        assert post.thumbnail_status == Post.ThumbnailStatus.NONE
+
+    def test_undecodable_upload_fails_without_retry(self, create_post):
+        broken = SimpleUploadedFile("broken.jpg", b"\xff\xd8\xff\xe0not a jpeg", content_type="image/jpeg")
+        post = create_post(thumbnail=broken)
+        ThumbnailQueue.run_pending()
+        post.refresh_from_db()
+        assert post.thumbnail_status == Post.ThumbnailStatus.FAILED
+        assert (post.thumbnail_width, post.thumbnail_bytes, post.thumbnail_placeholder) == (None, broken.size, "")
+        assert not ThumbnailJob.objects.exists()
+
+    def test_transient_errors_are_retried_later(self, create_post):
+        post = create_post(thumbnail=image_upload())
+        with mock.patch.object(PostImages, "render", side_effect=OSError("storage hiccup")):
+            assert ThumbnailQueue.run_pending() == 1
+        job = ThumbnailJob.objects.get()
+        assert job.attempts == 1
+        assert "storage hiccup" in job.last_error
+        assert job.run_after > timezone.now()
+        assert ThumbnailQueue.run_pending() == 0  # not due yet
+
+        ThumbnailJob.objects.update(run_after=timezone.now())
+        ThumbnailQueue.run_pending()
+        post.refresh_from_db()
+        assert post.thumbnail_status == Post.ThumbnailStatus.READY
+
+    def test_gives_up_after_max_attempts(self, create_post):
+        post = create_post(thumbnail=image_upload())
+        ThumbnailJob.objects.update(attempts=2)
+        with mock.patch.object(PostImages, "render", side_effect=OSError("still broken")):
+            ThumbnailQueue.run_pending()
+        post.refresh_from_db()
+        assert post.thumbnail_status == Post.ThumbnailStatus.FAILED
+        assert not ThumbnailJob.objects.exists()
+
+    def test_claim_is_committed_before_rendering(self, create_post):
+        create_post(thumbnail=image_upload())
+        with mock.patch.object(PostImages, "render", side_effect=SystemExit("worker killed")):
+            with pytest.raises(SystemExit):
+                ThumbnailQueue.run_next()
+        job = ThumbnailJob.objects.get()
+        assert job.attempts == 1
+        assert job.run_after > timezone.now()
+        assert ThumbnailQueue.run_pending() == 0  # leased until the claim runs out
+
+    def test_gives_up_on_images_that_keep_killing_the_worker(self, create_post):
+        post = create_post(thumbnail=image_upload())
+        with mock.patch.object(PostImages, "render", side_effect=SystemExit("worker killed")) as render:
+            for _ in range(THUMBNAIL_JOB_MAX_ATTEMPTS):
+                with pytest.raises(SystemExit):
+                    ThumbnailQueue.run_next()
+                ThumbnailJob.objects.update(run_after=timezone.now())
+            assert ThumbnailQueue.run_next() is True
+        assert render.call_count == THUMBNAIL_JOB_MAX_ATTEMPTS
+        post.refresh_from_db()
+        assert post.thumbnail_status == Post.ThumbnailStatus.FAILED
+        assert not ThumbnailJob.objects.exists()
+
+    def test_stale_instance_update_keeps_worker_result(self, create_post):
+        post = create_post(thumbnail=image_upload())
+        stale = PostService.get_post(post.id)
+        ThumbnailQueue.run_pending()
+        PostService.update_post(stale, data={"title": "Renamed"})
+        post.refresh_from_db()
+        assert post.title == "Renamed"
+        assert post.thumbnail_status == Post.ThumbnailStatus.READY
+        assert post.thumbnail_renditions
+
+
+@pytest.mark.django_db
+class TestProcessThumbnailsCommand:
+    def test_once_drains_the_queue(self, create_post):
+        create_post(thumbnail=image_upload(size=(800, 400)))
+        create_post(thumbnail=image_upload(size=(400, 800)))
+        out = StringIO()
+        call_command("process_thumbnails", "--once", stdout=out)
+        assert "Processed 2 thumbnail jobs." in out.getvalue()
+        assert set(Post.objects.values_list("thumbnail_status", flat=True)) == {"ready"}
@@ -0,0 +1,256 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.tests.factories import UserFactory
+from apps.posts import uploads
+from apps.posts.constants import MAX_THUMBNAIL_SIZE_MB
+from apps.posts.models import ChunkedUpload, Post, ThumbnailBlob
+from apps.posts.uploads import ChunkedUploads
+
+from .factories import POST_CONTENT, PostFactory, image_upload
+
+CHUNK = 64 * 1024
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def image():
+    return image_upload().read()
+
+
+def _stored(root):
+    return sorted(str(path.relative_to(root)) for path in root.rglob("*") if path.is_file())
+
+
+def _start(client, data, **overrides):
+    payload = {"filename": "photo.jpg", "content_type": "image/jpeg", "size": len(data), **overrides}
+    return client.post(reverse("upload-list"), payload, format="json")
+
+
+def _send(client, upload_id, offset, chunk):
+    return client.patch(
+        reverse("upload-detail", args=[upload_id]),
+        chunk,
+        content_type="application/offset+octet-stream",
+        HTTP_UPLOAD_OFFSET=str(offset),
+    )
+
+
+def _upload(client, data, chunk=CHUNK):
+    """Send ``data`` in chunks and complete it; returns the upload id."""
+    upload_id = _start(client, data).data["id"]
+    for offset in range(0, len(data), chunk):
+        assert _send(client, upload_id, offset, data[offset:offset + chunk]).status_code == 200
+    assert client.post(reverse("upload-complete", args=[upload_id])).status_code == 200
+    return upload_id
+
+
+@pytest.mark.django_db
+class TestChunkedUploadAPI:
+    def test_start(self, auth_client, author_user):
+        response = _start(auth_client, b"x" * 1000)
+        assert response.status_code == 201
+        assert response.data["offset"] == 0
+        assert response.data["status"] == "open"
+        assert ChunkedUpload.objects.get().author == author_user
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [{"content_type": "application/pdf"}, {"size": 0}, {"size": MAX_THUMBNAIL_SIZE_MB * 1024 * 1024 + 1}],
+    )
+    def test_start_validates(self, auth_client, overrides):
+        response = _start(auth_client, b"x", **overrides)
+        assert response.status_code == 400
+        assert not ChunkedUpload.objects.exists()
+
+    def test_size_limit_matches_multipart_uploads(self, auth_client):
+        assert _start(auth_client, b"x", size=MAX_THUMBNAIL_SIZE_MB * 1024 * 1024).status_code == 201
+
+    def test_requires_authentication(self, api_client):
+        assert _start(api_client, b"x").status_code == 401
+
+    def test_chunks_advance_the_offset(self, auth_client, image):
+        upload_id = _start(auth_client, image).data["id"]
+        response = _send(auth_client, upload_id, 0, image[:CHUNK])
+        assert response.status_code == 200
+        assert response.data["offset"] == CHUNK
+        assert auth_client.get(reverse("upload-detail", args=[upload_id])).data["offset"] == CHUNK
+
+    def test_chunk_at_the_wrong_offset_is_rejected(self, auth_client, image):
+        upload_id = _start(auth_client, image).data["id"]
+        _send(auth_client, upload_id, 0, image[:CHUNK])
+        # A retry of a chunk that already landed
+        response = _send(auth_client, upload_id, 0, image[:CHUNK])
+        assert response.status_code == 409
+        assert str(CHUNK) in response.data["error"]["message"]
+        assert ChunkedUpload.objects.get().received == CHUNK
+
+    def test_missing_offset_is_rejected(self, auth_client, image):
+        upload_id = _start(auth_client, image).data["id"]
+        response = auth_client.patch(
+            reverse("upload-detail", args=[upload_id]), image[:CHUNK], content_type="application/offset+octet-stream"
+        )
+        assert response.status_code == 400
+
+    def test_chunk_past_the_declared_size_is_rejected(self, auth_client, media_root):
+        upload_id = _start(auth_client, b"x" * 100).data["id"]
+        response = _send(auth_client, upload_id, 0, b"x" * 101)
+        assert response.status_code == 413
+        assert ChunkedUpload.objects.get().received == 0
+        assert _stored(media_root) == []
+
+    def test_chunk_over_the_chunk_limit_is_rejected(self, auth_client):
+        upload_id = _start(auth_client, b"x" * 1000).data["id"]
+        with mock.patch.object(uploads, "MAX_CHUNK_BYTES", 100):
+            assert _send(auth_client, upload_id, 0, b"x" * 101).status_code == 413
+            assert _send(auth_client, upload_id, 0, b"x" * 100).status_code == 200
+
+    def test_chunks_are_streamed_to_storage(self, auth_client, image, media_root):
+        upload_id = _start(auth_client, image).data["id"]
+        with mock.patch("django.http.request.HttpRequest.body", new_callable=mock.PropertyMock) as body:
+            _send(auth_client, upload_id, 0, image[:CHUNK])
+        body.assert_not_called()
+        assert _stored(media_root) == [f"posts/uploads/{upload_id}/000000000000.part"]
+
+    def test_complete_joins_the_chunks(self, auth_client, image, media_root, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            upload_id = _upload(auth_client, image)
+        upload = ChunkedUpload.objects.get()
+        assert upload.status == ChunkedUpload.Status.COMPLETE
+        assert _stored(media_root) == [f"posts/uploads/{upload_id}/upload.jpg"]
+        with default_storage.open(upload.file) as handle:
+            assert handle.read() == image
+
+    def test_complete_is_idempotent(self, auth_client, image):
+        upload_id = _upload(auth_client, image)
+        response = auth_client.post(reverse("upload-complete", args=[upload_id]))
+        assert response.status_code == 200
+        assert response.data["status"] == "complete"
+
+    def test_complete_before_every_byte_arrived_is_rejected(self, auth_client, image):
+        upload_id = _start(auth_client, image).data["id"]
+        _send(auth_client, upload_id, 0, image[:CHUNK])
+        assert auth_client.post(reverse("upload-complete", args=[upload_id])).status_code == 409
+
+    def test_complete_rejects_bytes_that_are_not_an_image(
+        self, auth_client, media_root, django_capture_on_commit_callbacks
+    ):
+        data = b"%PDF-1.4 not an image at all"
+        upload_id = _start(auth_client, data).data["id"]
+        _send(auth_client, upload_id, 0, data)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = auth_client.post(reverse("upload-complete", args=[upload_id]))
+        assert response.status_code == 400
+        assert not ChunkedUpload.objects.exists()
+        assert _stored(media_root) == []
+
+    def test_delete_abandons_the_upload(self, auth_client, image, media_root, django_capture_on_commit_callbacks):
+        upload_id = _start(auth_client, image).data["id"]
+        _send(auth_client, upload_id, 0, image[:CHUNK])
+        with django_capture_on_commit_callbacks(execute=True):
+            response = auth_client.delete(reverse("upload-detail", args=[upload_id]))
+        assert response.status_code == 204
+        assert not ChunkedUpload.objects.exists()
+        assert _stored(media_root) == []
+
+    def test_uploads_are_private(self, auth_client, image):
+        upload_id = _start(auth_client, image).data["id"]
+        other = APIClient()
+        other.force_authenticate(user=UserFactory(role="author"))
+        assert other.get(reverse("upload-detail", args=[upload_id])).status_code == 403
+        assert _send(other, upload_id, 0, image[:CHUNK]).status_code == 403
+
+
+@pytest.mark.django_db
+class TestAttachingUploads:
+    def test_create_attaches_the_upload(self, auth_client, image, media_root, django_capture_on_commit_callbacks):
+        upload_id = _upload(auth_client, image)
+        payload = {"title": "Pictured", "content": POST_CONTENT, "thumbnail_upload": upload_id}
+        with django_capture_on_commit_callbacks(execute=True):
+            response = auth_client.post(reverse("post-list"), payload, format="json")
+        assert response.status_code == 201
+        assert response.data["thumbnail_status"] == "pending"
+        assert (response.data["thumbnail_width"], response.data["thumbnail_height"]) == (3000, 1500)
+
+        post = Post.objects.get()
+        assert post.thumbnail_blob_id == ThumbnailBlob.objects.get().digest
+        with default_storage.open(post.thumbnail.name) as handle:
+            assert handle.read() == image
+        # The upload is consumed
+        assert not ChunkedUpload.objects.exists()
+        assert not any(name.startswith("posts/uploads/") for name in _stored(media_root))
+
+    def test_update_attaches_the_upload(self, auth_client, author_user, image):
+        post = PostFactory(author=author_user)
+        upload_id = _upload(auth_client, image)
+        response = auth_client.patch(
+            reverse("post-detail", args=[post.id]), {"thumbnail_upload": upload_id}, format="json"
+        )
+        assert response.status_code == 200
+        post.refresh_from_db()
+        assert post.thumbnail_blob_id is not None
+
+    def test_an_upload_attaches_once(self, auth_client, image):
+        upload_id = _upload(auth_client, image)
+        payload = {"title": "Pictured", "content": POST_CONTENT, "thumbnail_upload": upload_id}
+        assert auth_client.post(reverse("post-list"), payload, format="json").status_code == 201
+        assert auth_client.post(reverse("post-list"), payload, format="json").status_code == 400
+
+    def test_incomplete_upload_is_rejected(self, auth_client, image):
+        upload_id = _start(auth_client, image).data["id"]
+        payload = {"title": "Pictured", "content": POST_CONTENT, "thumbnail_upload": upload_id}
+        response = auth_client.post(reverse("post-list"), payload, format="json")
+        assert response.status_code == 400
+        assert "thumbnail_upload" in response.data["error"]["details"]
+
+    def test_another_users_upload_is_rejected(self, auth_client, image):
+        owner = APIClient()
+        owner.force_authenticate(user=UserFactory(role="author"))
+        upload_id = _upload(owner, image)
+        payload = {"title": "Pictured", "content": POST_CONTENT, "thumbnail_upload": upload_id}
+        assert auth_client.post(reverse("post-list"), payload, format="json").status_code == 400
+        assert ChunkedUpload.objects.exists()
+
+    def test_file_and_upload_together_are_rejected(self, auth_client, image):
+        upload_id = _upload(auth_client, image)
+        payload = {
+            "title": "Pictured", "content": POST_CONTENT, "thumbnail": image_upload(), "thumbnail_upload": upload_id
+        }
+        assert auth_client.post(reverse("post-list"), payload, format="multipart").status_code == 400
+
+
+@pytest.mark.django_db
+class TestUploadExpiry:
+    def test_expires_stale_uploads(self, auth_client, image, media_root, django_capture_on_commit_callbacks):
+        stale = _start(auth_client, image).data["id"]
+        _send(auth_client, stale, 0, image[:CHUNK])
+        fresh = _start(auth_client, image).data["id"]
+        ChunkedUpload.objects.filter(pk=stale).update(updated_at=timezone.now() - timedelta(days=2))
+
+        assert ChunkedUploads.expire(dry_run=True) == 1
+        assert ChunkedUpload.objects.count() == 2
+        with django_capture_on_commit_callbacks(execute=True):
+            assert ChunkedUploads.expire() == 1
+        assert [str(pk) for pk in ChunkedUpload.objects.values_list("pk", flat=True)] == [fresh]
+        assert _stored(media_root) == []
+
+    def test_command(self, auth_client, image):
+        upload_id = _start(auth_client, image).data["id"]
+        ChunkedUpload.objects.filter(pk=upload_id).update(updated_at=timezone.now() - timedelta(days=2))
+        out = StringIO()
+        call_command("gc_thumbnails", stdout=out)
+        assert "expired uploads: 1." in out.getvalue()
+        assert not ChunkedUpload.objects.exists()
@@ -1,9 +1,21 @@
+import json
 import uuid
+from datetime import timedelta
+from unittest import mock
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 
+from apps.posts.constants import BATCH_MAX_OPERATIONS
+from apps.posts.models import Post
+from apps.posts.services import PostService
+from common.conditional import check_if_match
+from common.renderers import FastJSONRenderer
+
 from .factories import PostFactory
 
 
@@ -33,12 +45,53 @@ class TestPostListAPI:
         response = auth_client.get(reverse("post-list"), {"category": "Tech"})
         assert response.data["count"] == 1
 
+    def test_list_posts_filters_by_author(self, auth_client, author_user):
+        PostFactory(author=author_user)
+        PostFactory()
+        response = auth_client.get(reverse("post-list"), {"author": str(author_user.id)})
+        assert response.data["count"] == 1
+        assert response.data["results"][0]["author"] == author_user.id
+
     def test_list_posts_search_by_title(self, auth_client):
         PostFactory(title="Django Tutorial")
         PostFactory(title="React Guide")
         response = auth_client.get(reverse("post-list"), {"search": "Django"})
         assert response.data["count"] == 1
 
+    def test_search_matches_content_and_excerpt(self, auth_client):
+        PostFactory(title="First", content="Covers pgbouncer connection pooling in depth.")
+        PostFactory(title="Second", excerpt="All about pgbouncer")
+        PostFactory(title="Third", content="Unrelated material about gardening.")
+        response = auth_client.get(reverse("post-list"), {"search": "pgbouncer"})
+        assert response.data["count"] == 2
+
+    def test_search_ranks_title_matches_first(self, auth_client):
+        PostFactory(title="Notes", content="A passing mention of indexing somewhere in here.")
+        PostFactory(title="Indexing Strategies", content="Plain body text for this post.")
+        response = auth_client.get(reverse("post-list"), {"search": "indexing"})
+        titles = [item["title"] for item in response.data["results"]]
+        assert titles == ["Indexing Strategies", "Notes"]
+        ranks = [item["search_rank"] for item in response.data["results"]]
+        assert ranks == sorted(ranks, reverse=True)
+
+    def test_search_returns_highlighted_headline(self, auth_client):
+        PostFactory(content="Vacuum tuning keeps bloat under control.")
+        response = auth_client.get(reverse("post-list"), {"search": "vacuum"})
+        assert "<mark>Vacuum</mark>" in response.data["results"][0]["search_headline"]
+
+    def test_list_without_search_omits_search_fields(self, auth_client):
+        PostFactory()
+        response = auth_client.get(reverse("post-list"))
+        assert "search_rank" not in response.data["results"][0]
+        assert "search_headline" not in response.data["results"][0]
+
+    def test_list_query_never_selects_content(self, auth_client):
+        PostFactory.create_batch(2)
+        with CaptureQueriesContext(connection) as ctx:
+            response = auth_client.get(reverse("post-list"))
+        assert response.status_code == status.HTTP_200_OK
+        assert not any('"posts_post"."content"' in q["sql"] for q in ctx.captured_queries)
+
     def test_list_response_includes_thumbnail_url(self, auth_client):
         PostFactory()
         response = auth_client.get(reverse("post-list"))
@@ -65,6 +118,323 @@ class TestPostListAPI:
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+@pytest.mark.django_db
+class TestPostListEstimatedCount:
+    def test_small_result_sets_get_exact_count(self, auth_client):
+        PostFactory.create_batch(3)
+        response = auth_client.get(reverse("post-list"))
+        assert response.data["count"] == 3
+        assert response.data["count_is_approximate"] is False
+
+    def test_small_tables_skip_the_planner_estimate(self, auth_client):
+        PostFactory.create_batch(3)
+        with CaptureQueriesContext(connection) as first:
+            auth_client.get(reverse("post-list"), {"page_size": 1})
+        with CaptureQueriesContext(connection) as second:
+            auth_client.get(reverse("post-list"), {"page_size": 2})
+        assert not any("EXPLAIN" in query["sql"] for query in [*first, *second])
+        # The table size is looked up once, then cached
+        assert sum("pg_class" in query["sql"] for query in [*first, *second]) == 1
+        assert len(second.captured_queries) == 2
+
+    def test_large_tables_consult_the_planner_estimate(self, auth_client, settings):
+        settings.PAGINATION_ESTIMATE_THRESHOLD = 1
+        PostFactory.create_batch(5)
+        with mock.patch("common.pagination.estimate_table_rows", return_value=1_000_000):
+            with CaptureQueriesContext(connection) as queries:
+                response = auth_client.get(reverse("post-list"), {"page_size": 2})
+        assert any("EXPLAIN" in query["sql"] for query in queries)
+        assert response.data["count_is_approximate"] is True
+
+    def test_large_result_sets_use_planner_estimate(self, auth_client, settings, django_assert_num_queries):
+        settings.PAGINATION_ESTIMATE_THRESHOLD = 0
+        PostFactory.create_batch(5)
+        # EXPLAIN + page SELECT, no COUNT(*)
+        with django_assert_num_queries(2):
+            response = auth_client.get(reverse("post-list"), {"page_size": 2})
+        assert response.data["count_is_approximate"] is True
+        assert len(response.data["results"]) == 2
+        assert response.data["next"] is not None
+
+    def test_estimated_pages_can_be_walked_to_the_end(self, auth_client, settings):
+        settings.PAGINATION_ESTIMATE_THRESHOLD = 0
+        PostFactory.create_batch(5)
+        seen = []
+        response = auth_client.get(reverse("post-list"), {"page_size": 2})
+        seen += response.data["results"]
+        while response.data["next"]:
+            response = auth_client.get(response.data["next"])
+            seen += response.data["results"]
+        assert len({item["id"] for item in seen}) == 5
+        # The last page observes the true total
+        assert response.data["count"] == 5
+
+    def test_estimated_page_past_the_end_returns_404(self, auth_client, settings):
+        settings.PAGINATION_ESTIMATE_THRESHOLD = 0
+        PostFactory.create_batch(2)
+        response = auth_client.get(reverse("post-list"), {"page": 50})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestPostListCursorPagination:
+    def _walk(self, client, params):
+        """Follow ``next`` links from the first page and collect every result."""
+        response = client.get(reverse("post-list"), {"pagination": "cursor", **params})
+        pages = [response.data]
+        while response.data["next"]:
+            response = client.get(response.data["next"])
+            pages.append(response.data)
+        return pages
+
+    def test_cursor_page_has_no_count(self, auth_client):
+        PostFactory.create_batch(3)
+        response = auth_client.get(reverse("post-list"), {"pagination": "cursor"})
+        assert response.status_code == status.HTTP_200_OK
+        assert "count" not in response.data
+        assert len(response.data["results"]) == 3
+        assert response.data["next"] is None
+        assert response.data["previous"] is None
+
+    def test_cursor_walk_matches_offset_ordering(self, auth_client):
+        posts = PostFactory.create_batch(7)
+        # Identical timestamps force the pk tie-breaker to do the work
+        same_time = timezone.now()
+        Post.objects.filter(pk__in=[p.pk for p in posts[:4]]).update(created_at=same_time)
+
+        pages = self._walk(auth_client, {"page_size": 3})
+        walked = [item["id"] for page in pages for item in page["results"]]
+        expected = [str(pk) for pk in Post.objects.order_by("-created_at", "-pk").values_list("pk", flat=True)]
+        assert walked == expected
+        assert [len(page["results"]) for page in pages] == [3, 3, 1]
+
+    @pytest.mark.parametrize("ordering", ["-created_at", "-published_at", "title", "-title", "published_at"])
+    def test_cursor_walk_covers_every_post_once(self, auth_client, ordering):
+        now = timezone.now()
+        for i in range(5):
+            PostFactory(published=True, published_at=now - timedelta(days=i % 2), title=f"Title {i % 3}")
+        PostFactory.create_batch(3)  # drafts have NULL published_at
+
+        pages = self._walk(auth_client, {"page_size": 2, "ordering": ordering})
+        walked = [item["id"] for page in pages for item in page["results"]]
+        assert len(walked) == 8
+        assert len(set(walked)) == 8
+
+    def test_previous_link_returns_prior_page(self, auth_client):
+        PostFactory.create_batch(5)
+        first = auth_client.get(reverse("post-list"), {"pagination": "cursor", "page_size": 2})
+        second = auth_client.get(first.data["next"])
+        back = auth_client.get(second.data["previous"])
+        assert [p["id"] for p in back.data["results"]] == [p["id"] for p in first.data["results"]]
+        assert back.data["previous"] is None
+
+    @pytest.mark.parametrize("ordering", ["-published_at", "published_at"])
+    def test_previous_links_walk_back_across_nulls(self, auth_client, ordering):
+        now = timezone.now()
+        for i in range(3):
+            PostFactory(published=True, published_at=now - timedelta(days=i))
+        PostFactory.create_batch(3)  # drafts have NULL published_at, sorted last
+
+        pages = self._walk(auth_client, {"page_size": 2, "ordering": ordering})
+        response = auth_client.get(pages[-1]["previous"])
+        back = [response.data]
+        while response.data["previous"]:
+            response = auth_client.get(response.data["previous"])
+            back.append(response.data)
+        assert [page["results"] for page in reversed(back)] == [page["results"] for page in pages[:-1]]
+
+    def test_cursor_respects_filters(self, auth_client):
+        PostFactory.create_batch(3, published=True)
+        PostFactory.create_batch(2)
+        pages = self._walk(auth_client, {"page_size": 2, "status": "published"})
+        assert sum(len(page["results"]) for page in pages) == 3
+
+    def test_invalid_cursor_returns_404(self, auth_client):
+        response = auth_client.get(reverse("post-list"), {"pagination": "cursor", "cursor": "not-a-cursor"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestPostListRendering:
+    def test_fast_renderer_is_the_default(self, auth_client):
+        PostFactory(title="Ünïcödé \u2028 line")
+        response = auth_client.get(reverse("post-list"))
+        assert isinstance(response.accepted_renderer, FastJSONRenderer)
+        assert "\\u2028".encode() in response.content
+        assert json.loads(response.content)["results"][0]["title"] == "Ünïcödé \u2028 line"
+
+    def test_large_pages_are_streamed(self, auth_client, settings):
+        settings.STREAMING_RESPONSE_MIN_ITEMS = 3
+        PostFactory.create_batch(4)
+        buffered = auth_client.get(reverse("post-list"), {"page_size": 2})
+        streamed = auth_client.get(reverse("post-list"), {"page_size": 4})
+
+        assert not buffered.streaming
+        assert streamed.streaming
+        assert streamed["Content-Type"] == "application/json"
+        assert streamed["ETag"]
+        chunks = list(streamed.streaming_content)
+        assert len(chunks) > 4  # one chunk per item plus the envelope
+        body = json.loads(b"".join(chunks))
+        assert len(body["results"]) == 4
+        assert body["count"] == 4
+
+    def test_streamed_bytes_match_buffered_render(self, auth_client):
+        PostFactory.create_batch(3, published=True)
+        response = auth_client.get(reverse("post-list"), {"status": "published"})
+        renderer = FastJSONRenderer()
+        assert b"".join(renderer.iter_render(response.data)) == response.content
+        assert json.loads(response.content) == json.loads(json.dumps(response.data, default=str))
+
+    def test_cached_large_pages_are_streamed(self, auth_client, settings):
+        settings.STREAMING_RESPONSE_MIN_ITEMS = 2
+        PostFactory.create_batch(2, published=True)
+        auth_client.get(reverse("post-list"), {"status": "published"})
+        response = auth_client.get(reverse("post-list"), {"status": "published"})
+        assert response["X-Cache"] == "HIT"
+        assert response.streaming
+        assert len(json.loads(b"".join(response.streaming_content))["results"]) == 2
+
+    def test_indented_responses_are_not_streamed(self, auth_client, settings):
+        settings.STREAMING_RESPONSE_MIN_ITEMS = 1
+        PostFactory()
+        response = auth_client.get(reverse("post-list"), HTTP_ACCEPT="application/json; indent=2")
+        assert not response.streaming
+        assert b'\n  "count"' in response.content
+
+
+@pytest.mark.django_db
+class TestPostBatchAPI:
+    CONTENT = "This is enough content for the minimum validation."
+
+    def _batch(self, client, *operations):
+        return client.post(reverse("post-batch"), {"operations": list(operations)}, format="json")
+
+    def test_mixed_operations_return_results_in_order(self, auth_client, author_user):
+        to_update = PostFactory(author=author_user, title="Before")
+        to_delete = PostFactory(author=author_user)
+        response = self._batch(
+            auth_client,
+            {"op": "create", "data": {"title": "Batch Post", "content": self.CONTENT}},
+            {"op": "update", "id": str(to_update.id), "data": {"title": "After"}},
+            {"op": "delete", "id": str(to_delete.id)},
+            {"op": "create", "data": {"title": "Batch Post", "content": self.CONTENT, "status": "published"}},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        results = response.data["results"]
+        assert [r["status"] for r in results] == [201, 200, 204, 201]
+        assert results[0]["data"]["slug"] == "batch-post"
+        assert results[3]["data"]["slug"].startswith("batch-post-")
+        assert results[3]["data"]["published_at"] is not None
+        assert results[1]["data"]["title"] == "After"
+        assert results[2]["id"] == str(to_delete.id)
+        assert not Post.objects.filter(pk=to_delete.pk).exists()
+        assert Post.objects.filter(author=author_user, title="Batch Post").count() == 2
+
+    def test_invalid_item_rejects_whole_batch(self, auth_client, author_user):
+        post = PostFactory(author=author_user, title="Untouched")
+        response = self._batch(
+            auth_client,
+            {"op": "create", "data": {"title": "Good", "content": self.CONTENT}},
+            {"op": "update", "id": str(post.id), "data": {"title": "Changed"}},
+            {"op": "create", "data": {"title": "Bad", "content": "Short"}},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        errors = response.data["error"]["details"]["operations"]
+        assert errors[0] == {} and errors[1] == {}
+        assert "content" in errors[2]
+        assert not Post.objects.filter(title="Good").exists()
+        post.refresh_from_db()
+        assert post.title == "Untouched"
+
+    def test_update_validates_against_each_instance(self, auth_client, author_user):
+        first, second = PostFactory.create_batch(2, author=author_user)
+        response = self._batch(
+            auth_client,
+            {"op": "update", "id": str(first.id), "data": {"content": "Long enough replacement content."}},
+            {"op": "update", "id": str(second.id), "data": {"status": "archived"}},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        errors = response.data["error"]["details"]["operations"]
+        assert errors[0] == {} and "status" in errors[1]
+
+    def test_cannot_modify_others_posts(self, auth_client):
+        others = PostFactory()
+        response = self._batch(auth_client, {"op": "delete", "id": str(others.id)})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "id" in response.data["error"]["details"]["operations"][0]
+        assert Post.objects.filter(pk=others.pk).exists()
+
+    def test_unknown_id_is_reported(self, auth_client):
+        response = self._batch(auth_client, {"op": "delete", "id": str(uuid.uuid4())})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["error"]["details"]["operations"][0] == {"id": ["Post not found."]}
+
+    def test_envelope_validation(self, auth_client, author_user):
+        post = PostFactory(author=author_user)
+        assert self._batch(auth_client).status_code == status.HTTP_400_BAD_REQUEST
+        assert self._batch(auth_client, {"op": "update", "id": str(post.id)}).status_code == 400
+        duplicate = self._batch(
+            auth_client, {"op": "delete", "id": str(post.id)}, {"op": "delete", "id": str(post.id)}
+        )
+        assert duplicate.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_operation_limit(self, auth_client):
+        operations = [{"op": "create", "data": {"title": "T", "content": self.CONTENT}}] * (BATCH_MAX_OPERATIONS + 1)
+        response = self._batch(auth_client, *operations)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Post.objects.exists()
+
+    def test_requires_authentication(self, api_client):
+        response = self._batch(api_client, {"op": "create", "data": {"title": "T", "content": self.CONTENT}})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestPostAutocompleteAPI:
+    def test_returns_small_projection(self, auth_client):
+        post = PostFactory(title="Kubernetes Operators")
+        response = auth_client.get(reverse("post-autocomplete"), {"q": "kubernetes"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["results"] == [{"id": post.id, "title": post.title, "slug": post.slug}]
+
+    def test_tolerates_typos_and_partial_words(self, auth_client):
+        PostFactory(title="Kubernetes Operators")
+        PostFactory(title="Gardening Basics")
+        for term in ("kubernets", "kuber"):
+            response = auth_client.get(reverse("post-autocomplete"), {"q": term})
+            assert [r["title"] for r in response.data["results"]] == ["Kubernetes Operators"], term
+
+    def test_matches_category(self, auth_client):
+        PostFactory(title="Weekly Notes", category="Observability")
+        response = auth_client.get(reverse("post-autocomplete"), {"q": "observabilty"})
+        assert [r["title"] for r in response.data["results"]] == ["Weekly Notes"]
+
+    def test_orders_by_similarity(self, auth_client):
+        PostFactory(title="Postgres Replication Internals")
+        PostFactory(title="Postgres")
+        response = auth_client.get(reverse("post-autocomplete"), {"q": "postgres"})
+        assert response.data["results"][0]["title"] == "Postgres"
+
+    def test_limit_is_applied_and_capped(self, auth_client):
+        for i in range(4):
+            PostFactory(title=f"Django Tips {i}")
+        response = auth_client.get(reverse("post-autocomplete"), {"q": "django", "limit": 2})
+        assert len(response.data["results"]) == 2
+        response = auth_client.get(reverse("post-autocomplete"), {"q": "django", "limit": "junk"})
+        assert len(response.data["results"]) == 4
+
+    def test_short_query_skips_database(self, auth_client, django_assert_num_queries):
+        PostFactory(title="A")
+        with django_assert_num_queries(0):
+            response = auth_client.get(reverse("post-autocomplete"), {"q": "a"})
+        assert response.data["results"] == []
+
+    def test_unauthenticated_returns_401(self, api_client):
+        response = api_client.get(reverse("post-autocomplete"), {"q": "django"})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
 @pytest.mark.django_db
 class TestPostCreateAPI:
     def test_create_post_with_valid_data(self, auth_client):
@@ -138,6 +508,67 @@ class TestPostDetailAPI:
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+@pytest.mark.django_db
+class TestPostBySlugAPI:
+    def _get(self, client, slug, **extra):
+        return client.get(reverse("post-detail-by-slug", args=[slug]), **extra)
+
+    def test_returns_same_body_as_detail(self, auth_client):
+        post = PostFactory(slug="hello-world")
+        response = self._get(auth_client, "hello-world")
+        assert response.status_code == status.HTTP_200_OK
+        detail = auth_client.get(reverse("post-detail", args=[post.id]))
+        assert response.data == detail.data
+        assert response["ETag"] == detail["ETag"]
+
+    def test_cached_slug_skips_the_lookup_query(self, auth_client, django_assert_num_queries):
+        PostFactory(slug="cached")
+        self._get(auth_client, "cached")
+        with django_assert_num_queries(1):  # the detail row only
+            assert self._get(auth_client, "cached").status_code == status.HTTP_200_OK
+
+    def test_misses_are_cached(self, auth_client, django_assert_num_queries):
+        assert self._get(auth_client, "nope").status_code == status.HTTP_404_NOT_FOUND
+        with django_assert_num_queries(0):
+            assert self._get(auth_client, "nope").status_code == status.HTTP_404_NOT_FOUND
+
+    def test_create_clears_cached_miss(self, auth_client):
+        assert self._get(auth_client, "brand-new").status_code == status.HTTP_404_NOT_FOUND
+        auth_client.post(
+            reverse("post-list"),
+            {"title": "Brand New", "content": "This is enough content for the minimum validation."},
+            format="json",
+        )
+        assert self._get(auth_client, "brand-new").status_code == status.HTTP_200_OK
+
+    def test_delete_evicts_slug(self, auth_client, author_user):
+        post = PostFactory(author=author_user, slug="short-lived")
+        self._get(auth_client, "short-lived")
+        auth_client.delete(reverse("post-detail", args=[post.id]))
+        assert self._get(auth_client, "short-lived").status_code == status.HTTP_404_NOT_FOUND
+
+    def test_slug_change_evicts_old_and_new(self, auth_client, author_user):
+        post = PostFactory(author=author_user, slug="old-slug")
+        self._get(auth_client, "old-slug")
+        self._get(auth_client, "new-slug")
+        PostService.update_post(post, data={"slug": "new-slug"})
+        assert self._get(auth_client, "old-slug").status_code == status.HTTP_404_NOT_FOUND
+        assert self._get(auth_client, "new-slug").data["id"] == str(post.id)
+
+    def test_stale_id_is_evicted(self, auth_client):
+        post = PostFactory(slug="gone")
+        self._get(auth_client, "gone")
+        Post.objects.filter(pk=post.pk).delete()  # bypasses PostService
+        assert self._get(auth_client, "gone").status_code == status.HTTP_404_NOT_FOUND
+        PostFactory(slug="gone")
+        assert self._get(auth_client, "gone").status_code == status.HTTP_200_OK
+
+    def test_read_only(self, auth_client, author_user):
+        PostFactory(author=author_user, slug="mine")
+        response = auth_client.delete(reverse("post-detail-by-slug", args=["mine"]))
+        assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+
+
 @pytest.mark.django_db
 class TestPostUpdateAPI:
     def test_put_updates_post(self, auth_client, author_user):
@@ -190,3 +621,115 @@ class TestPostDeleteAPI:
         fake_id = uuid.uuid4()
         response = auth_client.delete(reverse("post-detail", args=[fake_id]))
         assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestPostConditionalRequests:
+    def test_detail_sends_validators(self, auth_client):
+        post = PostFactory()
+        response = auth_client.get(reverse("post-detail", args=[post.id]))
+        assert response["ETag"].startswith('"')
+        assert "Last-Modified" in response
+
+    def test_detail_if_none_match_returns_304_with_one_query(self, auth_client, django_assert_num_queries):
+        post = PostFactory()
+        etag = auth_client.get(reverse("post-detail", args=[post.id]))["ETag"]
+        with django_assert_num_queries(1):
+            response = auth_client.get(reverse("post-detail", args=[post.id]), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+
+    def test_detail_if_modified_since_returns_304(self, auth_client):
+        post = PostFactory()
+        last_modified = auth_client.get(reverse("post-detail", args=[post.id]))["Last-Modified"]
+        response = auth_client.get(
+            reverse("post-detail", args=[post.id]), HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_detail_changes_etag_after_update(self, auth_client, author_user):
+        post = PostFactory(author=author_user)
+        etag = auth_client.get(reverse("post-detail", args=[post.id]))["ETag"]
+        auth_client.patch(reverse("post-detail", args=[post.id]), {"title": "Changed"}, format="json")
+        response = auth_client.get(reverse("post-detail", args=[post.id]), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+
+    def test_detail_conditional_get_for_missing_post_returns_404(self, auth_client):
+        response = auth_client.get(reverse("post-detail", args=[uuid.uuid4()]), HTTP_IF_NONE_MATCH='"x"')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_list_if_none_match_returns_304(self, auth_client):
+        PostFactory.create_batch(2)
+        etag = auth_client.get(reverse("post-list"))["ETag"]
+        response = auth_client.get(reverse("post-list"), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_list_etag_changes_when_a_row_is_deleted(self, auth_client):
+        posts = PostFactory.create_batch(2)
+        etag = auth_client.get(reverse("post-list"))["ETag"]
+        posts[0].delete()
+        response = auth_client.get(reverse("post-list"), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_cached_list_revalidates_without_queries(self, auth_client, django_assert_num_queries):
+        PostFactory(published=True)
+        etag = auth_client.get(reverse("post-list"), {"status": "published"})["ETag"]
+        with django_assert_num_queries(0):
+            response = auth_client.get(reverse("post-list"), {"status": "published"}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_patch_with_stale_if_match_returns_412(self, auth_client, author_user):
+        post = PostFactory(author=author_user, title="Original")
+        response = auth_client.patch(
+            reverse("post-detail", args=[post.id]), {"title": "Lost update"},
+            format="json", HTTP_IF_MATCH='"stale"',
+        )
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert response.data["error"]["code"] == "PRECONDITION_FAILED"
+        post.refresh_from_db()
+        assert post.title == "Original"
+
+    def test_patch_with_current_if_match_succeeds(self, auth_client, author_user):
+        post = PostFactory(author=author_user)
+        etag = auth_client.get(reverse("post-detail", args=[post.id]))["ETag"]
+        response = auth_client.patch(
+            reverse("post-detail", args=[post.id]), {"title": "Fresh"}, format="json", HTTP_IF_MATCH=etag
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+
+    def test_stale_if_match_never_loads_post_body(self, auth_client, author_user):
+        post = PostFactory(author=author_user)
+        with CaptureQueriesContext(connection) as ctx:
+            auth_client.put(
+                reverse("post-detail", args=[post.id]),
+                {"title": "New", "content": "This is updated content that is long enough."},
+                format="json", HTTP_IF_MATCH='"stale"',
+            )
+        assert len(ctx.captured_queries) == 1
+        assert '"posts_post"."content"' not in ctx.captured_queries[0]["sql"]
+
+    def test_if_match_checks_ownership_first(self, auth_client):
+        post = PostFactory()
+        response = auth_client.patch(
+            reverse("post-detail", args=[post.id]), {"title": "Nope"}, format="json", HTTP_IF_MATCH='"stale"'
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    @pytest.mark.parametrize("method", ["patch", "delete"])
+    def test_write_landing_after_the_if_match_check_returns_412(self, auth_client, author_user, method):
+        post = PostFactory(author=author_user, title="Original")
+        etag = auth_client.get(reverse("post-detail", args=[post.id]))["ETag"]
+
+        def check_then_race(request, current):
+            check_if_match(request, current)
+            Post.objects.filter(pk=post.pk).update(title="Concurrent", updated_at=timezone.now())
+
+        with mock.patch("apps.posts.views.check_if_match", side_effect=check_then_race):
+            response = getattr(auth_client, method)(
+                reverse("post-detail", args=[post.id]), {"title": "Lost update"}, format="json", HTTP_IF_MATCH=etag
+            )
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        post.refresh_from_db()
+        assert post.title == "Concurrent"
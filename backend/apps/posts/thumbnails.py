@@ -0,0 +1,116 @@
+"""
+Background rendering of thumbnail renditions.
+
+Requests only store a new image and queue a ``ThumbnailJob`` for its blob in
+the same transaction (see apps.posts.blobs), so a post comes back at once with
+``thumbnail_status`` "pending" however large the image is. ``process_thumbnails``
+workers claim due jobs with ``SELECT ... FOR UPDATE SKIP LOCKED``, so any
+number of them can run side by side without handing out a job twice.
+
+A claim is committed on its own before rendering starts: it counts the
+attempt and leases the job for ``THUMBNAIL_JOB_LEASE_SECONDS``. Rendering then
+runs outside any transaction, without locking the blob or its posts, and
+``PostService.finish_thumbnail`` attaches the result to the blob and every
+post using it, unless the blob has been released meanwhile. A worker killed
+mid-render (out of memory on a huge image, SIGKILL) leaves the counted
+attempt behind, and the job is claimed again when the lease runs out.
+
+Failures are retried with a doubling delay up to ``THUMBNAIL_JOB_MAX_ATTEMPTS``
+attempts, crashed ones included; an image that cannot be decoded fails at once.
+"""
+import logging
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from .blobs import ThumbnailBlobs
+from .constants import THUMBNAIL_JOB_LEASE_SECONDS, THUMBNAIL_JOB_MAX_ATTEMPTS, THUMBNAIL_JOB_RETRY_SECONDS
+from .exceptions import InvalidThumbnailError
+from .images import PostImages
+from .models import ThumbnailBlob, ThumbnailJob
+from .services import PostService
+
+logger = logging.getLogger(__name__)
+
+
+class ThumbnailQueue:
+    """Stateless helpers for claiming and running thumbnail jobs."""
+
+    @staticmethod
+    def run_next():
+        """Claim and run the oldest due job; returns ``False`` if none was due."""
+        job = ThumbnailQueue._claim()
+        if job is None:
+            return False
+        ThumbnailQueue._run(job)
+        return True
+
+    @staticmethod
+    def run_pending(limit=None):
+        """Run due jobs until none is left or ``limit`` have run; returns how many ran."""
+        count = 0
+        while (limit is None or count < limit) and ThumbnailQueue.run_next():
+            count += 1
+        return count
+
+    @staticmethod
+    def _claim():
+        """
+        Take the oldest due job, count the attempt and lease it, committing
+        that before anything is rendered. Returns ``None`` if none was due.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            job = (
+                ThumbnailJob.objects.select_for_update(skip_locked=True)
+                .filter(run_after__lte=now)
+                .order_by("run_after", "id")
+                .first()
+            )
+            if job is None:
+                return None
+            job.attempts += 1
+            job.run_after = now + timedelta(seconds=THUMBNAIL_JOB_LEASE_SECONDS)
+            job.save(update_fields=["attempts", "run_after"])
+        return job
+
+    @staticmethod
+    def _run(job):
+        blob = ThumbnailBlob.objects.filter(pk=job.digest).only("digest", "original").first()
+        if blob is None:
+            # Every post using the image let go of it since the job was queued
+            job.delete()
+            return
+        if job.attempts > THUMBNAIL_JOB_MAX_ATTEMPTS:
+            # Every allowed attempt was claimed and none came back: the worker died each time
+            logger.error("Thumbnail %s failed for good: %s", blob.original, job.last_error or "worker died")
+            PostService.finish_thumbnail(blob.digest, None)
+            job.delete()
+            return
+
+        try:
+            with default_storage.open(blob.original) as upload:
+                renditions, placeholder = PostImages.render(ThumbnailBlobs.directory(blob.digest), upload)
+            # Attaching locks the blob's posts; losing a lock conflict is retried like any failure
+            PostService.finish_thumbnail(blob.digest, renditions, placeholder)
+        except InvalidThumbnailError:
+            logger.warning("Thumbnail %s could not be decoded", blob.original)
+            PostService.finish_thumbnail(blob.digest, None)
+            job.delete()
+            return
+        except Exception as exc:
+            job.last_error = repr(exc)
+            if job.attempts >= THUMBNAIL_JOB_MAX_ATTEMPTS:
+                logger.exception("Thumbnail %s failed for good", blob.original)
+                PostService.finish_thumbnail(blob.digest, None)
+                job.delete()
+            else:
+                delay = THUMBNAIL_JOB_RETRY_SECONDS * 2 ** (job.attempts - 1)
+                job.run_after = timezone.now() + timedelta(seconds=delay)
+                job.save(update_fields=["last_error", "run_after"])
+            return
+
+        job.delete()
+        logger.info("Thumbnail renditions ready for blob %s", blob.digest)
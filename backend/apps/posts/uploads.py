@@ -0,0 +1,234 @@
+"""
+Resumable chunked uploads for post media.
+
+A client starts an upload by declaring its name, type and size, then sends
+the bytes as a series of bounded chunks, each one request with the byte
+offset it starts at. A chunk is streamed from the request body straight to
+its own part file in storage, so memory use does not grow with the file and
+no request lasts longer than one chunk takes to arrive. After a dropped
+connection the client asks for the upload's offset and carries on from
+there; a chunk whose offset no longer matches (a retry that already
+landed, a concurrent sender) is rejected rather than appended twice.
+
+Completing the upload joins the parts into one file, again in fixed-size
+blocks, and checks from its header that it is an accepted image. A post
+create or update then names the upload instead of sending a file
+(``thumbnail_upload``); attaching consumes it (see ``PostService``).
+"""
+import io
+import logging
+from datetime import timedelta
+from functools import partial
+from pathlib import PurePath
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from .constants import ALLOWED_THUMBNAIL_TYPES, CHUNKED_UPLOAD_EXPIRY_HOURS, MAX_UPLOAD_CHUNK_SIZE_MB
+from .exceptions import (
+    InvalidThumbnailError,
+    UploadIncompleteError,
+    UploadOffsetMismatchError,
+    UploadTooLargeError,
+    UploadUnavailableError,
+)
+from .images import PostImages
+from .models import ChunkedUpload
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_ROOT = "posts/uploads"
+MAX_CHUNK_BYTES = MAX_UPLOAD_CHUNK_SIZE_MB * 1024 * 1024
+# Pillow format names (as reported by PostImages.probe) of the accepted content types
+ALLOWED_FORMATS = {content_type.split("/")[1] for content_type in ALLOWED_THUMBNAIL_TYPES}
+
+
+class ChunkedUploads:
+    """Stateless helpers for receiving, completing and consuming ``ChunkedUpload`` files."""
+
+    @staticmethod
+    def directory(upload):
+        return f"{UPLOAD_ROOT}/{upload.id}"
+
+    @staticmethod
+    def start(*, author, filename, content_type, size):
+        return ChunkedUpload.objects.create(author=author, filename=filename, content_type=content_type, size=size)
+
+    @staticmethod
+    def append(upload, offset, stream):
+        """
+        Stream one chunk starting at byte ``offset`` from ``stream`` (a
+        request body, or ``None`` when empty) into a new part file and
+        record it. Returns the refreshed upload.
+
+        The body is written before the row is locked, so a slow sender
+        holds no transaction open; the offset is checked again under the
+        lock and the part discarded if another chunk got there first.
+        """
+        if upload.status != ChunkedUpload.Status.OPEN:
+            raise UploadOffsetMismatchError("The upload is already complete.")
+        if offset != upload.received:
+            raise UploadOffsetMismatchError(f"Expected a chunk at offset {upload.received}.")
+
+        if stream is None:
+            return upload
+        body = _BoundedStream(stream, limit=min(upload.size - upload.received, MAX_CHUNK_BYTES))
+        name = default_storage.save(
+            f"{ChunkedUploads.directory(upload)}/{offset:012d}.part", File(io.BufferedReader(body), name="part")
+        )
+        if body.overflowed or not body.count:
+            default_storage.delete(name)
+            if body.overflowed:
+                raise UploadTooLargeError()
+            return upload
+
+        with transaction.atomic():
+            locked = ChunkedUpload.objects.select_for_update().get(pk=upload.pk)
+            if locked.status != ChunkedUpload.Status.OPEN or locked.received != offset:
+                # The part was saved under a name of its own, so the winner's is untouched
+                default_storage.delete(name)
+                raise UploadOffsetMismatchError(f"Expected a chunk at offset {locked.received}.")
+            locked.parts.append(name)
+            locked.received += body.count
+            locked.save(update_fields=["parts", "received", "updated_at"])
+        return locked
+
+    @staticmethod
+    def complete(upload):
+        """
+        Join the received parts into the upload's file and mark it complete;
+        a no-op for an upload already complete. An upload whose bytes are not
+        an accepted image is discarded and ``InvalidThumbnailError`` raised.
+        """
+        with transaction.atomic():
+            upload = ChunkedUpload.objects.select_for_update().get(pk=upload.pk)
+            if upload.status == ChunkedUpload.Status.COMPLETE:
+                return upload
+            if upload.received != upload.size:
+                raise UploadIncompleteError()
+
+            name = f"{ChunkedUploads.directory(upload)}/upload{PurePath(upload.filename).suffix.lower()}"
+            with _PartsStream(upload.parts) as joined:
+                name = default_storage.save(name, File(io.BufferedReader(joined), name=name))
+            with default_storage.open(name) as handle:
+                image_format = PostImages.probe(handle).get("format")
+            if image_format in ALLOWED_FORMATS:
+                parts = upload.parts
+                upload.file, upload.parts, upload.status = name, [], ChunkedUpload.Status.COMPLETE
+                upload.save(update_fields=["file", "parts", "status", "updated_at"])
+                transaction.on_commit(partial(ChunkedUploads._delete_files, parts))
+                logger.info("Chunked upload complete: %s (%d bytes)", upload.id, upload.size)
+                return upload
+
+        ChunkedUploads.abort(upload)
+        raise InvalidThumbnailError()
+
+    @staticmethod
+    def claim(upload):
+        """
+        Consume a complete upload for a post write: delete its row and, once
+        the write commits, its file. Returns the file opened from storage.
+        Must run inside the transaction that saves the post.
+        """
+        locked = (
+            ChunkedUpload.objects.select_for_update()
+            .filter(pk=upload.pk, status=ChunkedUpload.Status.COMPLETE)
+            .first()
+        )
+        if locked is None:
+            raise UploadUnavailableError()
+        transaction.on_commit(partial(ChunkedUploads._purge, ChunkedUploads.directory(locked)))
+        locked.delete()
+        return default_storage.open(locked.file)
+
+    @staticmethod
+    def abort(upload):
+        """Delete an upload and, once that commits, everything stored for it."""
+        directory = ChunkedUploads.directory(upload)
+        with transaction.atomic():
+            upload.delete()
+            transaction.on_commit(partial(ChunkedUploads._purge, directory))
+
+    @staticmethod
+    def expire(*, dry_run=False, older_than=timedelta(hours=CHUNKED_UPLOAD_EXPIRY_HOURS)):
+        """
+        Abort every upload, open or complete but never attached, untouched
+        for ``older_than``. Returns the number of uploads found.
+        """
+        stale = list(ChunkedUpload.objects.filter(updated_at__lt=timezone.now() - older_than))
+        if not dry_run:
+            for upload in stale:
+                ChunkedUploads.abort(upload)
+        return len(stale)
+
+    @staticmethod
+    def _delete_files(names):
+        for name in names:
+            default_storage.delete(name)
+
+    @staticmethod
+    def _purge(directory):
+        """Delete every file in an upload's directory, including parts of chunks rejected mid-write."""
+        try:
+            _, files = default_storage.listdir(directory)
+        except FileNotFoundError:
+            return
+        ChunkedUploads._delete_files(f"{directory}/{name}" for name in files)
+
+
+class _BoundedStream(io.RawIOBase):
+    """Reads ``stream`` through, noting the byte count and whether it ran past ``limit``."""
+
+    def __init__(self, stream, limit):
+        self.stream = stream
+        self.limit = limit
+        self.count = 0
+        self.overflowed = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        # Read at most one byte past the limit: enough to know it was exceeded
+        wanted = min(len(buffer), self.limit + 1 - self.count)
+        if wanted <= 0:
+            return 0
+        data = self.stream.read(wanted)
+        self.count += len(data)
+        if self.count > self.limit:
+            self.overflowed = True
+            return 0
+        buffer[: len(data)] = data
+        return len(data)
+
+
+class _PartsStream(io.RawIOBase):
+    """The part files ``names`` read back to back as one stream, opening one at a time."""
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.current = None
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while True:
+            if self.current is None:
+                if not self.names:
+                    return 0
+                self.current = default_storage.open(self.names.pop(0))
+            data = self.current.read(len(buffer))
+            if data:
+                buffer[: len(data)] = data
+                return len(data)
+            self.current.close()
+            self.current = None
+
+    def close(self):
+        if self.current is not None:
+            self.current.close()
+            self.current = None
+        super().close()
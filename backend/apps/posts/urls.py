@@ -4,5 +4,17 @@ from . import views
 
 urlpatterns = [
     path("posts/", views.PostListCreateView.as_view(), name="post-list"),
+    path("posts/export/", views.PostExportView.as_view(), name="post-export"),
+    path("posts/batch/", views.PostBatchView.as_view(), name="post-batch"),
+    path("posts/facets/", views.PostFacetsView.as_view(), name="post-facets"),
+    path("posts/feeds/rss/", views.PostFeedView.as_view(kind="rss"), name="post-feed-rss"),
+    path("posts/feeds/atom/", views.PostFeedView.as_view(kind="atom"), name="post-feed-atom"),
+    path("posts/feeds/rss/<str:category>/", views.PostFeedView.as_view(kind="rss"), name="post-category-feed-rss"),
+    path("posts/feeds/atom/<str:category>/", views.PostFeedView.as_view(kind="atom"), name="post-category-feed-atom"),
+    path("posts/autocomplete/", views.PostAutocompleteView.as_view(), name="post-autocomplete"),
+    path("posts/by-slug/<slug:slug>/", views.PostBySlugView.as_view(), name="post-detail-by-slug"),
     path("posts/<uuid:pk>/", views.PostDetailView.as_view(), name="post-detail"),
+    path("uploads/", views.UploadCreateView.as_view(), name="upload-list"),
+    path("uploads/<uuid:pk>/", views.UploadDetailView.as_view(), name="upload-detail"),
+    path("uploads/<uuid:pk>/complete/", views.UploadCompleteView.as_view(), name="upload-complete"),
 ]
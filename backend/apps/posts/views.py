@@ -1,15 +1,42 @@
+import re
+from datetime import datetime
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views import View
 from rest_framework import permissions, status
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.generics import get_object_or_404
 from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.accounts.permissions import IsOwner
+from common.conditional import check_if_match, has_conditional_headers, make_etag, not_modified, set_validators
+from common.db import guard_queries
+from common.pagination import EstimatedCountPagination, KeysetPagination
+from common.renderers import CSVRenderer, NDJSONRenderer, stream_list_response
 
+from .cache import PostListCache, PostRepresentationCache, PostSlugCache
+from .constants import AUTOCOMPLETE_DEFAULT_LIMIT, AUTOCOMPLETE_MAX_LIMIT, AUTOCOMPLETE_MIN_LENGTH
+from .export import PostExport
+from .facets import PostFacets
+from .feeds import PostFeeds
 from .filters import PostFilter
-from .models import Post
-from .serializers import PostDetailSerializer, PostListSerializer
+from .models import ChunkedUpload
+from .search import PostSearch
+from .serializers import (
+    ChunkedUploadSerializer,
+    PostBatchSerializer,
+    PostDetailSerializer,
+    PostFacetQuerySerializer,
+    PostListRowSerializer,
+)
 from .services import PostService
+from .sitemaps import PostSitemap
+from .uploads import ChunkedUploads
 
 
 class PostListCreateView(APIView):
@@ -21,33 +48,66 @@ class PostListCreateView(APIView):
     parser_classes = [MultiPartParser, FormParser, JSONParser]
 
     def get(self, request):
+        cache_key = None
+        if PostListCache.is_cacheable(request):
+            cache_key = PostListCache.key_for(request)
+            cached = PostListCache.get(cache_key)
+            if cached is not None:
+                etag, last_modified = cached["etag"], cached["last_modified"]
+                response = not_modified(request, etag=etag) or stream_list_response(request, Response(cached["body"]))
+                response["X-Cache"] = "HIT"
+                return set_validators(response, etag=etag, last_modified=last_modified)
+
         queryset = PostService.list_posts()
 
         # Apply django-filter
         filterset = PostFilter(request.query_params, queryset=queryset)
         queryset = filterset.qs
 
-        # Search
+        # Pagination — ?pagination=cursor opts into keyset paging (no COUNT/OFFSET)
+        cursor_mode = request.query_params.get("pagination") == "cursor"
+
+        # Full-text search (ranked, with highlighted snippets)
         search = request.query_params.get("search", "").strip()
         if search:
-            queryset = queryset.filter(title__icontains=search)
+            queryset = PostSearch.apply(queryset, search)
 
-        # Ordering
-        ordering = request.query_params.get("ordering", "-created_at")
+        # Ordering — search results default to relevance unless an ordering is given
+        # (keyset pages need a column to key on, so cursor mode keeps -created_at)
+        ordering = request.query_params.get("ordering")
         allowed_ordering = {
             "created_at", "-created_at", "title", "-title",
             "published_at", "-published_at",
         }
         if ordering in allowed_ordering:
             queryset = queryset.order_by(ordering)
+        elif search and not cursor_mode:
+            queryset = queryset.order_by("-search_rank", "-created_at")
+        else:
+            queryset = queryset.order_by("-created_at")
 
-        # Pagination
-        from common.pagination import StandardPagination
-
-        paginator = StandardPagination()
+        # Rows are rendered straight from values() dicts, skipping model instances
+        queryset = PostService.list_rows(queryset)
+        paginator = KeysetPagination() if cursor_mode else EstimatedCountPagination()
         page = paginator.paginate_queryset(queryset, request)
-        serializer = PostListSerializer(page, many=True, context={"request": request})
-        return paginator.get_paginated_response(serializer.data)
+
+        # Validate against the page's row versions before paying for serialization
+        etag, last_modified = _page_validators(paginator, page)
+        response = not_modified(request, etag=etag)
+        if response is None:
+            with guard_queries("PostListRowSerializer"):
+                data = PostRepresentationCache.render_many(page, PostListRowSerializer, request, kind="list")
+            response = paginator.get_paginated_response(data)
+
+            if cache_key is not None:
+                PostListCache.set(
+                    cache_key,
+                    {"body": response.data, "etag": etag, "last_modified": last_modified},
+                )
+            response = stream_list_response(request, response)
+        if cache_key is not None:
+            response["X-Cache"] = "MISS"
+        return set_validators(response, etag=etag, last_modified=last_modified)
 
     def post(self, request):
         serializer = PostDetailSerializer(data=request.data, context={"request": request})
@@ -68,6 +128,276 @@ class PostListCreateView(APIView):
         return Response(output.data, status=status.HTTP_201_CREATED)
 
 
+class PostBatchView(APIView):
+    """
+    POST /api/v1/posts/batch/  — Create, update and delete many posts at once.
+
+    Body: ``{"operations": [{"op": "create", "data": {...}},
+    {"op": "update", "id": ..., "data": {...}}, {"op": "delete", "id": ...}]}``.
+    Updates are partial. Every operation is validated (and owner-checked)
+    before anything is written; if any fails the batch is rejected with
+    per-operation errors, otherwise all writes commit together and
+    ``results`` lists each outcome in request order.
+    """
+
+    parser_classes = [JSONParser]
+    permission_classes = [IsOwner]
+
+    def post(self, request):
+        batch = PostBatchSerializer(data=request.data)
+        batch.is_valid(raise_exception=True)
+        operations = batch.validated_data["operations"]
+
+        targets = PostService.detail_queryset().in_bulk(
+            [op["id"] for op in operations if op["op"] != "create"]
+        )
+        errors = [{} for _ in operations]
+        creates, updates, deletes = [], [], []
+        for index, op in enumerate(operations):
+            if op["op"] == "create":
+                creates.append(index)
+                continue
+            post = targets.get(op["id"])
+            if post is None:
+                errors[index] = {"id": ["Post not found."]}
+            elif not all(p.has_object_permission(request, self, post) for p in self.get_permissions()):
+                errors[index] = {"id": ["You do not have permission to modify this post."]}
+            elif op["op"] == "update":
+                updates.append(index)
+            else:
+                deletes.append(index)
+
+        context = {"request": request}
+        create_serializer = PostDetailSerializer(
+            data=[operations[i]["data"] for i in creates], many=True, context=context
+        )
+        update_serializer = PostDetailSerializer(
+            [targets[operations[i]["id"]] for i in updates],
+            data=[operations[i]["data"] for i in updates],
+            many=True,
+            partial=True,
+            context=context,
+        )
+        for indexes, serializer in ((creates, create_serializer), (updates, update_serializer)):
+            if indexes and not serializer.is_valid():
+                for index, item_errors in zip(indexes, serializer.errors):
+                    errors[index] = item_errors or errors[index]
+        if any(errors):
+            raise ValidationError({"operations": errors})
+
+        created, updated = PostService.apply_batch(
+            author=request.user,
+            creates=create_serializer.validated_data if creates else [],
+            updates=list(zip(update_serializer.instance, update_serializer.validated_data)) if updates else [],
+            deletes=[targets[operations[i]["id"]] for i in deletes],
+        )
+
+        results = [None] * len(operations)
+        written = ((creates, created, status.HTTP_201_CREATED), (updates, updated, status.HTTP_200_OK))
+        for indexes, posts, code in written:
+            for index, data in zip(indexes, PostDetailSerializer(posts, many=True, context=context).data):
+                results[index] = {"op": operations[index]["op"], "status": code, "id": data["id"], "data": data}
+        for index in deletes:
+            results[index] = {"op": "delete", "status": status.HTTP_204_NO_CONTENT, "id": str(operations[index]["id"])}
+        return Response({"results": results})
+
+
+class UploadCreateView(APIView):
+    """
+    POST /api/v1/uploads/  — Start a resumable chunked upload.
+
+    Body: ``{"filename", "content_type", "size"}``. The bytes then follow as
+    chunks (see ``UploadDetailView``); once complete the upload is attached
+    to a post by sending its id as ``thumbnail_upload``.
+    """
+
+    parser_classes = [JSONParser]
+    permission_classes = [IsOwner]
+
+    def post(self, request):
+        serializer = ChunkedUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = ChunkedUploads.start(author=request.user, **serializer.validated_data)
+        return Response(ChunkedUploadSerializer(upload).data, status=status.HTTP_201_CREATED)
+
+
+class UploadDetailView(APIView):
+    """
+    GET    /api/v1/uploads/{id}/  — Upload status; ``offset`` is where to resume.
+    PATCH  /api/v1/uploads/{id}/  — Append the raw request body as the chunk starting at ``Upload-Offset``.
+    DELETE /api/v1/uploads/{id}/  — Abandon the upload.
+
+    A chunk is streamed to storage as it is read and never parsed, so its
+    size is bounded by ``MAX_UPLOAD_CHUNK_SIZE_MB`` rather than by memory.
+    """
+
+    permission_classes = [IsOwner]
+
+    def _get_upload(self, request, pk):
+        upload = get_object_or_404(ChunkedUpload, pk=pk)
+        self.check_object_permissions(request, upload)
+        return upload
+
+    def get(self, request, pk):
+        return Response(ChunkedUploadSerializer(self._get_upload(request, pk)).data)
+
+    def patch(self, request, pk):
+        upload = self._get_upload(request, pk)
+        try:
+            offset = int(request.headers["Upload-Offset"])
+        except (KeyError, ValueError):
+            raise ValidationError({"Upload-Offset": ["A chunk needs its byte offset in the Upload-Offset header."]})
+        # request.stream is the unparsed body (None when empty); request.data is never touched
+        upload = ChunkedUploads.append(upload, offset, request.stream)
+        return Response(ChunkedUploadSerializer(upload).data)
+
+    def delete(self, request, pk):
+        ChunkedUploads.abort(self._get_upload(request, pk))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class UploadCompleteView(UploadDetailView):
+    """POST /api/v1/uploads/{id}/complete/  — Join the received chunks; every byte must have arrived."""
+
+    http_method_names = ["post", "options"]
+
+    def post(self, request, pk):
+        upload = ChunkedUploads.complete(self._get_upload(request, pk))
+        return Response(ChunkedUploadSerializer(upload).data)
+
+
+class PostExportView(APIView):
+    """
+    GET /api/v1/posts/export/?format=ndjson|csv  — Stream every post matching the list filters.
+
+    One query over a server-side cursor: constant memory, one consistent
+    snapshot, no OFFSET paging. ``Accept: text/csv`` works as well as ``?format=``.
+    """
+
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+
+    def get(self, request):
+        filterset = PostFilter(request.query_params)
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.iter_render(PostExport.records(filterset.qs)),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        filename = f"posts-{timezone.now():%Y%m%dT%H%M%SZ}.{renderer.format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class PostFacetsView(APIView):
+    """
+    GET /api/v1/posts/facets/?status=&category=&author=  — Post counts per status and per category.
+
+    Read from the incrementally maintained facet counts, never by grouping
+    posts. Each facet applies every filter but its own, so picking a status
+    still shows the counts of the other statuses.
+    """
+
+    def get(self, request):
+        params = PostFacetQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        return Response(PostFacets.counts(**params.validated_data))
+
+
+class PostFeedView(View):
+    """
+    GET /api/v1/posts/feeds/{rss|atom}/             — Feed of the newest published posts.
+    GET /api/v1/posts/feeds/{rss|atom}/{category}/  — Same, for one category (case-insensitive).
+
+    Public and served from bytes precomputed by ``PostFeeds`` (gzip variant
+    included), with ETag / Last-Modified so polling readers mostly get 304s.
+    A plain Django view: feed readers send ``Accept`` headers DRF's content
+    negotiation would reject.
+    """
+
+    kind = None
+    accepts_gzip = re.compile(r"\bgzip\b")
+
+    def get(self, request, category=None):
+        entry = PostFeeds.get(self.kind, category)
+        if entry is None:
+            raise Http404("No published posts in this category.")
+
+        compressed = bool(self.accepts_gzip.search(request.META.get("HTTP_ACCEPT_ENCODING", "")))
+        etag = entry["gzip_etag"] if compressed else entry["etag"]
+        response = not_modified(request, etag=etag, last_modified=entry["last_modified"])
+        if response is None:
+            response = HttpResponse(entry["gzip"] if compressed else entry["body"], content_type=entry["content_type"])
+            if compressed:
+                response["Content-Encoding"] = "gzip"
+        patch_vary_headers(response, ("Accept-Encoding",))
+        # Cacheable anywhere, but revalidated on every use
+        patch_cache_control(response, public=True, no_cache=True)
+        return set_validators(response, etag=etag, last_modified=entry["last_modified"])
+
+
+class SitemapIndexView(View):
+    """
+    GET /sitemap.xml  — Sitemap index listing one shard per publication month.
+
+    Rendered from the manifest ``PostSitemap`` keeps next to the shard files;
+    the shards are brought up to date out of band (``build_sitemap --watch``).
+    """
+
+    def get(self, request):
+        manifest = PostSitemap.manifest()
+        shards = manifest["shards"]
+        urls = [PostSitemap.shard_url(shard["name"]) for shard in shards]
+        etag = make_etag(*urls, *(shard["checksum"] for shard in shards))
+        response = not_modified(request, etag=etag)
+        if response is None:
+            response = HttpResponse(PostSitemap.render_index(urls, shards), content_type="application/xml")
+        patch_cache_control(response, public=True, no_cache=True)
+        return set_validators(response, etag=etag)
+
+
+class SitemapShardView(View):
+    """
+    GET /sitemap-{yyyy-mm}.xml  — One month of published post URLs (``-{n}`` parts past 50,000), served from disk.
+    """
+
+    def get(self, request, shard):
+        entry = next((entry for entry in PostSitemap.manifest()["shards"] if entry["name"] == shard), None)
+        if entry is None:
+            raise Http404("No such sitemap.")
+        etag = make_etag(entry["checksum"], settings.PUBLIC_SITE_URL)
+        last_modified = datetime.fromisoformat(entry["built_at"])
+        response = not_modified(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            try:
+                response = FileResponse(open(PostSitemap.shard_path(shard), "rb"), content_type="application/xml")
+            except FileNotFoundError:
+                raise Http404("No such sitemap.")
+        patch_cache_control(response, public=True, no_cache=True)
+        return set_validators(response, etag=etag, last_modified=last_modified)
+
+
+class PostAutocompleteView(APIView):
+    """
+    GET /api/v1/posts/autocomplete/?q=<text>&limit=<n>  — Typo-tolerant title/category suggestions.
+    """
+
+    def get(self, request):
+        term = request.query_params.get("q", "").strip()
+        if len(term) < AUTOCOMPLETE_MIN_LENGTH:
+            return Response({"results": []})
+
+        try:
+            limit = int(request.query_params.get("limit", AUTOCOMPLETE_DEFAULT_LIMIT))
+        except ValueError:
+            limit = AUTOCOMPLETE_DEFAULT_LIMIT
+        limit = max(1, min(limit, AUTOCOMPLETE_MAX_LIMIT))
+
+        return Response({"results": PostSearch.autocomplete(term, limit)})
+
+
 class PostDetailView(APIView):
     """
     GET    /api/v1/posts/{id}/  — Retrieve a single post.
@@ -84,37 +414,110 @@ class PostDetailView(APIView):
         return [permissions.IsAuthenticated()]
 
     def _get_post(self, pk):
-        return get_object_or_404(Post, pk=pk)
+        return get_object_or_404(PostService.detail_queryset(), pk=pk)
+
+    def _get_writable_post(self, request, pk):
+        """
+        Load the post for a write after permission and ``If-Match`` checks;
+        returns the post and the ``updated_at`` the header was validated
+        against (``None`` without one).
+
+        With ``If-Match`` the version is checked against a single-row
+        (id, author, updated_at) lookup, so stale writes are rejected
+        without loading the post body. The service checks that version
+        again under a row lock before writing, which catches a write that
+        lands in between.
+        """
+        expected_updated_at = None
+        if has_conditional_headers(request, "If-Match"):
+            version = get_object_or_404(PostService.version_queryset(), pk=pk)
+            self.check_object_permissions(request, version)
+            check_if_match(request, _post_validators(version)[0])
+            expected_updated_at = version.updated_at
+        post = self._get_post(pk)
+        self.check_object_permissions(request, post)
+        return post, expected_updated_at
 
     def get(self, request, pk):
+        if has_conditional_headers(request, "If-None-Match", "If-Modified-Since"):
+            version = get_object_or_404(PostService.version_queryset(), pk=pk)
+            etag, last_modified = _post_validators(version)
+            response = not_modified(request, etag=etag, last_modified=last_modified)
+            if response is not None:
+                return response
+
         post = self._get_post(pk)
-        serializer = PostDetailSerializer(post, context={"request": request})
-        return Response(serializer.data)
+        data = PostRepresentationCache.render(post, PostDetailSerializer, request, kind="detail")
+        etag, last_modified = _post_validators(post)
+        return set_validators(Response(data), etag=etag, last_modified=last_modified)
 
     def put(self, request, pk):
-        post = self._get_post(pk)
-        self.check_object_permissions(request, post)
+        post, expected_updated_at = self._get_writable_post(request, pk)
         serializer = PostDetailSerializer(
             post, data=request.data, context={"request": request}
         )
         serializer.is_valid(raise_exception=True)
-        updated = PostService.update_post(post, data=serializer.validated_data)
+        updated = PostService.update_post(
+            post, data=serializer.validated_data, expected_updated_at=expected_updated_at
+        )
         output = PostDetailSerializer(updated, context={"request": request})
-        return Response(output.data)
+        etag, last_modified = _post_validators(updated)
+        return set_validators(Response(output.data), etag=etag, last_modified=last_modified)
 
     def patch(self, request, pk):
-        post = self._get_post(pk)
-        self.check_object_permissions(request, post)
+        post, expected_updated_at = self._get_writable_post(request, pk)
         serializer = PostDetailSerializer(
             post, data=request.data, partial=True, context={"request": request}
         )
         serializer.is_valid(raise_exception=True)
-        updated = PostService.update_post(post, data=serializer.validated_data)
+        updated = PostService.update_post(
+            post, data=serializer.validated_data, expected_updated_at=expected_updated_at
+        )
         output = PostDetailSerializer(updated, context={"request": request})
-        return Response(output.data)
+        etag, last_modified = _post_validators(updated)
+        return set_validators(Response(output.data), etag=etag, last_modified=last_modified)
 
     def delete(self, request, pk):
-        post = self._get_post(pk)
-        self.check_object_permissions(request, post)
-        PostService.delete_post(post)
+        post, expected_updated_at = self._get_writable_post(request, pk)
+        PostService.delete_post(post, expected_updated_at=expected_updated_at)
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class PostBySlugView(PostDetailView):
+    """
+    GET /api/v1/posts/by-slug/{slug}/  — Retrieve a single post by its slug.
+
+    The slug is resolved to an id through ``PostSlugCache`` (misses included),
+    then served exactly like the detail endpoint.
+    """
+
+    http_method_names = ["get", "head", "options"]
+
+    def get(self, request, slug):
+        post_id = PostService.resolve_slug(slug)
+        if post_id is None:
+            raise NotFound()
+        try:
+            return super().get(request, pk=post_id)
+        except Http404:
+            # The cached id outlived its post (deleted outside PostService)
+            PostSlugCache.evict(slug)
+            raise
+
+
+def _post_validators(post):
+    """Strong ETag and Last-Modified for a single post, from ``updated_at`` alone."""
+    return make_etag("post", post.pk, post.updated_at.isoformat()), post.updated_at
+
+
+def _page_validators(paginator, page):
+    """
+    ETag and Last-Modified for a list page, from each row's ``updated_at`` plus
+    the pagination envelope (count and links), without serializing any row.
+    """
+    envelope = paginator.get_paginated_response([]).data
+    envelope.pop("results")
+    versions = [(row["id"], row["updated_at"].isoformat()) for row in page]
+    etag = make_etag("posts", sorted(envelope.items()), versions)
+    last_modified = max((row["updated_at"] for row in page), default=None)
+    return etag, last_modified
@@ -0,0 +1,15 @@
+"""
+Standalone micro-benchmarks, run from ``backend/`` with ``python -m benchmarks.<name>``.
+
+Each script configures Django itself (``config.settings.development`` unless
+``DJANGO_SETTINGS_MODULE`` is set) and prints its timings; none of them are
+collected by pytest.
+"""
+import os
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.development")
+    import django
+
+    django.setup()
@@ -0,0 +1,84 @@
+"""
+Measure post export throughput (rows/sec) against the configured database.
+
+Compares the streaming export (one server-side cursor, NDJSON and CSV) with
+paging through the list query 100 rows at a time, as sync jobs used to.
+``--seed`` inserts throwaway posts first and removes them afterwards.
+
+    python -m benchmarks.export_throughput [--seed 50000] [--page-size 100]
+"""
+import argparse
+import time
+
+from benchmarks import setup_django
+
+SEED_CATEGORY = "benchmark-export"
+
+
+def seed(count):
+    from apps.accounts.models import User
+    from apps.posts.models import Post
+    from apps.posts.services import PostService
+
+    author, _ = User.objects.get_or_create(email="benchmark@example.com", defaults={"role": "author"})
+    body = "Benchmark body text for export throughput runs. " * 40
+    for start in range(0, count, 5000):
+        items = [
+            {"title": f"Export benchmark {i}", "content": body, "category": SEED_CATEGORY, "author": author}
+            for i in range(start, min(start + 5000, count))
+        ]
+        Post.objects.bulk_create(PostService.build_posts(items))
+
+
+def timed(label, func):
+    started = time.perf_counter()
+    rows = func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {rows:>9,} rows  {elapsed:7.2f}s  {rows / elapsed:12,.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seed", type=int, default=0, help="Insert this many throwaway posts first.")
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+    from apps.posts.export import PostExport
+    from apps.posts.models import Post
+    from apps.posts.serializers import PostListRowSerializer
+    from apps.posts.services import PostService
+    from common.renderers import CSVRenderer, NDJSONRenderer, dumps
+
+    if args.seed:
+        seed(args.seed)
+    try:
+        def export(renderer):
+            def run():
+                count = 0
+                for chunk in renderer.iter_render(PostExport.records()):
+                    count += chunk.count(b"\n")
+                return count if isinstance(renderer, NDJSONRenderer) else count - 1
+            return run
+
+        def offset_pages():
+            queryset = PostService.list_rows(PostService.list_posts().order_by("-created_at"))
+            rows, offset = 0, 0
+            while True:
+                page = list(queryset[offset : offset + args.page_size])
+                if not page:
+                    return rows
+                dumps({"results": PostListRowSerializer(page, many=True).data})
+                rows += len(page)
+                offset += args.page_size
+
+        timed("export NDJSON (cursor)", export(NDJSONRenderer()))
+        timed("export CSV (cursor)", export(CSVRenderer()))
+        timed(f"list pages of {args.page_size} (OFFSET)", offset_pages)
+    finally:
+        if args.seed:
+            Post.objects.filter(category=SEED_CATEGORY).delete()
+
+
+if __name__ == "__main__":
+    main()
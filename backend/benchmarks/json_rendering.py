@@ -0,0 +1,53 @@
+"""
+Compare DRF's ``JSONRenderer`` with ``FastJSONRenderer`` on list-page output.
+
+Renders the body ``PostListCreateView`` returns for one page (envelope plus
+``PostListRowSerializer`` results), built in memory, buffered and streamed.
+
+    python -m benchmarks.json_rendering [--rows 100] [--repeat 200]
+"""
+import argparse
+import timeit
+
+from benchmarks import setup_django
+from benchmarks.list_rendering import build_page
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+
+    from apps.posts.serializers import PostListRowSerializer
+    from common.renderers import FastJSONRenderer
+
+    _, rows = build_page(args.rows)
+    body = {
+        "count": 12345,
+        "count_is_approximate": True,
+        "next": "http://testserver/api/v1/posts/?page=2",
+        "previous": None,
+        "results": PostListRowSerializer(rows, many=True).data,
+    }
+    stdlib, fast = JSONRenderer(), FastJSONRenderer()
+    assert fast.render(body) == b"".join(fast.iter_render(body))
+
+    cases = (
+        ("JSONRenderer", lambda: stdlib.render(body)),
+        ("FastJSONRenderer", lambda: fast.render(body)),
+        ("FastJSONRenderer stream", lambda: b"".join(fast.iter_render(body))),
+    )
+    baseline = None
+    for label, func in cases:
+        best = min(timeit.repeat(func, number=args.repeat, repeat=5)) / args.repeat
+        baseline = baseline or best
+        print(f"{label:<24} {best * 1000:8.3f} ms/page  {baseline / best:5.1f}x")
+    print(f"body size: {len(fast.render(body)):,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Record EXPLAIN ANALYZE timings of the list endpoint's page query per filter/order combination.
+
+Seeds a large throwaway post table with generate_series (varied statuses,
+categories, authors and dates), ANALYZEs it, then runs the list view's
+first-page query for every supported filter and ``ordering`` combination and
+prints execution time, the indexes read and whether a sort was needed. The
+seeded rows are removed afterwards unless ``--keep`` is given.
+
+Save a run with ``--output`` and pass it back later as ``--baseline`` to flag
+combinations that got more than ``--threshold`` times slower.
+
+    python -m benchmarks.list_query_plans [--rows 200000] [--output plans.json] [--baseline plans.json]
+"""
+import argparse
+import json
+from datetime import timedelta
+
+from benchmarks import setup_django
+
+SEED_SLUG_PREFIX = "plan-benchmark-"
+SEED_EMAIL = "plan-benchmark-{}@example.com"
+AUTHORS = 20
+CATEGORIES = 25
+ORDERINGS = ("-created_at", "created_at", "-published_at", "published_at", "-title", "title")
+
+
+def seed(rows):
+    from django.db import connection
+
+    from apps.accounts.models import User
+    from apps.posts.models import Post
+
+    authors = [
+        str(User.objects.get_or_create(email=SEED_EMAIL.format(n), defaults={"role": "author"})[0].id)
+        for n in range(AUTHORS)
+    ]
+    table = connection.ops.quote_name(Post._meta.db_table)
+    # One post every ~8 minutes going back from now; 1 in 5 is a draft. Author
+    # and category come from hashes so they don't correlate with the status
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (
+                id, created_at, updated_at, author_id, title, slug, content, excerpt,
+                category, thumbnail, image_url, status, published_at
+            )
+            SELECT
+                gen_random_uuid(), ts, ts, (%s::uuid[])[1 + abs(hashint4(i)) %% %s],
+                'Plan benchmark post ' || i, %s || i, 'Benchmark body ' || i, '',
+                'Category ' || abs(hashint8(i)) %% %s, NULL, '/fintrellis.gif',
+                CASE WHEN i %% 5 = 0 THEN 'draft' ELSE 'published' END,
+                CASE WHEN i %% 5 = 0 THEN NULL ELSE ts END
+            FROM (
+                SELECT i, now() - i * interval '8 minutes' AS ts FROM generate_series(1, %s) AS i
+            ) AS seeded
+            """,
+            [authors, AUTHORS, SEED_SLUG_PREFIX, CATEGORIES, rows],
+        )
+        cursor.execute(f"ANALYZE {table}")
+    return authors
+
+
+def cleanup():
+    from django.db import connection
+
+    from apps.accounts.models import User
+    from apps.posts.models import Post
+
+    Post.objects.filter(slug__startswith=SEED_SLUG_PREFIX).delete()
+    User.objects.filter(email__in=[SEED_EMAIL.format(n) for n in range(AUTHORS)]).delete()
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {connection.ops.quote_name(Post._meta.db_table)}")
+
+
+def filter_sets(author_id):
+    from django.utils import timezone
+
+    month_ago = (timezone.now() - timedelta(days=30)).isoformat()
+    year_ago = (timezone.now() - timedelta(days=365)).isoformat()
+    return {
+        "none": {},
+        "status=published": {"status": "published"},
+        "status=draft": {"status": "draft"},
+        "category": {"category": "category 7"},
+        "author": {"author": author_id},
+        "created_after": {"created_after": month_ago},
+        "created_range": {"created_after": year_ago, "created_before": month_ago},
+        "status+category": {"status": "published", "category": "category 7"},
+        "status+author": {"status": "published", "author": author_id},
+        "status+created_after": {"status": "published", "created_after": month_ago},
+        "category+created_after": {"category": "category 7", "created_after": month_ago},
+    }
+
+
+def page_query(params, ordering, page_size):
+    """Build the list view's first offset page for ``params`` and ``ordering``."""
+    from apps.posts.filters import PostFilter
+    from apps.posts.services import PostService
+
+    queryset = PostFilter(params, queryset=PostService.list_posts()).qs.order_by(ordering)
+    return PostService.list_rows(queryset)[:page_size]
+
+
+def plan_summary(node, indexes=None, sorts=None):
+    """Collect index names and sort nodes from an EXPLAIN (FORMAT JSON) plan tree."""
+    indexes = [] if indexes is None else indexes
+    sorts = [] if sorts is None else sorts
+    if "Index Name" in node:
+        indexes.append(node["Index Name"])
+    elif node["Node Type"] == "Seq Scan":
+        indexes.append("seq scan")
+    if "Sort" in node["Node Type"]:
+        sorts.append(node["Node Type"])
+    for child in node.get("Plans", ()):
+        plan_summary(child, indexes, sorts)
+    return indexes, sorts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000, help="Throwaway posts to seed (0 to use existing rows).")
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--keep", action="store_true", help="Leave the seeded rows in place.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="Compare against results saved with --output.")
+    parser.add_argument("--threshold", type=float, default=2.0, help="Slowdown ratio reported as a regression.")
+    args = parser.parse_args()
+
+    setup_django()
+    from apps.posts.models import Post
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = {(row["filters"], row["ordering"]): row for row in json.load(handle)}
+
+    authors = seed(args.rows) if args.rows else []
+    try:
+        author_id = authors[0] if authors else str(Post.objects.values_list("author_id", flat=True).first())
+        results, regressions = [], 0
+        print(f"{'filters':<24} {'ordering':<14} {'exec ms':>9}  {'sort':<5} indexes")
+        for name, params in filter_sets(author_id).items():
+            for ordering in ORDERINGS:
+                plan = json.loads(page_query(params, ordering, args.page_size).explain(format="json", analyze=True))
+                indexes, sorts = plan_summary(plan[0]["Plan"])
+                row = {
+                    "filters": name,
+                    "ordering": ordering,
+                    "execution_ms": plan[0]["Execution Time"],
+                    "planning_ms": plan[0]["Planning Time"],
+                    "indexes": indexes,
+                    "sorted": bool(sorts),
+                }
+                results.append(row)
+
+                note = ""
+                previous = baseline.get((name, ordering))
+                if previous:
+                    ratio = row["execution_ms"] / max(previous["execution_ms"], 1e-3)
+                    note = f"  x{ratio:.2f} vs baseline"
+                    if ratio > args.threshold:
+                        regressions += 1
+                        note += "  REGRESSION"
+                print(
+                    f"{name:<24} {ordering:<14} {row['execution_ms']:9.2f}  {'yes' if sorts else 'no':<5} "
+                    f"{', '.join(dict.fromkeys(indexes))}{note}"
+                )
+    finally:
+        if args.rows and not args.keep:
+            cleanup()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+    if args.baseline:
+        print(f"{regressions} regressions (> x{args.threshold:g}) against {args.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
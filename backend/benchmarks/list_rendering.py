@@ -0,0 +1,103 @@
+"""
+Compare ``PostListSerializer`` with ``PostListRowSerializer`` on a list page.
+
+Rendering only: rows are built in memory (no database), so the numbers
+isolate serializer + JSON cost per page.
+
+    python -m benchmarks.list_rendering [--rows 100] [--repeat 200]
+"""
+import argparse
+import timeit
+import uuid
+from datetime import timedelta
+
+from benchmarks import setup_django
+
+
+def build_page(size):
+    from django.utils import timezone
+
+    from apps.accounts.models import User
+    from apps.posts.models import Post
+
+    author = User(id=uuid.uuid4(), email="bench@example.com")
+    now = timezone.now()
+    posts = []
+    for i in range(size):
+        post = Post(
+            id=uuid.uuid4(),
+            author=author,
+            title=f"Benchmark post {i}",
+            slug=f"benchmark-post-{i}",
+            excerpt="A short excerpt that stands in for real list text. " * 2,
+            category="engineering",
+            thumbnail=f"thumbnails/2024/01/{i}.webp" if i % 2 else "",
+            image_url="",
+            status=Post.Status.PUBLISHED,
+            published_at=now - timedelta(hours=i),
+            created_at=now - timedelta(hours=i),
+            updated_at=now - timedelta(minutes=i),
+        )
+        posts.append(post)
+
+    # The same page as PostService.list_rows() would return it
+    rows = [
+        {
+            "id": post.id,
+            "author": post.author_id,
+            "author__email": post.author.email,
+            "title": post.title,
+            "slug": post.slug,
+            "excerpt": post.excerpt,
+            "category": post.category,
+            "thumbnail": post.thumbnail.name,
+            "thumbnail_renditions": post.thumbnail_renditions,
+            "thumbnail_status": post.thumbnail_status,
+            "thumbnail_width": post.thumbnail_width,
+            "thumbnail_height": post.thumbnail_height,
+            "thumbnail_bytes": post.thumbnail_bytes,
+            "thumbnail_format": post.thumbnail_format,
+            "thumbnail_placeholder": post.thumbnail_placeholder,
+            "image_url": post.image_url,
+            "status": post.status,
+            "published_at": post.published_at,
+            "created_at": post.created_at,
+            "updated_at": post.updated_at,
+        }
+        for post in posts
+    ]
+    return posts, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+
+    from apps.posts.serializers import PostListRowSerializer, PostListSerializer
+
+    posts, rows = build_page(args.rows)
+    renderer = JSONRenderer()
+
+    def slow():
+        return renderer.render(PostListSerializer(posts, many=True).data)
+
+    def fast():
+        return renderer.render(PostListRowSerializer(rows, many=True).data)
+
+    assert slow() == fast(), "fast path output differs from PostListSerializer"
+
+    results = {}
+    for label, func in (("PostListSerializer", slow), ("PostListRowSerializer", fast)):
+        best = min(timeit.repeat(func, number=args.repeat, repeat=5)) / args.repeat
+        results[label] = best
+        print(f"{label:<24} {best * 1000:8.3f} ms/page  {args.rows / best:12,.0f} rows/s")
+    print(f"speedup: {results['PostListSerializer'] / results['PostListRowSerializer']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
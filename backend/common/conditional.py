@@ -0,0 +1,53 @@
+"""
+Helpers for HTTP conditional requests (ETag / Last-Modified / 304 / 412).
+
+Validators are computed from cheap inputs such as ``updated_at`` so a request
+can be answered or rejected before anything is serialized.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags
+
+from .exceptions import PreconditionFailed
+
+
+def make_etag(*parts):
+    """Build a strong ETag from the given version-identifying parts."""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def set_validators(response, *, etag, last_modified=None):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
+
+
+def not_modified(request, *, etag, last_modified=None):
+    """
+    Return a 304 response when ``If-None-Match`` / ``If-Modified-Since`` show
+    the client's copy is current, otherwise ``None``. Pass ``last_modified``
+    only when it moves on every change (deletions included).
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None or response.status_code != 304:
+        return None
+    return set_validators(response, etag=etag, last_modified=last_modified)
+
+
+def check_if_match(request, etag):
+    """Raise ``PreconditionFailed`` if ``If-Match`` is sent and names another version."""
+    header = request.META.get("HTTP_IF_MATCH")
+    if header is None:
+        return
+    etags = parse_etags(header)
+    if "*" in etags or etag in etags:
+        return
+    raise PreconditionFailed()
+
+
+def has_conditional_headers(request, *names):
+    return any(f"HTTP_{name.upper().replace('-', '_')}" in request.META for name in names)
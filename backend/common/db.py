@@ -0,0 +1,40 @@
+import logging
+from collections.abc import Mapping
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+def row_value(row, name):
+    """Read ``name`` from either a model instance or a ``values()`` row."""
+    if isinstance(row, Mapping):
+        return row[name]
+    return getattr(row, name)
+
+
+class UnexpectedQueryError(RuntimeError):
+    """Raised when SQL runs inside a block that must not touch the database."""
+
+
+@contextmanager
+def guard_queries(label):
+    """
+    Flag any SQL executed inside the block.
+
+    Wrap serialization of already-fetched rows with this: a query there means a
+    deferred column or an un-joined relation is being loaded once per row.
+    Raises ``UnexpectedQueryError`` when ``settings.QUERY_GUARD_STRICT`` is on
+    (development and tests), otherwise logs a warning and lets the query run.
+    """
+
+    def guard(execute, sql, params, many, context):
+        if getattr(settings, "QUERY_GUARD_STRICT", False):
+            raise UnexpectedQueryError(f"{label}: unexpected query: {sql}")
+        logger.warning("%s: unexpected query: %s", label, sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(guard):
+        yield
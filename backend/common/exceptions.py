@@ -11,6 +11,7 @@ def _get_error_code(exc):
         "AuthenticationFailed": "AUTHENTICATION_FAILED",
         "MethodNotAllowed": "METHOD_NOT_ALLOWED",
         "Throttled": "THROTTLED",
+        "PreconditionFailed": "PRECONDITION_FAILED",
     }
     return code_map.get(exc.__class__.__name__, "SERVER_ERROR")
 
@@ -51,3 +52,11 @@ class ServiceError(APIException):
     status_code = 400
     default_detail = "A business rule was violated."
     default_code = "service_error"
+
+
+class PreconditionFailed(APIException):
+    """Raised when an ``If-Match`` precondition does not hold (stale write)."""
+
+    status_code = 412
+    default_detail = "The resource has been modified since it was fetched."
+    default_code = "precondition_failed"
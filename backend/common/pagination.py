@@ -1,7 +1,326 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import json
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .db import row_value
 
 
 class StandardPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
+
+
+def estimate_count(queryset):
+    """Return the PostgreSQL planner's row estimate for ``queryset`` (no rows are read)."""
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def estimate_table_rows(model, using="default"):
+    """
+    Return the row count PostgreSQL keeps for ``model``'s table in
+    ``pg_class.reltuples`` (0 before its first ANALYZE), cached for
+    ``settings.PAGINATION_TABLE_ROWS_CACHE_TIMEOUT`` seconds.
+    """
+    table = model._meta.db_table
+    key = f"pagination:table-rows:{using}:{table}"
+    rows = cache.get(key)
+    if rows is None:
+        connection = connections[using]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [connection.ops.quote_name(table)]
+            )
+            rows = max(int(cursor.fetchone()[0]), 0)
+        cache.set(key, rows, settings.PAGINATION_TABLE_ROWS_CACHE_TIMEOUT)
+    return rows
+
+
+class EstimatedCountPage(Page):
+    def __init__(self, object_list, number, paginator, has_more):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self):
+        return self.has_more
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that trusts the planner's row estimate once it exceeds
+    ``threshold`` and only runs an exact ``COUNT(*)`` below it.
+
+    No filtered result can outgrow its table, so while the table itself
+    holds fewer rows than ``threshold`` (see ``estimate_table_rows``) the
+    ``EXPLAIN`` is skipped and the count is always exact.
+
+    With an estimated count, page bounds are not validated against it; each
+    page fetches one extra row to decide whether a next page exists, and the
+    count is corrected whenever a page proves it wrong.
+    """
+
+    def __init__(self, object_list, per_page, *args, threshold, **kwargs):
+        super().__init__(object_list, per_page, *args, **kwargs)
+        self.threshold = threshold
+
+    @cached_property
+    def count_is_approximate(self):
+        if self.threshold > 0:
+            table_rows = estimate_table_rows(self.object_list.model, self.object_list.db)
+            if table_rows < self.threshold:
+                return False
+        return self._estimate >= self.threshold
+
+    @cached_property
+    def _estimate(self):
+        return estimate_count(self.object_list)
+
+    @cached_property
+    def count(self):
+        if self.count_is_approximate:
+            return self._estimate
+        return super().count
+
+    def validate_number(self, number):
+        if not self.count_is_approximate:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+        return number
+
+    def page(self, number):
+        if not self.count_is_approximate:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if not rows and number > 1:
+            raise EmptyPage("That page contains no results")
+
+        # Observed rows pin the count down: exact on the last page, a floor otherwise
+        seen = bottom + len(rows)
+        if not has_more:
+            self.count = seen
+        elif self.count <= seen:
+            self.count = seen + 1
+        self.__dict__.pop("num_pages", None)
+        return EstimatedCountPage(rows, number, self, has_more)
+
+
+class EstimatedCountPagination(StandardPagination):
+    """
+    Page-number pagination that avoids ``COUNT(*)`` on large result sets.
+
+    Responses carry ``count_is_approximate`` so clients know whether ``count``
+    (and therefore the number of pages) is exact. The switch-over point comes
+    from ``settings.PAGINATION_ESTIMATE_THRESHOLD``.
+    """
+
+    def django_paginator_class(self, object_list, per_page):
+        return EstimatedCountPaginator(
+            object_list, per_page, threshold=settings.PAGINATION_ESTIMATE_THRESHOLD
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            "count": self.page.paginator.count,
+            "count_is_approximate": self.page.paginator.count_is_approximate,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_is_approximate"] = {"type": "boolean", "example": False}
+        return response_schema
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on the queryset's ordering field plus ``pk``.
+
+    Each page is fetched with a ``WHERE (field, pk) < (last_field, last_pk)``
+    style predicate instead of ``OFFSET``, and no ``COUNT(*)`` is issued, so
+    deep pages cost the same as the first one. Cursors are opaque base64
+    tokens carrying the boundary row's ordering value and primary key.
+
+    The predicate leads with a plain bound on the field (``field <= last``)
+    so that, with a ``(field, pk)`` index, the page is one ordered index
+    range read that stops after ``page_size + 1`` rows. Nullable ordering
+    fields sort NULLs last in both directions; the non-NULL and NULL rows
+    are read as separate ranges, the second only when the first runs out
+    mid-page.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.field_name, self.descending = self.get_ordering(queryset)
+        self.field = queryset.model._meta.get_field(self.field_name)
+
+        cursor = self.decode_cursor(request)
+        self.reverse = bool(cursor and cursor["reverse"])
+
+        queryset = queryset.order_by(*self._order_by(reverse=self.reverse))
+
+        results = []
+        for segment in self._segments(cursor):
+            results += queryset.filter(segment)[: self.page_size + 1 - len(results)]
+            if len(results) > self.page_size:
+                break
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+
+        if self.reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        """Return ``(field_name, descending)`` for the queryset's primary ordering."""
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        if not ordering or not isinstance(ordering[0], str):
+            return queryset.model._meta.pk.name, True
+        first = ordering[0]
+        return first.lstrip("-"), first.startswith("-")
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self._link(self.page[0], reverse=True)
+
+    def encode_cursor(self, obj, *, reverse):
+        # Pages may hold model instances or values() rows
+        value = row_value(obj, self.field.name if isinstance(obj, Mapping) else self.field.attname)
+        if value is not None:
+            value = value.isoformat() if hasattr(value, "isoformat") else str(value)
+        payload = {
+            "v": value,
+            "pk": str(row_value(obj, self.field.model._meta.pk.name)),
+            "r": int(reverse),
+        }
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            payload = json.loads(raw)
+            value = payload["v"]
+            return {
+                "value": None if value is None else self.field.to_python(value),
+                "pk": self.field.model._meta.pk.to_python(payload["pk"]),
+                "reverse": bool(payload.get("r")),
+            }
+        except (binascii.Error, ValueError, TypeError, KeyError, ValidationError, FieldDoesNotExist):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _link(self, obj, *, reverse):
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.encode_cursor(obj, reverse=reverse)
+        )
+
+    def _order_by(self, *, reverse):
+        # Each segment holds only NULL or only non-NULL values, so no NULLS
+        # FIRST/LAST is needed and a plain (field, pk) index matches either way
+        if self.descending != reverse:
+            return [F(self.field_name).desc(), F("pk").desc()]
+        return [F(self.field_name).asc(), F("pk").asc()]
+
+    def _segments(self, cursor):
+        """
+        Predicates selecting the rows after the cursor (or from the start),
+        in the order this request travels: the non-NULL rows, then the NULL
+        rows, NULLs being last in the forward ordering.
+        """
+        name = self.field_name
+        if cursor is None:
+            if not self.field.null:
+                return [Q()]
+            return [Q(**{f"{name}__isnull": False}), Q(**{f"{name}__isnull": True})]
+
+        value, pk = cursor["value"], cursor["pk"]
+        # "after" in the direction of travel for this request
+        after = "lt" if self.descending != cursor["reverse"] else "gt"
+        if value is None:
+            nulls = Q(**{f"{name}__isnull": True, f"pk__{after}": pk})
+            # Travelling backwards from the NULLs reaches the non-NULL rows next
+            return [nulls, Q(**{f"{name}__isnull": False})] if cursor["reverse"] else [nulls]
+
+        # The redundant bound is what an index range can start from; the OR alone is not
+        position = Q(**{f"{name}__{after}e": value}) & (
+            Q(**{f"{name}__{after}": value}) | Q(**{name: value, f"pk__{after}": pk})
+        )
+        if self.field.null and not cursor["reverse"]:
+            return [position, Q(**{f"{name}__isnull": True})]
+        return [position]
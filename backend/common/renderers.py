@@ -0,0 +1,171 @@
+"""
+Renderers backed by ``orjson``, plus record-stream renderers for exports.
+
+``FastJSONRenderer`` is a drop-in for DRF's ``JSONRenderer``: same media type,
+compact UTF-8 output and ``\\u2028``/``\\u2029`` escaping, but encoded in C with
+UUIDs and datetimes handled natively. Anything orjson does not know falls back
+to DRF's own ``JSONEncoder``.
+
+Large list pages can be sent with ``stream_list_response``, which encodes the
+pagination envelope once and ``results`` one item at a time, so the full body
+never sits in memory as a single byte string.
+
+``NDJSONRenderer`` and ``CSVRenderer`` render a list of flat records, and
+their ``iter_render`` encodes any iterable of records into ~64 KiB chunks for
+``StreamingHttpResponse`` or a file, so exports run in constant memory.
+"""
+import csv
+import io
+
+import orjson
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Naive datetimes keep no offset; aware UTC datetimes end in "Z" as in DRF
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+# Decimals, lazy translation strings, querysets, ...
+_default = JSONEncoder().default
+
+
+def dumps(data):
+    """Encode ``data`` exactly as ``FastJSONRenderer`` does (compact, no indent)."""
+    ret = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+    # Same strict-JavaScript-subset escaping as DRF's JSONRenderer; the
+    # single-byte lead check (memchr) keeps ASCII-heavy bodies off the slow path
+    if b"\xe2" in ret:
+        ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+    return ret
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` using orjson.
+
+    Indented output (``Accept: application/json; indent=4`` or the browsable
+    API) is rare and goes through the stdlib path unchanged.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+    def iter_render(self, data, stream_key="results"):
+        """
+        Yield the same bytes as ``render(data)`` in pieces: every key of the
+        envelope in one chunk, then each item of ``data[stream_key]`` on its own.
+        """
+        yield b"{"
+        for index, (key, value) in enumerate(data.items()):
+            prefix = (b"," if index else b"") + dumps(str(key)) + b":"
+            if key != stream_key or not isinstance(value, (list, tuple)):
+                yield prefix + dumps(value)
+                continue
+            yield prefix + b"["
+            for position, item in enumerate(value):
+                yield (b"," if position else b"") + dumps(item)
+            yield b"]"
+        yield b"}"
+
+
+def stream_list_response(request, response, stream_key="results"):
+    """
+    Re-issue a paginated DRF ``Response`` as a ``StreamingHttpResponse`` when
+    its page holds at least ``settings.STREAMING_RESPONSE_MIN_ITEMS`` items and
+    the negotiated renderer can stream; otherwise return it unchanged.
+    """
+    renderer = getattr(request, "accepted_renderer", None)
+    data = response.data
+    if not isinstance(renderer, FastJSONRenderer) or not isinstance(data, dict):
+        return response
+    if renderer.get_indent(request.accepted_media_type, {}) is not None:
+        return response
+    if len(data.get(stream_key) or ()) < settings.STREAMING_RESPONSE_MIN_ITEMS:
+        return response
+
+    streaming = StreamingHttpResponse(
+        renderer.iter_render(data, stream_key),
+        status=response.status_code,
+        content_type=renderer.media_type,
+    )
+    for header, value in response.items():
+        if header.lower() != "content-type":
+            streaming[header] = value
+    return streaming
+
+
+class RecordStreamRenderer(BaseRenderer):
+    """Base for renderers of flat records (dicts sharing the same keys)."""
+
+    charset = "utf-8"
+    # Bytes buffered before a chunk is yielded
+    chunk_size = 64 * 1024
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        # Non-list payloads (e.g. the error envelope) become a single record
+        return b"".join(self.iter_render(data if isinstance(data, list) else [data]))
+
+    def iter_render(self, records):
+        buffer = bytearray()
+        for piece in self.encode(records):
+            buffer += piece
+            if len(buffer) >= self.chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+
+    def encode(self, records):
+        raise NotImplementedError
+
+
+class NDJSONRenderer(RecordStreamRenderer):
+    """One JSON object per line."""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def encode(self, records):
+        for record in records:
+            yield dumps(record) + b"\n"
+
+
+class CSVRenderer(RecordStreamRenderer):
+    """CSV with a header row taken from the first record's keys."""
+
+    media_type = "text/csv"
+    format = "csv"
+
+    def encode(self, records):
+        out = io.StringIO()
+        writer = csv.writer(out)
+        header = None
+        for record in records:
+            if header is None:
+                header = list(record)
+                writer.writerow(header)
+            writer.writerow([_csv_value(record.get(name)) for name in header])
+            if out.tell() >= self.chunk_size:
+                yield out.getvalue().encode()
+                out.seek(0)
+                out.truncate()
+        if out.tell():
+            yield out.getvalue().encode()
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        value = value.isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+    if isinstance(value, (dict, list)):
+        return dumps(value).decode()
+    return value
@@ -5,6 +5,8 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
 SECRET_KEY = os.environ.get("DJANGO_SECRET_KEY", "insecure-dev-key-change-me")
@@ -18,6 +20,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Third-party
     "rest_framework",
     "corsheaders",
@@ -73,6 +76,36 @@ DATABASES = {
     }
 }
 
+# Cache — Redis when REDIS_URL is set so every gunicorn worker shares one
+# cache; per-process local memory otherwise (development and tests)
+REDIS_URL = os.environ.get("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Seconds a cached published-posts list page is kept (see apps.posts.cache)
+POSTS_LIST_CACHE_TIMEOUT = int(os.environ.get("POSTS_LIST_CACHE_TIMEOUT", "300"))
+
+# Seconds a serialized post representation is kept (keyed by id + updated_at)
+POSTS_REPRESENTATION_CACHE_TIMEOUT = int(os.environ.get("POSTS_REPRESENTATION_CACHE_TIMEOUT", "3600"))
+
+# Seconds a slug -> id mapping is kept, and how long a miss is remembered
+POSTS_SLUG_CACHE_TIMEOUT = int(os.environ.get("POSTS_SLUG_CACHE_TIMEOUT", "86400"))
+POSTS_SLUG_NEGATIVE_CACHE_TIMEOUT = int(os.environ.get("POSTS_SLUG_NEGATIVE_CACHE_TIMEOUT", "60"))
+
+# Public origin of the frontend; feed and sitemap links point at it
+PUBLIC_SITE_URL = os.environ.get("PUBLIC_SITE_URL", "http://localhost:3000").rstrip("/")
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -91,12 +124,19 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Where the sitemap shards and their manifest are written
+SITEMAP_ROOT = Path(os.environ.get("SITEMAP_ROOT", BASE_DIR / "sitemaps"))
+
 # File upload limits
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10 MB
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5 * 1024 * 1024  # 5 MB
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Raise (instead of log) when common.db.guard_queries sees a query, e.g. a
+# deferred column being loaded per row during list serialization
+QUERY_GUARD_STRICT = False
+
 # DRF
 REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "common.pagination.StandardPagination",
@@ -117,10 +157,24 @@ REST_FRAMEWORK = {
         "auth": "5/minute",
         "register": "3/hour",
     },
+    "DEFAULT_RENDERER_CLASSES": [
+        "common.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "EXCEPTION_HANDLER": "common.exceptions.custom_exception_handler",
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+# Above this many rows (per the planner's estimate) list endpoints report an
+# approximate count instead of running COUNT(*)
+PAGINATION_ESTIMATE_THRESHOLD = int(os.environ.get("PAGINATION_ESTIMATE_THRESHOLD", "10000"))
+# Seconds a table's row count (pg_class.reltuples) is kept; below the
+# threshold above, lists skip the planner estimate altogether
+PAGINATION_TABLE_ROWS_CACHE_TIMEOUT = int(os.environ.get("PAGINATION_TABLE_ROWS_CACHE_TIMEOUT", "300"))
+
+# List pages with at least this many items are streamed item by item
+STREAMING_RESPONSE_MIN_ITEMS = int(os.environ.get("STREAMING_RESPONSE_MIN_ITEMS", "100"))
+
 # Simple JWT
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),
@@ -142,6 +196,10 @@ PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
 ]
 
+# CORS — let the frontend read validators and send If-Match on writes
+CORS_EXPOSE_HEADERS = ["ETag", "Last-Modified"]
+CORS_ALLOW_HEADERS = (*default_headers, "if-match")
+
 # CSRF
 CSRF_TRUSTED_ORIGINS = os.environ.get(
     "CSRF_TRUSTED_ORIGINS", "http://localhost:3000"
@@ -5,6 +5,8 @@ from .base import *  # noqa: F401,F403
 
 DEBUG = True
 
+QUERY_GUARD_STRICT = True
+
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
 
@@ -1,11 +1,15 @@
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from apps.posts.views import SitemapIndexView, SitemapShardView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("sitemap.xml", SitemapIndexView.as_view(), name="sitemap-index"),
+    re_path(r"^sitemap-(?P<shard>\d{4}-\d{2}(?:-\d+)?)\.xml$", SitemapShardView.as_view(), name="sitemap-shard"),
     path("api/v1/auth/", include("apps.accounts.urls")),
     path("api/v1/", include("apps.posts.urls")),
     path("api/v1/schema/", SpectacularAPIView.as_view(), name="schema"),
@@ -2,7 +2,13 @@ import apiClient from "./client";
 
 export const getPosts = (params) => apiClient.get("/posts/", { params });
 
-export const getPost = (id) => apiClient.get(`/posts/${id}/`);
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+// Post pages are reachable by id or by slug (the form sitemap links use)
+export const getPost = (idOrSlug) =>
+  UUID_PATTERN.test(idOrSlug)
+    ? apiClient.get(`/posts/${idOrSlug}/`)
+    : apiClient.get(`/posts/by-slug/${idOrSlug}/`);
 
 export const createPost = (data) => {
   const formData = buildFormData(data);
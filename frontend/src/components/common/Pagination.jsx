@@ -31,13 +31,40 @@ const disabledStyle = {
   cursor: "not-allowed",
 };
 
-export default function Pagination({ currentPage, totalPages, onPageChange }) {
-  if (totalPages <= 1) return null;
+const ellipsisStyle = {
+  padding: "0 0.25rem",
+  color: "var(--color-text-secondary)",
+};
+
+// Number of page buttons shown on either side of the current page
+const PAGE_WINDOW = 2;
+
+/**
+ * When `approximate` is true, `totalPages` comes from an estimated count:
+ * the last page is labelled "~N" and "Next" follows `hasNext` (the API's
+ * `next` link) rather than the page total.
+ */
+export default function Pagination({
+  currentPage,
+  totalPages,
+  onPageChange,
+  approximate = false,
+  hasNext,
+}) {
+  const lastPage = Math.max(totalPages, currentPage);
+  const canGoNext = approximate ? Boolean(hasNext) : currentPage < lastPage;
+  if (lastPage <= 1 && !canGoNext) return null;
 
   const pages = [];
-  for (let i = 1; i <= totalPages; i++) {
+  const start = Math.max(1, currentPage - PAGE_WINDOW);
+  const end = Math.min(lastPage, currentPage + PAGE_WINDOW);
+  if (start > 1) pages.push(1);
+  if (start > 2) pages.push("start-gap");
+  for (let i = start; i <= end; i++) {
     pages.push(i);
   }
+  if (end < lastPage - 1) pages.push("end-gap");
+  if (end < lastPage) pages.push(lastPage);
 
   return (
     <nav aria-label="Pagination" style={containerStyle}>
@@ -48,20 +75,26 @@ export default function Pagination({ currentPage, totalPages, onPageChange }) {
       >
         Previous
       </button>
-      {pages.map((page) => (
-        <button
-          key={page}
-          style={page === currentPage ? activeStyle : buttonStyle}
-          onClick={() => onPageChange(page)}
-          aria-current={page === currentPage ? "page" : undefined}
-        >
-          {page}
-        </button>
-      ))}
+      {pages.map((page) =>
+        typeof page === "string" ? (
+          <span key={page} style={ellipsisStyle}>
+            …
+          </span>
+        ) : (
+          <button
+            key={page}
+            style={page === currentPage ? activeStyle : buttonStyle}
+            onClick={() => onPageChange(page)}
+            aria-current={page === currentPage ? "page" : undefined}
+          >
+            {approximate && page === lastPage && page !== currentPage ? `~${page}` : page}
+          </button>
+        )
+      )}
       <button
-        style={currentPage === totalPages ? disabledStyle : buttonStyle}
+        style={canGoNext ? buttonStyle : disabledStyle}
         onClick={() => onPageChange(currentPage + 1)}
-        disabled={currentPage === totalPages}
+        disabled={!canGoNext}
       >
         Next
       </button>
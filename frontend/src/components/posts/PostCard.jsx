@@ -1,12 +1,18 @@
 import React, { useState } from "react";
 import { Link } from "react-router-dom";
 import { formatDate } from "../../utils/formatDate";
+import { placeholderStyle } from "../../utils/placeholder";
+import { srcSet } from "../../utils/srcSet";
 import { truncateText } from "../../utils/truncateText";
 
 const DEFAULT_IMAGE = "/fintrellis.gif";
+// Cards are at least 300px wide and span the viewport on phones
+const CARD_SIZES = "(max-width: 640px) 100vw, 400px";
+const CARD_RENDITIONS = ["card", "hero"];
 
 export default function PostCard({ post }) {
   const [hovered, setHovered] = useState(false);
+  const renditions = post.thumbnail_renditions;
 
   return (
     <article
@@ -18,16 +24,28 @@ export default function PostCard({ post }) {
       onMouseLeave={() => setHovered(false)}
     >
       <Link to={`/posts/${post.id}`} style={styles.link}>
-        <div style={styles.imageWrap}>
-          <img
-            src={post.thumbnail_url || post.image_url || DEFAULT_IMAGE}
-            alt={post.title}
-            style={{
-              ...styles.image,
-              transform: hovered ? "scale(1.05)" : "scale(1)",
-            }}
-            onError={(e) => { e.target.src = DEFAULT_IMAGE; }}
-          />
+        <div style={{ ...styles.imageWrap, ...placeholderStyle(post.thumbnail_placeholder) }}>
+          <picture>
+            <source
+              type="image/webp"
+              srcSet={srcSet(renditions, CARD_RENDITIONS, "webp")}
+              sizes={CARD_SIZES}
+            />
+            <img
+              src={renditions?.card?.jpeg || post.thumbnail_url || post.image_url || DEFAULT_IMAGE}
+              srcSet={srcSet(renditions, CARD_RENDITIONS, "jpeg")}
+              sizes={CARD_SIZES}
+              width={post.thumbnail_width || undefined}
+              height={post.thumbnail_height || undefined}
+              alt={post.title}
+              loading="lazy"
+              style={{
+                ...styles.image,
+                transform: hovered ? "scale(1.05)" : "scale(1)",
+              }}
+              onError={(e) => { e.target.srcset = ""; e.target.src = DEFAULT_IMAGE; }}
+            />
+          </picture>
           {post.category && (
             <span style={styles.pill}>{post.category}</span>
           )}
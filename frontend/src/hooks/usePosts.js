@@ -2,7 +2,13 @@ import { useState, useEffect, useCallback } from "react";
 import { getPosts } from "../api/posts";
 
 export function usePosts(params = {}) {
-  const [data, setData] = useState({ results: [], count: 0, next: null, previous: null });
+  const [data, setData] = useState({
+    results: [],
+    count: 0,
+    count_is_approximate: false,
+    next: null,
+    previous: null,
+  });
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
 
@@ -10,6 +10,11 @@ import Alert from "../components/common/Alert";
 import Button from "../components/common/Button";
 import ConfirmDialog from "../components/common/ConfirmDialog";
 import { formatDateTime } from "../utils/formatDate";
+import { placeholderStyle } from "../utils/placeholder";
+import { srcSet } from "../utils/srcSet";
+
+// Full-bleed hero: 1280px covers most screens, the retina rendition 2x displays
+const HERO_RENDITIONS = ["hero", "retina"];
 
 export default function PostDetailPage() {
   const { id } = useParams();
@@ -25,7 +30,7 @@ export default function PostDetailPage() {
 
   const handleDelete = async () => {
     try {
-      await mutation.remove(id);
+      await mutation.remove(post.id);
       addToast("Post deleted successfully.", "success");
       navigate("/");
     } catch {
@@ -41,13 +46,24 @@ export default function PostDetailPage() {
   return (
     <div>
       {/* Hero image */}
-      <div style={styles.heroImage}>
-        <img
-          src={post.thumbnail_url || post.image_url || "/fintrellis.gif"}
-          alt={post.title}
-          style={styles.heroImg}
-          onError={(e) => { e.target.src = "/fintrellis.gif"; }}
-        />
+      <div style={{ ...styles.heroImage, ...placeholderStyle(post.thumbnail_placeholder) }}>
+        <picture>
+          <source
+            type="image/webp"
+            srcSet={srcSet(post.thumbnail_renditions, HERO_RENDITIONS, "webp")}
+            sizes="100vw"
+          />
+          <img
+            src={post.thumbnail_renditions?.hero?.jpeg || post.thumbnail_url || post.image_url || "/fintrellis.gif"}
+            srcSet={srcSet(post.thumbnail_renditions, HERO_RENDITIONS, "jpeg")}
+            sizes="100vw"
+            width={post.thumbnail_width || undefined}
+            height={post.thumbnail_height || undefined}
+            alt={post.title}
+            style={styles.heroImg}
+            onError={(e) => { e.target.srcset = ""; e.target.src = "/fintrellis.gif"; }}
+          />
+        </picture>
         <div style={styles.heroOverlay} />
       </div>
 
@@ -69,7 +85,7 @@ export default function PostDetailPage() {
 
         {canEdit && (
           <div style={styles.actions}>
-            <Button variant="secondary" onClick={() => navigate(`/posts/${id}/edit`)}>
+            <Button variant="secondary" onClick={() => navigate(`/posts/${post.id}/edit`)}>
               Edit Post
             </Button>
             <Button variant="danger" onClick={() => setShowConfirm(true)}>
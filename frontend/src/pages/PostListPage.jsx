@@ -26,7 +26,7 @@ export default function PostListPage() {
     ordering: "-created_at",
   };
 
-  const { results, count, loading, error } = usePosts(params);
+  const { results, count, count_is_approximate: isApproximate, next, loading, error } = usePosts(params);
   const totalPages = Math.ceil(count / PAGE_SIZE);
 
   return (
@@ -78,7 +78,7 @@ export default function PostListPage() {
         {/* Result count */}
         {!loading && (
           <p style={styles.count}>
-            {count} post{count !== 1 ? "s" : ""} found
+            {isApproximate ? `About ${count.toLocaleString()}` : count} post{count !== 1 ? "s" : ""} found
           </p>
         )}
 
@@ -109,6 +109,8 @@ export default function PostListPage() {
               currentPage={page}
               totalPages={totalPages}
               onPageChange={setPage}
+              approximate={isApproximate}
+              hasNext={Boolean(next)}
             />
           </>
         )}
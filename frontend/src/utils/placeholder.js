@@ -0,0 +1,13 @@
+/**
+ * Inline style painting a post's `thumbnail_placeholder` (a tiny data: URI)
+ * behind its image, stretched to the box, so the card shows the picture's
+ * colours before the rendition arrives. Empty when there is no placeholder.
+ */
+export function placeholderStyle(placeholder) {
+  if (!placeholder) return {};
+  return {
+    backgroundImage: `url("${placeholder}")`,
+    backgroundSize: "cover",
+    backgroundPosition: "center",
+  };
+}
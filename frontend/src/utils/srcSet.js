@@ -0,0 +1,13 @@
+/**
+ * Build a `srcset` from a post's `thumbnail_renditions` map, e.g.
+ * srcSet(post.thumbnail_renditions, ["card", "hero"], "webp")
+ * -> "https://.../card.webp 480w, https://.../hero.webp 1280w".
+ */
+export function srcSet(renditions, names, format) {
+  if (!renditions) return undefined;
+  const entries = names
+    .map((name) => renditions[name])
+    .filter((rendition) => rendition && rendition[format])
+    .map((rendition) => `${rendition[format]} ${rendition.width}w`);
+  return entries.length ? entries.join(", ") : undefined;
+}